@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=undefined-variable
+from .backends import *
+from .config import *
+from .shared import *
+from .snapshot import *
+from .staging import *
+from .utils import *
+
+__all__ = (backends.__all__ + config.__all__ + shared.__all__ + snapshot.__all__ + staging.__all__ + utils.__all__)
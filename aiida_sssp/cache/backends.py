@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""Backends through which `SsspFamily` instances can look up their contents without accessing the database.
+
+The backend is configured per profile through the `cache_backend` option, see :py:func:`set_cache_backend`:
+
+    * `snapshot`: the persistent snapshot file, which has to be written explicitly with `aiida-sssp cache snapshot`
+    * `shared`: the shared memory cache, which is built automatically once per host and kept up to date
+    * `none`: no cache is used and all lookups go through the database
+"""
+import contextlib
+
+from .config import get_option, set_option
+from .shared import get_shared_cache
+from .snapshot import get_snapshot, invalidate_snapshot
+
+__all__ = (
+    'CacheBackend', 'SharedMemoryCacheBackend', 'SnapshotCacheBackend', 'get_cache_backend', 'invalidate_caches',
+    'override_cache_backend', 'set_cache_backend'
+)
+
+OPTION_CACHE_BACKEND = 'cache_backend'
+DEFAULT_CACHE_BACKEND = 'snapshot'
+NO_CACHE_BACKEND = 'none'
+
+# Backends that have been loaded in this process, indexed on the name of the profile.
+_CACHE_BACKENDS = {}
+
+
+class CacheBackend:
+    """Base class for a backend that provides the contents of `SsspFamily` instances in the form of a snapshot."""
+
+    name = None
+
+    def get_snapshot(self):
+        """Return the snapshot of the families of the current profile.
+
+        :return: instance of `SsspSnapshot` or `None` if the backend cannot currently provide one
+        """
+        raise NotImplementedError
+
+
+class SnapshotCacheBackend(CacheBackend):
+    """Backend that uses the persistent snapshot file of the profile, if it exists."""
+
+    name = 'snapshot'
+
+    def get_snapshot(self):
+        """Return the snapshot of the families of the current profile.
+
+        :return: instance of `SsspSnapshot` or `None` if the snapshot file does not exist
+        """
+        return get_snapshot()
+
+
+class SharedMemoryCacheBackend(CacheBackend):
+    """Backend that uses the `SharedFamilyCache` that is shared by all processes of the profile on this host."""
+
+    name = 'shared'
+
+    def get_snapshot(self):
+        """Return the snapshot of the families of the current profile.
+
+        :return: instance of `SsspSnapshot`
+        """
+        return get_shared_cache().get_snapshot()
+
+
+CACHE_BACKENDS = {backend.name: backend for backend in (SnapshotCacheBackend, SharedMemoryCacheBackend)}
+
+
+def get_cache_backend():
+    """Return the cache backend configured for the current profile.
+
+    The configuration is read once per process, so processes that are already running, such as daemon workers, have to
+    be restarted for a change in the configured backend to take effect.
+
+    :return: instance of `CacheBackend` or `None` if no backend is configured
+    """
+    from aiida.manage.configuration import get_profile
+
+    profile = get_profile()
+
+    try:
+        return _CACHE_BACKENDS[profile.name]
+    except KeyError:
+        pass
+
+    name = get_option(OPTION_CACHE_BACKEND, DEFAULT_CACHE_BACKEND)
+
+    try:
+        backend = CACHE_BACKENDS[name]()
+    except KeyError:
+        backend = None
+
+    return _CACHE_BACKENDS.setdefault(profile.name, backend)
+
+
+def set_cache_backend(name):
+    """Configure the cache backend for the current profile.
+
+    :param name: the name of the backend, one of the keys of `CACHE_BACKENDS` or `none` to disable caching
+    :raises ValueError: if the name does not correspond to a known backend
+    """
+    from aiida.manage.configuration import get_profile
+
+    if name != NO_CACHE_BACKEND and name not in CACHE_BACKENDS:
+        raise ValueError('unknown cache backend `{}`, choose from: {}'.format(name, ', '.join(sorted(CACHE_BACKENDS))))
+
+    set_option(OPTION_CACHE_BACKEND, name)
+    _CACHE_BACKENDS.pop(get_profile().name, None)
+
+
+@contextlib.contextmanager
+def override_cache_backend(name):
+    """Use the given cache backend in this process for the duration of the context, without changing the configuration.
+
+    :param name: the name of the backend, one of the keys of `CACHE_BACKENDS` or `none` to disable caching
+    :raises ValueError: if the name does not correspond to a known backend
+    """
+    from aiida.manage.configuration import get_profile
+
+    if name != NO_CACHE_BACKEND and name not in CACHE_BACKENDS:
+        raise ValueError('unknown cache backend `{}`, choose from: {}'.format(name, ', '.join(sorted(CACHE_BACKENDS))))
+
+    profile = get_profile()
+    sentinel = object()
+    previous = _CACHE_BACKENDS.get(profile.name, sentinel)
+    _CACHE_BACKENDS[profile.name] = CACHE_BACKENDS[name]() if name != NO_CACHE_BACKEND else None
+
+    try:
+        yield
+    finally:
+        if previous is sentinel:
+            _CACHE_BACKENDS.pop(profile.name, None)
+        else:
+            _CACHE_BACKENDS[profile.name] = previous
+
+
+def invalidate_caches(family_uuid):  # pylint: disable=unused-argument
+    """Invalidate all caches of the current profile that can contain outdated information on the given family.
+
+    All caches are invalidated, regardless of the configured backend, since processes that were started with another
+    configuration may still be using them. The caches are invalidated as a whole, also if they do not yet contain the
+    family, since then the family was created after they were built.
+
+    :param family_uuid: the UUID of the family that was created, deleted or changed
+    """
+    invalidate_snapshot()
+    get_shared_cache().invalidate()
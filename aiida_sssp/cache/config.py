@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Configuration of `aiida-sssp`, such as the cache backend and the download mirrors, which is stored per profile."""
+import json
+import os
+
+from .utils import get_cache_dirpath
+
+__all__ = ('get_option', 'set_option', 'unset_option')
+
+FILENAME_CONFIG = 'config.json'
+
+
+def get_config_filepath(profile=None):
+    """Return the absolute filepath of the configuration file for the given profile.
+
+    :param profile: optional `Profile`, by default the currently loaded profile is used
+    :return: absolute filepath of the configuration file
+    """
+    return os.path.join(get_cache_dirpath(profile), FILENAME_CONFIG)
+
+
+def get_config(profile=None):
+    """Return the configuration for the given profile.
+
+    :param profile: optional `Profile`, by default the currently loaded profile is used
+    :return: dictionary with the configuration, which is empty if nothing has been configured yet
+    """
+    try:
+        with open(get_config_filepath(profile)) as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return {}
+
+
+def get_option(name, default=None, profile=None):
+    """Return the value of the given option for the given profile.
+
+    :param name: the name of the option
+    :param default: the value to return if the option is not set
+    :param profile: optional `Profile`, by default the currently loaded profile is used
+    :return: the value of the option
+    """
+    return get_config(profile).get(name, default)
+
+
+def set_option(name, value, profile=None):
+    """Set the value of the given option for the given profile.
+
+    :param name: the name of the option
+    :param value: the value, should be JSON-serializable
+    :param profile: optional `Profile`, by default the currently loaded profile is used
+    """
+    config = get_config(profile)
+    config[name] = value
+    _write_config(config, profile)
+
+
+def unset_option(name, profile=None):
+    """Unset the given option for the given profile, if it was set.
+
+    :param name: the name of the option
+    :param profile: optional `Profile`, by default the currently loaded profile is used
+    """
+    config = get_config(profile)
+    config.pop(name, None)
+    _write_config(config, profile)
+
+
+def _write_config(config, profile=None):
+    """Write the configuration atomically, such that concurrent readers never see a partially written file."""
+    filepath = get_config_filepath(profile)
+    filepath_temp = '{}.{}.tmp'.format(filepath, os.getpid())
+
+    with open(filepath_temp, 'w') as handle:
+        json.dump(config, handle, indent=4, sort_keys=True)
+
+    os.replace(filepath_temp, filepath)
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""Cache of the contents of all `SsspFamily` instances in shared memory, for all processes of a profile on a host.
+
+The cache consists of two memory-mapped files, which on Linux are placed in `/dev/shm` such that they live in memory:
+
+    * a control file containing nothing but a generation counter
+    * a data file per generation, containing a snapshot of all families in the format of `SsspSnapshot`
+
+The layout is read-mostly: a lookup consists of reading the generation counter and a binary search in the data of that
+generation, both of which are plain memory reads. Only when the counter has changed, which happens whenever any process
+invalidates the cache, does a process map the data file of the new generation. The first process to find that it does
+not exist yet builds it from the database, while holding an exclusive lock on the control file, such that the database
+is queried once per generation, regardless of the number of processes.
+"""
+import contextlib
+import fcntl
+import glob
+import hashlib
+import mmap
+import os
+import struct
+
+from .snapshot import SsspSnapshot, query_records
+from .utils import get_cache_dirpath
+
+__all__ = ('SharedFamilyCache', 'get_shared_cache')
+
+DIRPATH_SHARED_MEMORY = '/dev/shm'
+GENERATION = struct.Struct('<Q')
+
+# Instances of `SharedFamilyCache` of this process, indexed on the name of the profile.
+_SHARED_CACHES = {}
+
+
+class SharedFamilyCache:
+    """Cache of the contents of all `SsspFamily` instances of a profile that is shared by all processes on a host."""
+
+    def __init__(self, profile=None, dirpath=None):
+        """Construct a new instance.
+
+        :param profile: optional `Profile`, by default the currently loaded profile is used
+        :param dirpath: optional absolute path of the directory in which to place the memory-mapped files. By default
+            `/dev/shm` is used if it is available, or otherwise the cache directory of the profile.
+        """
+        from aiida.manage.configuration import get_profile
+
+        profile = profile or get_profile()
+        dirpath_cache = get_cache_dirpath(profile)
+
+        if dirpath is None:
+            dirpath = DIRPATH_SHARED_MEMORY if os.access(DIRPATH_SHARED_MEMORY, os.W_OK) else dirpath_cache
+
+        # Profiles of different AiiDA instances on the same host can have the same name, so the cache directory, which
+        # is unique for each profile of each instance, is used to make the filenames unique.
+        identifier = hashlib.md5(dirpath_cache.encode('utf-8')).hexdigest()[:12]
+
+        self._prefix = os.path.join(dirpath, 'aiida-sssp-{}-{}'.format(profile.name, identifier))
+        self._filepath_control = '{}.generation'.format(self._prefix)
+        self._descriptor = None
+        self._control = None
+        self._generation = None
+        self._snapshot = None
+
+    @property
+    def generation(self):
+        """Return the current generation of the cache.
+
+        :return: the generation counter, which is incremented every time the cache is invalidated
+        """
+        return GENERATION.unpack_from(self._get_control(), 0)[0]
+
+    def get_snapshot(self):
+        """Return the snapshot of the current generation, building it from the database if necessary.
+
+        :return: instance of `SsspSnapshot`
+        """
+        generation = self.generation
+
+        if self._snapshot is not None and generation == self._generation:
+            return self._snapshot
+
+        try:
+            snapshot = SsspSnapshot.from_file(self._get_filepath_data(generation))
+        except (OSError, ValueError):
+            generation, snapshot = self._build()
+
+        self._generation = generation
+        self._snapshot = snapshot
+
+        return snapshot
+
+    def invalidate(self):
+        """Invalidate the cache by incrementing the generation counter.
+
+        All processes will switch to a newly built snapshot on their next lookup. If the cache has never been used on
+        this host, this is a no-op.
+        """
+        if self._get_control(create=False) is None:
+            return
+
+        with self._lock():
+            generation = self.generation
+            GENERATION.pack_into(self._control, 0, generation + 1)
+            self._remove_data(exclude=())
+
+    def close(self):
+        """Release the memory-mapped files of this instance."""
+        if self._control is not None:
+            self._control.close()
+            os.close(self._descriptor)
+
+        self._descriptor = None
+        self._control = None
+        self._generation = None
+        self._snapshot = None
+
+    def _get_control(self, create=True):
+        """Return the memory-mapped control file, creating it first if it does not exist and `create` is True.
+
+        :param create: boolean, if False, will return `None` if the control file does not yet exist
+        :return: the memory-mapped control file
+        """
+        if self._control is not None:
+            return self._control
+
+        flags = os.O_RDWR | os.O_CREAT if create else os.O_RDWR
+
+        try:
+            self._descriptor = os.open(self._filepath_control, flags, 0o600)
+        except FileNotFoundError:
+            return None
+
+        with self._lock():
+            # A newly created control file is empty and is initialized with zero bytes, i.e., a generation of zero.
+            if os.fstat(self._descriptor).st_size < GENERATION.size:
+                os.ftruncate(self._descriptor, GENERATION.size)
+
+        self._control = mmap.mmap(self._descriptor, GENERATION.size)
+
+        return self._control
+
+    def _get_filepath_data(self, generation):
+        """Return the absolute filepath of the data file for the given generation."""
+        return '{}.{}.data'.format(self._prefix, generation)
+
+    def _build(self):
+        """Build the data file for the current generation from the database, unless another process already did.
+
+        :return: tuple of the generation and the corresponding `SsspSnapshot`
+        """
+        with self._lock():
+            generation = self.generation
+            filepath = self._get_filepath_data(generation)
+
+            try:
+                return generation, SsspSnapshot.from_file(filepath)
+            except (OSError, ValueError):
+                pass
+
+            content = SsspSnapshot.serialize(query_records())
+            filepath_temp = '{}.{}.tmp'.format(filepath, os.getpid())
+
+            with open(filepath_temp, 'wb') as handle:
+                handle.write(content)
+
+            os.replace(filepath_temp, filepath)
+            self._remove_data(exclude=(filepath,))
+
+            return generation, SsspSnapshot.from_file(filepath)
+
+    def _remove_data(self, exclude):
+        """Remove the data files of all generations except those in `exclude`.
+
+        Processes that still have a removed file mapped can continue to use it, until they notice the new generation.
+        """
+        for filepath in glob.glob('{}.*.data'.format(self._prefix)):
+            if filepath not in exclude:
+                try:
+                    os.remove(filepath)
+                except FileNotFoundError:
+                    pass
+
+    @contextlib.contextmanager
+    def _lock(self):
+        """Hold an exclusive lock on the control file, which serializes building and invalidating across processes."""
+        fcntl.flock(self._descriptor, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._descriptor, fcntl.LOCK_UN)
+
+
+def get_shared_cache():
+    """Return the `SharedFamilyCache` of the current profile.
+
+    :return: instance of `SharedFamilyCache`, which is created once per process
+    """
+    from aiida.manage.configuration import get_profile
+
+    profile = get_profile()
+
+    try:
+        return _SHARED_CACHES[profile.name]
+    except KeyError:
+        return _SHARED_CACHES.setdefault(profile.name, SharedFamilyCache(profile))
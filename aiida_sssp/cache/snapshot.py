@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""Persistent snapshot of the contents of installed `SsspFamily` instances, allowing lookups without database access.
+
+The snapshot is a single binary file per profile with a fixed size header followed by fixed size records, one for each
+pseudo potential of each family, sorted on the family UUID and element. This layout allows the file to be memory-mapped
+and lookups to be performed through a binary search, which only unpacks the records that it compares instead of parsing
+the entire file. The header contains the MD5 checksum of the records, which versions the snapshot and is used to detect
+corrupt files. Verifying it when a snapshot is loaded does read the entire file, but only once per process and change of
+the file, see :py:func:`get_snapshot`.
+"""
+import bisect
+import collections
+import hashlib
+import mmap
+import os
+import struct
+import warnings
+
+from .utils import get_cache_dirpath
+
+__all__ = (
+    'SsspSnapshot', 'SnapshotRecord', 'get_snapshot', 'get_snapshot_filepath', 'invalidate_snapshot', 'query_records',
+    'write_snapshot'
+)
+
+SnapshotRecord = collections.namedtuple(
+    'SnapshotRecord', ['family_uuid', 'element', 'uuid', 'md5', 'filename', 'cutoff_wfc', 'cutoff_rho']
+)
+
+FILENAME_SNAPSHOT = 'families.snapshot'
+
+# Snapshots that have been loaded in this process, indexed on their filepath, along with the file status with which
+# they were loaded, such that a changed or removed file can be detected with a single `stat` call.
+_SNAPSHOTS = {}
+
+
+class SsspSnapshot:
+    """Read-only view on the binary content of a snapshot of the contents of one or more `SsspFamily` instances."""
+
+    MAGIC = b'SSSPSNAP'
+    FORMAT_VERSION = 1
+
+    HEADER = struct.Struct('<8sHxxI32s')
+    RECORD = struct.Struct('<36s2s36s32s128sdd')
+    KEY_SIZE = 38
+
+    def __init__(self, buffer):
+        """Construct a new instance from the binary content of a snapshot.
+
+        :param buffer: `bytes` or `mmap.mmap` with the content of the snapshot
+        :raises ValueError: if the content is not a valid snapshot or the checksum does not match the records
+        """
+        try:
+            magic, version, count, checksum = self.HEADER.unpack_from(buffer, 0)
+        except struct.error:
+            raise ValueError('the content is too short to be a snapshot')
+
+        if magic != self.MAGIC:
+            raise ValueError('the content is not a snapshot')
+
+        if version != self.FORMAT_VERSION:
+            raise ValueError('unsupported snapshot format version `{}`'.format(version))
+
+        if len(buffer) != self.HEADER.size + count * self.RECORD.size:
+            raise ValueError('the snapshot is truncated')
+
+        if hashlib.md5(buffer[self.HEADER.size:]).hexdigest().encode('ascii') != checksum:
+            raise ValueError('the checksum of the snapshot does not match its content')
+
+        self._buffer = buffer
+        self._count = count
+        self._checksum = checksum.decode('ascii')
+
+    @classmethod
+    def from_file(cls, filepath):
+        """Load a snapshot by memory-mapping the given file.
+
+        :param filepath: absolute path to the snapshot file
+        :return: instance of `SsspSnapshot`
+        :raises ValueError: if the file is not a valid snapshot
+        """
+        with open(filepath, 'rb') as handle:
+            try:
+                buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError('the snapshot `{}` is empty'.format(filepath))
+
+        return cls(buffer)
+
+    @classmethod
+    def from_records(cls, records):
+        """Construct a snapshot from the given records.
+
+        :param records: iterable of `SnapshotRecord`
+        :return: instance of `SsspSnapshot`
+        :raises ValueError: if any of the records cannot be represented in the snapshot format
+        """
+        return cls(cls.serialize(records))
+
+    @classmethod
+    def serialize(cls, records):
+        """Serialize the given records into the binary content of a snapshot.
+
+        :param records: iterable of `SnapshotRecord`
+        :return: the binary content of the snapshot
+        :raises ValueError: if any of the records cannot be represented in the snapshot format
+        """
+        packed = []
+
+        for record in records:
+            element = record.element.encode('ascii')
+            filename = record.filename.encode('utf-8')
+
+            # Longer values would silently be truncated by the fixed size fields of the record
+            if len(element) > 2:
+                raise ValueError('element `{}` is too long to be stored in a snapshot'.format(record.element))
+
+            if len(filename) > 128:
+                raise ValueError('filename `{}` is too long to be stored in a snapshot'.format(record.filename))
+
+            packed.append(
+                cls.RECORD.pack(
+                    record.family_uuid.encode('ascii'), element, record.uuid.encode('ascii'),
+                    record.md5.encode('ascii'), filename, record.cutoff_wfc, record.cutoff_rho
+                )
+            )
+
+        # The records are sorted on their binary key, which is what the binary search in the lookups relies on.
+        content = b''.join(sorted(packed, key=lambda entry: entry[:cls.KEY_SIZE]))
+        checksum = hashlib.md5(content).hexdigest().encode('ascii')
+
+        return cls.HEADER.pack(cls.MAGIC, cls.FORMAT_VERSION, len(packed), checksum) + content
+
+    def __len__(self):
+        """Return the number of records in the snapshot."""
+        return self._count
+
+    def __iter__(self):
+        """Iterate over all records in the snapshot, ordered by family UUID and element."""
+        for index in range(self._count):
+            yield self._get_record(index)
+
+    def __contains__(self, family_uuid):
+        """Return whether the snapshot contains records for the family with the given UUID."""
+        start, end = self._get_range(str(family_uuid).encode('ascii'))
+        return end > start
+
+    @property
+    def checksum(self):
+        """Return the checksum of the records of this snapshot, which uniquely identifies its content.
+
+        :return: the MD5 checksum
+        """
+        return self._checksum
+
+    @property
+    def family_uuids(self):
+        """Return the set of the UUIDs of the families contained in this snapshot.
+
+        :return: set of family UUIDs
+        """
+        return {self._get_key(index)[:36].decode('ascii') for index in range(self._count)}
+
+    def get_record(self, family_uuid, element):
+        """Return the record of the given element in the family with the given UUID.
+
+        :param family_uuid: the UUID of the family
+        :param element: the element symbol
+        :return: the `SnapshotRecord`
+        :raises KeyError: if the snapshot does not contain a record for the given family and element
+        """
+        key = str(family_uuid).encode('ascii') + element.encode('ascii').ljust(2, b'\0')
+        start, end = self._get_range(key)
+
+        if end == start:
+            raise KeyError('snapshot does not contain element `{}` for family `{}`'.format(element, family_uuid))
+
+        return self._get_record(start)
+
+    def get_records(self, family_uuid):
+        """Return the records of all elements in the family with the given UUID.
+
+        :param family_uuid: the UUID of the family
+        :return: list of `SnapshotRecord`, which is empty if the snapshot does not contain the family
+        """
+        start, end = self._get_range(str(family_uuid).encode('ascii'))
+        return [self._get_record(index) for index in range(start, end)]
+
+    def close(self):
+        """Release the underlying buffer if it is memory-mapped."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def _get_key(self, index):
+        """Return the binary key of the record with the given index."""
+        offset = self.HEADER.size + index * self.RECORD.size
+        return self._buffer[offset:offset + self.KEY_SIZE]
+
+    def _get_record(self, index):
+        """Return the record with the given index."""
+        values = self.RECORD.unpack_from(self._buffer, self.HEADER.size + index * self.RECORD.size)
+        strings = [value.rstrip(b'\0').decode('utf-8') for value in values[:5]]
+        return SnapshotRecord(*strings, cutoff_wfc=values[5], cutoff_rho=values[6])
+
+    def _get_range(self, prefix):
+        """Return the range of indices of the records whose key starts with the given prefix."""
+        keys = _KeySequence(self, len(prefix))
+        start = bisect.bisect_left(keys, prefix)
+        end = bisect.bisect_right(keys, prefix, lo=start)
+        return start, end
+
+
+class _KeySequence:
+    """Sequence of the keys of the records of a snapshot, truncated to a given length, to be used for binary search."""
+
+    def __init__(self, snapshot, length):
+        self._snapshot = snapshot
+        self._length = length
+
+    def __len__(self):
+        return len(self._snapshot)
+
+    def __getitem__(self, index):
+        return self._snapshot._get_key(index)[:self._length]  # pylint: disable=protected-access
+
+
+def get_snapshot_filepath(profile=None):
+    """Return the absolute filepath of the snapshot for the given profile.
+
+    :param profile: optional `Profile`, by default the currently loaded profile is used
+    :return: absolute filepath of the snapshot
+    """
+    return os.path.join(get_cache_dirpath(profile), FILENAME_SNAPSHOT)
+
+
+def get_snapshot(filepath=None):
+    """Return the snapshot of the current profile, if it exists.
+
+    The snapshot is memory-mapped once per process and is only reloaded when the file has been changed on disk.
+
+    :param filepath: optional absolute filepath of the snapshot, by default the snapshot of the current profile is used
+    :return: instance of `SsspSnapshot` or `None` if the snapshot does not exist or is invalid
+    """
+    filepath = filepath or get_snapshot_filepath()
+
+    try:
+        stat = os.stat(filepath)
+    except FileNotFoundError:
+        _SNAPSHOTS.pop(filepath, None)
+        return None
+
+    status = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    try:
+        loaded_status, snapshot = _SNAPSHOTS[filepath]
+    except KeyError:
+        pass
+    else:
+        if loaded_status == status:
+            return snapshot
+
+    try:
+        snapshot = SsspSnapshot.from_file(filepath)
+    except (OSError, ValueError) as exception:
+        warnings.warn('ignoring the invalid snapshot `{}`: {}'.format(filepath, exception))
+        _SNAPSHOTS.pop(filepath, None)
+        return None
+
+    _SNAPSHOTS[filepath] = (status, snapshot)
+
+    return snapshot
+
+
+def query_records(family_uuids=None):
+    """Query the database for the records of all pseudo potentials of all, or the given, families.
+
+    This requires exactly two queries, one for the pseudo potentials and one for the parameters, regardless of the
+    number of families. For elements without recommended cutoffs, the cutoffs are set to `NaN`.
+
+    :param family_uuids: optional list of UUIDs of families to restrict the query to
+    :return: list of `SnapshotRecord`
+    """
+    from aiida.orm import QueryBuilder
+    from aiida.plugins import DataFactory
+    from aiida_sssp.data import SsspParameters
+    from aiida_sssp.groups import SsspFamily
+
+    UpfData = DataFactory('upf')  # pylint: disable=invalid-name
+
+    filters_family = {}
+    filters_parameters = {}
+
+    if family_uuids is not None:
+        family_uuids = [str(uuid) for uuid in family_uuids]
+        filters_family = {'uuid': {'in': family_uuids}}
+        filters_parameters = {'attributes.{}'.format(SsspParameters.KEY_FAMILY_UUID): {'in': family_uuids}}
+
+    parameters = {}
+    builder = QueryBuilder().append(SsspParameters, filters=filters_parameters, project=['attributes'])
+
+    for [attributes] in builder.iterall():
+        parameters[attributes[SsspParameters.KEY_FAMILY_UUID]] = attributes
+
+    records = []
+    projections = ['uuid', 'attributes.element', 'attributes.md5', 'attributes.filename']
+    builder = QueryBuilder().append(SsspFamily, filters=filters_family, project=['uuid'], tag='family')
+    builder.append(UpfData, with_group='family', project=projections)
+
+    for family_uuid, uuid, element, md5, filename in builder.iterall():
+        values = parameters.get(family_uuid, {}).get(element, {})
+        cutoff_wfc = values.get('cutoff_wfc', float('nan'))
+        cutoff_rho = values.get('cutoff_rho', float('nan'))
+        records.append(SnapshotRecord(family_uuid, element, uuid, md5, filename, cutoff_wfc, cutoff_rho))
+
+    return records
+
+
+def write_snapshot(filepath=None):
+    """Write a snapshot of all installed families of the current profile.
+
+    The file is written atomically, such that processes that are reading the current snapshot are never exposed to a
+    partially written file.
+
+    :param filepath: optional absolute filepath to write to, by default the snapshot of the current profile is used
+    :return: the newly written `SsspSnapshot`
+    :raises ValueError: if the pseudo potential of any family cannot be represented in the snapshot format, for example
+        because its element symbol is longer than two characters
+    """
+    filepath = filepath or get_snapshot_filepath()
+    content = SsspSnapshot.serialize(query_records())
+    filepath_temp = '{}.{}.tmp'.format(filepath, os.getpid())
+
+    with open(filepath_temp, 'wb') as handle:
+        handle.write(content)
+
+    os.replace(filepath_temp, filepath)
+
+    return get_snapshot(filepath)
+
+
+def invalidate_snapshot(filepath=None):
+    """Invalidate the snapshot of the current profile.
+
+    This should be called whenever a family is created, deleted or its contents change, such that no process will
+    continue to use outdated information. The snapshot is removed even if it does not contain the family that changed,
+    since a family that is missing from the snapshot was created or populated after it was written and lookups that use
+    the snapshot would silently ignore it. All lookups will go through the database until a new snapshot is written.
+
+    :param filepath: optional absolute filepath of the snapshot, by default the snapshot of the current profile is used
+    """
+    filepath = filepath or get_snapshot_filepath()
+
+    try:
+        os.remove(filepath)
+    except FileNotFoundError:
+        pass
+
+    _SNAPSHOTS.pop(filepath, None)
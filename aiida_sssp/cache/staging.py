@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""Persistent content-addressed store of pseudo potential files from which calculations can be staged.
+
+Each file is copied out of the repository once and stored under its MD5 checksum, after which it can be hardlinked or
+symlinked into as many working directories as necessary without any further copying. Since files in the store can be
+shared by many links, they are made read-only to protect them against accidental modification.
+"""
+import errno
+import hashlib
+import os
+import shutil
+import stat
+
+from .utils import get_cache_dirpath
+
+__all__ = ('PseudoStore', 'get_pseudo_store')
+
+LINK_HARD = 'hardlink'
+LINK_SYMBOLIC = 'symlink'
+
+
+class PseudoStore:
+    """Persistent content-addressed store of pseudo potential files."""
+
+    def __init__(self, dirpath):
+        """Construct a new instance.
+
+        :param dirpath: absolute path of the directory of the store, which is created if it does not yet exist
+        """
+        os.makedirs(dirpath, exist_ok=True)
+        self._dirpath = dirpath
+
+    @property
+    def dirpath(self):
+        """Return the absolute path of the directory of the store.
+
+        :return: absolute path
+        """
+        return self._dirpath
+
+    def get_filepath(self, md5):
+        """Return the absolute filepath in the store of the file with the given checksum.
+
+        .. note:: the file is not guaranteed to exist, use `contains` to check whether it has been materialized.
+
+        :param md5: the MD5 checksum of the file
+        :return: absolute filepath
+        """
+        return os.path.join(self._dirpath, md5[:2], md5)
+
+    def contains(self, md5):
+        """Return whether the file with the given checksum has been materialized in the store.
+
+        :param md5: the MD5 checksum of the file
+        :return: boolean
+        """
+        return os.path.isfile(self.get_filepath(md5))
+
+    def materialize(self, pseudo):
+        """Materialize the file of the given pseudo potential in the store, unless it is already present.
+
+        :param pseudo: a stored `UpfData` node
+        :return: absolute filepath of the file in the store
+        :raises ValueError: if the content of the file does not match the checksum of the node
+        """
+        filepath = self.get_filepath(pseudo.md5sum)
+
+        if os.path.isfile(filepath):
+            return filepath
+
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        filepath_temp = '{}.{}.tmp'.format(filepath, os.getpid())
+        md5 = hashlib.md5()
+
+        try:
+            with pseudo.open(mode='rb') as source, open(filepath_temp, 'wb') as target:
+                for chunk in iter(lambda: source.read(65536), b''):
+                    md5.update(chunk)
+                    target.write(chunk)
+
+            if md5.hexdigest() != pseudo.md5sum:
+                raise ValueError('content of {} does not match its checksum `{}`'.format(pseudo, pseudo.md5sum))
+
+            os.chmod(filepath_temp, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            os.replace(filepath_temp, filepath)
+        finally:
+            if os.path.exists(filepath_temp):
+                os.remove(filepath_temp)
+
+        return filepath
+
+    def link(self, md5, filepath, link=LINK_HARD):
+        """Link the file with the given checksum from the store to the given filepath.
+
+        An existing file at `filepath` is replaced. If a hardlink is requested but the target is on another file system,
+        a symbolic link is created instead.
+
+        :param md5: the MD5 checksum of a file that has been materialized in the store
+        :param filepath: absolute filepath of the link to create
+        :param link: the type of link, either `hardlink` or `symlink`
+        :return: absolute filepath of the link
+        :raises ValueError: if the type of link is not supported
+        :raises FileNotFoundError: if the file has not been materialized in the store
+        """
+        source = self.get_filepath(md5)
+        filepath_temp = '{}.{}.tmp'.format(filepath, os.getpid())
+
+        if not os.path.isfile(source):
+            raise FileNotFoundError('file with checksum `{}` has not been materialized in the store'.format(md5))
+
+        if link == LINK_HARD:
+            try:
+                os.link(source, filepath_temp)
+            except OSError as exception:
+                if exception.errno != errno.EXDEV:
+                    raise
+                os.symlink(source, filepath_temp)
+        elif link == LINK_SYMBOLIC:
+            os.symlink(source, filepath_temp)
+        else:
+            raise ValueError('unsupported link type `{}`'.format(link))
+
+        os.replace(filepath_temp, filepath)
+
+        return filepath
+
+    def clear(self):
+        """Remove all files from the store.
+
+        Files that are hardlinked elsewhere remain available through those links, but symbolic links will be broken.
+        """
+        shutil.rmtree(self._dirpath, ignore_errors=True)
+        os.makedirs(self._dirpath, exist_ok=True)
+
+
+def get_pseudo_store(profile=None):
+    """Return the `PseudoStore` of the given profile.
+
+    :param profile: optional `Profile`, by default the currently loaded profile is used
+    :return: instance of `PseudoStore`
+    """
+    return PseudoStore(os.path.join(get_cache_dirpath(profile), 'pseudos'))
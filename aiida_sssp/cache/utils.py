@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""Utilities shared by the various caches of `SsspFamily` contents."""
+import os
+
+__all__ = ('get_cache_dirpath', 'release_connection')
+
+
+def get_cache_dirpath(profile=None):
+    """Return the absolute path to the directory in which the caches for the given profile are kept.
+
+    The directory lives in the AiiDA configuration directory, next to the configuration file, such that it is shared by
+    all processes, including the daemon workers, that use the same profile. It is created if it does not yet exist.
+
+    :param profile: optional `Profile`, by default the currently loaded profile is used
+    :return: absolute path of the cache directory
+    """
+    from aiida.manage.configuration import get_config, get_profile
+
+    profile = profile or get_profile()
+    dirpath = os.path.join(get_config().dirpath, 'sssp', profile.name)
+    os.makedirs(dirpath, exist_ok=True)
+
+    return dirpath
+
+
+def release_connection():
+    """Release the database connection of the current thread.
+
+    Threads other than the main thread that access the database open their own connection, which is not closed when the
+    thread finishes or returns to a pool. Such threads should call this once they are done, such that long running
+    processes, like daemon workers, do not exhaust the connections of the database.
+    """
+    from aiida.manage.configuration import get_profile
+
+    if get_profile().database_backend == 'sqlalchemy':
+        from aiida.backends.sqlalchemy import get_scoped_session
+        get_scoped_session().remove()
+    else:
+        from django.db import connection
+        connection.close()
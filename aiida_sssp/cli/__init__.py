@@ -10,3 +10,13 @@ from .root import cmd_root
 from .install import cmd_install
 from .list import cmd_list
 from .show import cmd_show
+from .cache import cmd_cache
+from .stage import cmd_stage
+from .upgrade import cmd_upgrade
+from .bundle import cmd_export, cmd_import
+from .mirrors import cmd_mirrors
+from .cutoffs import cmd_cutoffs
+from .uninstall import cmd_uninstall
+from .loadtest import cmd_loadtest
+from .generate import cmd_generate
+from .diff import cmd_diff
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""Commands to export and import `SsspFamily` instances as self-contained bundles."""
+import click
+
+from aiida.cmdline.params import types
+from aiida.cmdline.utils import decorators, echo
+
+from .root import cmd_root
+from .utils import attempt
+
+
+@cmd_root.command('export')
+@click.argument('sssp_family', type=types.GroupParamType(sub_classes=('aiida.groups:sssp.family',)))
+@click.argument('output', type=click.Path(dir_okay=False, writable=True, resolve_path=True))
+@click.option('-f', '--force', is_flag=True, help='Overwrite the output file if it already exists.')
+@decorators.with_dbenv()
+def cmd_export(sssp_family, output, force):
+    """Export SSSP_FAMILY with its pseudo potentials and parameters to a single bundle file OUTPUT."""
+    import os
+
+    from aiida_sssp.groups import export_family
+
+    if os.path.exists(output) and not force:
+        echo.echo_critical('the file `{}` already exists: use `--force` to overwrite it'.format(output))
+
+    with attempt('exporting `{}`... '.format(sssp_family.label)):
+        export_family(sssp_family, output)
+
+    echo.echo_success('exported `{}` to `{}`'.format(sssp_family.label, output))
+
+
+@cmd_root.command('import')
+@click.argument('bundle', type=click.Path(exists=True, dir_okay=False, resolve_path=True))
+@click.option('-l', '--label', type=click.STRING, help='Label for the family, by default the label of the bundle.')
+@click.option('-t', '--traceback', is_flag=True, help='Include the stacktrace if an exception is encountered.')
+@decorators.with_dbenv()
+def cmd_import(bundle, label, traceback):
+    """Import an SSSP family from a BUNDLE created with `aiida-sssp export`, without network access."""
+    from aiida_sssp.groups import import_family
+
+    with attempt('importing bundle `{}`... '.format(bundle), include_traceback=traceback):
+        family = import_family(bundle, label)
+
+    echo.echo_success('imported `{}` containing {} pseudo potentials'.format(family.label, family.count()))
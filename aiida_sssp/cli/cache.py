@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""Commands to manage the caches of the contents of `SsspFamily` instances."""
+import click
+
+from aiida.cmdline.params import types
+from aiida.cmdline.utils import decorators, echo
+
+from .root import cmd_root
+
+
+@cmd_root.group('cache')
+def cmd_cache():
+    """Manage the caches of installed SSSP families."""
+
+
+@cmd_cache.command('snapshot')
+@click.option(
+    '-o',
+    '--output',
+    type=click.Path(dir_okay=False, writable=True, resolve_path=True),
+    help='Write the snapshot to this file instead of the default location of the current profile.'
+)
+@decorators.with_dbenv()
+def cmd_cache_snapshot(output):
+    """Write a snapshot of all installed SSSP families for lookups without database access."""
+    from aiida_sssp.cache import write_snapshot
+
+    snapshot = write_snapshot(output)
+    count = len(snapshot.family_uuids)
+
+    echo.echo_success('wrote snapshot with checksum {} of {} families'.format(snapshot.checksum, count))
+
+
+@cmd_cache.command('backend')
+@click.argument('name', type=click.Choice(['snapshot', 'shared', 'none']), required=False)
+@decorators.with_dbenv()
+def cmd_cache_backend(name):
+    """Show or set the cache backend used by SSSP families of the current profile.
+
+    The `snapshot` backend uses the snapshot written by `aiida-sssp cache snapshot`, the `shared` backend keeps all
+    families in memory shared by all processes on this host and `none` disables caching. Running daemon workers have to
+    be restarted for a change to take effect.
+    """
+    from aiida_sssp.cache import set_cache_backend
+    from aiida_sssp.cache.backends import DEFAULT_CACHE_BACKEND, OPTION_CACHE_BACKEND
+    from aiida_sssp.cache.config import get_option
+
+    if name is None:
+        echo.echo(get_option(OPTION_CACHE_BACKEND, DEFAULT_CACHE_BACKEND))
+        return
+
+    set_cache_backend(name)
+    echo.echo_success('configured the `{}` cache backend'.format(name))
+
+
+@cmd_cache.command('warmup')
+@click.argument('sssp_families', type=types.GroupParamType(sub_classes=('aiida.groups:sssp.family',)), nargs=-1)
+@click.option('-p', '--pseudos', is_flag=True, help='Also materialize the pseudos of the families in the pseudo store.')
+@click.option('-r', '--reset', is_flag=True, help='Disable the warm-up.')
+@click.option('-n', '--now', is_flag=True, help='Run the configured warm-up now and show its result.')
+@decorators.with_dbenv()
+def cmd_cache_warmup(sssp_families, pseudos, reset, now):
+    """Show or set the SSSP_FAMILIES whose caches are warmed up in each process of the current profile.
+
+    The warm-up starts in the background the first time a process loads an SSSP family, if the process was started with
+    the `AIIDA_SSSP_WARMUP` environment variable, for example the daemon workers of `AIIDA_SSSP_WARMUP=1 verdi daemon
+    start`. It loads the snapshot of the cache backend, writing it if it does not exist, builds the element index and
+    cutoff table and, with `--pseudos`, stores the pseudos of the families in the pseudo store. Running daemon workers
+    have to be restarted for a change to take effect.
+    """
+    from aiida_sssp.groups import get_warm_up, set_warm_up, warm_up
+
+    if sssp_families and reset:
+        echo.echo_critical('cannot specify both families and `--reset`.')
+
+    if reset:
+        set_warm_up([])
+        echo.echo_success('disabled the warm-up')
+    elif sssp_families:
+        set_warm_up([family.label for family in sssp_families], pseudos)
+        echo.echo_success('configured the warm-up of {} families'.format(len(sssp_families)))
+
+    config = get_warm_up()
+
+    if not now:
+        if config is None:
+            echo.echo_info('no warm-up is configured')
+            return
+
+        for label in config['families']:
+            echo.echo(label)
+
+        echo.echo_info('the pseudos are {}materialized'.format('' if config['pseudos'] else 'not '))
+        return
+
+    if config is None:
+        echo.echo_critical('no warm-up is configured.')
+
+    result = warm_up(config['families'], config['pseudos'])
+
+    for label in result['missing']:
+        echo.echo_warning('family `{}` does not exist'.format(label))
+
+    for label in result['uncached']:
+        echo.echo_warning('family `{}` is not in the snapshot of the cache backend'.format(label))
+
+    echo.echo_success(
+        'warmed up {} families and staged {} pseudos in {:.2f} s'.format(
+            result['families'], result['pseudos'], result['seconds']
+        )
+    )
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Command to compute the recommended cutoffs of all structures in a group."""
+import click
+
+from aiida.cmdline.params import options as options_core
+from aiida.cmdline.utils import decorators, echo
+
+from . import options
+from .root import cmd_root
+
+FORMATS = ('csv', 'jsonl')
+COLUMNS = ('pk', 'uuid', 'family', 'cutoff_wfc', 'cutoff_rho')
+
+
+@cmd_root.command('cutoffs')
+@options_core.GROUP(required=True, help='The group of structures for which to compute the cutoffs.')
+@options.SSSP_FAMILY(
+    callback=None, help='Use the cutoffs of this family instead of the family with the lowest cutoffs.'
+)
+@click.option(
+    '-o', '--output', type=click.File('w'), default='-', show_default=True, help='File to write the cutoffs to.'
+)
+@click.option(
+    '-T', '--format', 'fmt', type=click.Choice(FORMATS), default='csv', show_default=True, help='The output format.'
+)
+@click.option(
+    '-b',
+    '--batch-size',
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help='The number of structures to process at a time.'
+)
+@decorators.with_dbenv()
+def cmd_cutoffs(group, sssp_family, output, fmt, batch_size):
+    """Compute the recommended cutoffs of each structure in a group.
+
+    By default, the cutoffs are those of the SSSP family with the lowest cutoffs for the elements of each structure. The
+    structures are processed in batches and each row is written as soon as it is computed. Structures whose elements are
+    not covered by any family are written with empty cutoffs.
+    """
+    import csv
+    import json
+
+    from aiida.orm import QueryBuilder
+
+    from aiida_sssp.groups import SsspFamily, get_cutoff_table, iter_group_cutoffs
+
+    table = get_cutoff_table()
+
+    if not table.family_uuids:
+        echo.echo_critical('SSSP has not yet been installed: use `aiida-sssp install` to install it.')
+
+    builder = QueryBuilder().append(SsspFamily, filters={'uuid': {'in': table.family_uuids}}, project=['uuid', 'label'])
+    labels = dict(builder.all())
+
+    family_uuid = sssp_family.uuid if sssp_family is not None else None
+
+    try:
+        rows = iter_group_cutoffs(group, family_uuid, batch_size, table)
+
+        if fmt == 'csv':
+            writer = csv.writer(output, lineterminator='\n')
+            writer.writerow(COLUMNS)
+            for pk, uuid, family, cutoff_wfc, cutoff_rho in rows:
+                writer.writerow((pk, uuid, labels.get(family, ''), cutoff_wfc, cutoff_rho))
+        else:
+            for pk, uuid, family, cutoff_wfc, cutoff_rho in rows:
+                values = (pk, uuid, labels.get(family, None), cutoff_wfc, cutoff_rho)
+                output.write(json.dumps(dict(zip(COLUMNS, values))) + '\n')
+    except ValueError as exception:
+        echo.echo_critical(str(exception))
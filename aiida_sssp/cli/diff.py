@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""Command to compare two instances of `SsspFamily`."""
+import click
+
+from aiida.cmdline.params import types
+from aiida.cmdline.utils import decorators, echo
+
+from .root import cmd_root
+
+FORMATS = ('text', 'json')
+
+
+@cmd_root.command('diff')
+@click.argument('source', type=types.GroupParamType(sub_classes=('aiida.groups:sssp.family',)))
+@click.argument('target', type=types.GroupParamType(sub_classes=('aiida.groups:sssp.family',)))
+@click.option(
+    '-T', '--format', 'fmt', type=click.Choice(FORMATS), default='text', show_default=True, help='The output format.'
+)
+@decorators.with_dbenv()
+def cmd_diff(source, target, fmt):
+    """Compare the pseudos and cutoffs of the SSSP family TARGET to those of SOURCE.
+
+    Pseudos that are only in TARGET are marked with `+`, those only in SOURCE with `-` and those whose file or cutoffs
+    differ with `~`, in which case the change of the cutoffs of TARGET with respect to SOURCE is shown in parentheses.
+    """
+    import json
+
+    from tabulate import tabulate
+
+    from aiida_sssp.groups import diff_families
+
+    diff = diff_families(source, target)
+
+    if fmt == 'json':
+        echo.echo(json.dumps(diff, indent=4))
+        return
+
+    rows = []
+
+    for marker, key in (('+', 'added'), ('-', 'removed')):
+        for entry in diff[key]:
+            rows.append([marker, entry['element'], entry['filename'], entry['cutoff_wfc'], entry['cutoff_rho']])
+
+    for entry in diff['changed']:
+        before = entry['source']
+        after = entry['target']
+
+        if before['filename'] == after['filename'] and before['md5'] == after['md5']:
+            pseudo = after['filename']
+        elif before['filename'] == after['filename']:
+            pseudo = '{} (modified)'.format(after['filename'])
+        else:
+            pseudo = '{} -> {}'.format(before['filename'], after['filename'])
+
+        cutoffs = [
+            _format_cutoff(before['cutoff_wfc'], after['cutoff_wfc'], entry['delta_wfc']),
+            _format_cutoff(before['cutoff_rho'], after['cutoff_rho'], entry['delta_rho']),
+        ]
+        rows.append(['~', entry['element'], pseudo] + cutoffs)
+
+    if rows:
+        headers = ['', 'Element', 'Pseudo', 'Cutoff wfc', 'Cutoff rho']
+        echo.echo(tabulate(sorted(rows, key=lambda row: row[1]), headers=headers, missingval='-'))
+        echo.echo('')
+
+    echo.echo(
+        '{} added, {} removed, {} changed and {} unchanged pseudos from {} to {}'.format(
+            len(diff['added']), len(diff['removed']), len(diff['changed']), diff['unchanged'], source.label,
+            target.label
+        )
+    )
+
+
+def _format_cutoff(before, after, delta):
+    """Return the cutoff of the target followed by the change with respect to the source, if any."""
+    if before == after:
+        return '{}'.format(after if after is not None else '-')
+
+    if delta is None:
+        return '{} -> {}'.format(before if before is not None else '-', after if after is not None else '-')
+
+    return '{} ({:+})'.format(after, delta)
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""Commands to generate synthetic families and structures for scale testing."""
+import click
+
+from aiida.cmdline.params import options as options_core
+from aiida.cmdline.utils import decorators, echo
+
+from aiida_sssp.common.synthetic import ARCHIVE_FORMATS
+
+from . import options
+from .root import cmd_root
+
+NUM_ELEMENTS = click.option(
+    '-E',
+    '--num-elements',
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help='The number of elements, in order of atomic number.'
+)
+SEED = click.option('-s', '--seed', type=click.INT, default=0, show_default=True, help='Seed for the random content.')
+MESH_SIZE = click.option(
+    '-m',
+    '--mesh-size',
+    type=click.IntRange(min=1),
+    default=100,
+    show_default=True,
+    help='The number of values of the mesh of each UPF file, which determines its size.'
+)
+ARCHIVE_FORMAT = click.option(
+    '-T',
+    '--archive-format',
+    type=click.Choice(ARCHIVE_FORMATS),
+    help='Write the UPF files to an archive of this format.'
+)
+
+
+@cmd_root.group('generate')
+def cmd_generate():
+    """Generate synthetic families and structures for scale testing."""
+
+
+@cmd_generate.command('files')
+@click.argument('dirpath', type=click.Path(exists=True, file_okay=False, writable=True, resolve_path=True))
+@NUM_ELEMENTS
+@SEED
+@MESH_SIZE
+@ARCHIVE_FORMAT
+@decorators.with_dbenv()
+def cmd_generate_files(dirpath, num_elements, seed, mesh_size, archive_format):
+    """Write the UPF files and the parameters file of a synthetic family to DIRPATH.
+
+    The files are written to the `pseudos` subdirectory, or the archive with the same base name, and `parameters.json`,
+    which fails if they already exist.
+    """
+    from aiida_sssp.common import get_element_symbols, write_synthetic_family
+
+    try:
+        filepath, filepath_parameters = write_synthetic_family(
+            dirpath, get_element_symbols(num_elements), seed, mesh_size, archive_format
+        )
+    except (OSError, ValueError) as exception:
+        echo.echo_critical(str(exception))
+
+    echo.echo_success('wrote the pseudos to `{}` and the parameters to `{}`'.format(filepath, filepath_parameters))
+
+
+@cmd_generate.command('families')
+@click.option('-n', '--count', type=click.IntRange(min=1), default=1, show_default=True, help='The number of families.')
+@click.option(
+    '-l',
+    '--label-prefix',
+    type=click.STRING,
+    default='SSSP/synthetic',
+    show_default=True,
+    help='The families are labeled with this prefix followed by their index.'
+)
+@NUM_ELEMENTS
+@SEED
+@MESH_SIZE
+@ARCHIVE_FORMAT
+@decorators.with_dbenv()
+def cmd_generate_families(count, label_prefix, num_elements, seed, mesh_size, archive_format):
+    """Install synthetic SSSP families with parameters.
+
+    The pseudos of each family have a distinct content, such that no pseudos are shared between the families.
+    """
+    import tempfile
+    import time
+
+    from aiida_sssp.common import get_element_symbols, write_synthetic_family
+    from aiida_sssp.groups import SsspFamily
+
+    try:
+        elements = get_element_symbols(num_elements)
+    except ValueError as exception:
+        echo.echo_critical(str(exception))
+
+    start = time.perf_counter()
+
+    for index in range(count):
+        label = '{}/{}'.format(label_prefix, index)
+
+        with tempfile.TemporaryDirectory() as dirpath:
+            filepath, filepath_parameters = write_synthetic_family(
+                dirpath, elements, seed + index, mesh_size, archive_format
+            )
+
+            try:
+                if archive_format is None:
+                    SsspFamily.create_from_folder(filepath, label, filepath_parameters=filepath_parameters)
+                else:
+                    SsspFamily.create_from_archive(filepath, label, filepath_parameters=filepath_parameters)
+            except ValueError as exception:
+                echo.echo_critical(str(exception))
+
+    elapsed = time.perf_counter() - start
+    echo.echo_success('installed {} families of {} elements in {:.2f} s'.format(count, len(elements), elapsed))
+
+
+@cmd_generate.command('structures')
+@options_core.GROUP(required=True, help='The group to which to add the structures.')
+@options.SSSP_FAMILY(
+    callback=None, help='Compose the structures of the elements of this family instead of the first elements.'
+)
+@click.option(
+    '-n', '--count', type=click.IntRange(min=1), default=1000, show_default=True, help='The number of structures.'
+)
+@NUM_ELEMENTS
+@click.option(
+    '-M',
+    '--max-elements',
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help='The maximum number of distinct elements per structure.'
+)
+@click.option(
+    '-b',
+    '--batch-size',
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help='The number of structures to store at a time.'
+)
+@SEED
+@decorators.with_dbenv()
+def cmd_generate_structures(group, sssp_family, count, num_elements, max_elements, batch_size, seed):
+    """Store synthetic structures composed of random subsets of elements and add them to a group."""
+    import time
+
+    from aiida.manage.manager import get_manager
+
+    from aiida_sssp.common import get_element_symbols, iter_structure_batches
+
+    try:
+        elements = sssp_family.elements if sssp_family is not None else get_element_symbols(num_elements)
+        batches = iter_structure_batches(elements, count, batch_size, max_elements, seed)
+
+        start = time.perf_counter()
+
+        for batch in batches:
+            with get_manager().get_backend().transaction():
+                for structure in batch:
+                    structure.store()
+                group.add_nodes(batch)
+    except ValueError as exception:
+        echo.echo_critical(str(exception))
+
+    elapsed = time.perf_counter() - start
+    echo.echo_success('stored {} structures in group `{}` in {:.2f} s'.format(count, group.label, elapsed))
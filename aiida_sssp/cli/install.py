@@ -10,6 +10,7 @@ from .utils import attempt, create_family_from_archive
 from . import options
 
 URL_BASE = 'https://legacy-archive.materialscloud.org/file/2018.0001/v4/'
+OPTION_MIRRORS = 'mirrors'
 URL_MAPPING = {
     ('1.0', 'PBE', 'efficiency'): 'SSSP_1.0_PBE_efficiency',
     ('1.0', 'PBE', 'precision'): 'SSSP_1.0_PBE_precision',
@@ -20,66 +21,226 @@ URL_MAPPING = {
 }
 
 
+def get_mirrors():
+    """Return the mirrors configured for the current profile, or the default mirror if none are configured.
+
+    :return: list of mirrors, each either a base URL or the absolute path of a local directory
+    """
+    from aiida_sssp.cache.config import get_option
+
+    return get_option(OPTION_MIRRORS, None) or [URL_BASE]
+
+
+def download_configuration(version, functional, protocol, dirpath, traceback=False, mirrors=None, progress=None):
+    """Download the archive and metadata of the given configuration of the SSSP.
+
+    The mirrors are probed concurrently and the files are downloaded from the fastest healthy one, failing over to the
+    next one if a download fails. If the mirrors publish the checksum of a file, see
+    :py:func:`~aiida_sssp.common.download.fetch_checksum`, the downloaded file is verified against it.
+
+    :param version: the version of the configuration
+    :param functional: the functional of the configuration
+    :param protocol: the protocol of the configuration
+    :param dirpath: absolute path of the directory to which to write the downloaded files
+    :param traceback: boolean, if True, will print the traceback if the download fails
+    :param mirrors: optional list of mirrors, by default those configured for the current profile are used
+    :param progress: optional `Progress` to which the phases of probing the mirrors and the downloads are added
+    :return: tuple of the absolute filepaths of the archive and the metadata and a description with their checksums
+    """
+    from aiida_sssp.common import Progress, download_from_mirrors, fetch_checksum, probe_mirrors
+
+    try:
+        basename = URL_MAPPING[(version, functional, protocol)]
+    except KeyError:
+        echo.echo_critical('No SSSP available for {} {} {}'.format(version, functional, protocol))
+
+    filename_archive = basename + '.tar.gz'
+    filename_metadata = basename + '.json'
+
+    filepath_archive = os.path.join(dirpath, 'archive.tar.gz')
+    filepath_metadata = os.path.join(dirpath, 'metadata.json')
+    description = ''
+    progress = progress or Progress()
+    mirrors = mirrors or get_mirrors()
+
+    with attempt('probing mirrors... ', include_traceback=traceback):
+        with progress.phase('probe mirrors', 'mirrors', total=len(mirrors)) as phase:
+            mirrors = [mirror for mirror, _ in probe_mirrors(mirrors, filename_archive)]
+            phase.update(len(mirrors))
+
+    with attempt('downloading selected pseudo potentials archive... ', include_traceback=traceback):
+        md5 = fetch_checksum(mirrors, filename_archive, retries=1)
+        with progress.phase('download archive', 'B') as phase:
+            mirror, checksum = download_from_mirrors(mirrors, filename_archive, filepath_archive, md5=md5, phase=phase)
+        description += '\nArchive pseudos md5: {}'.format(checksum)
+
+    # Prefer the mirror that served the archive for the metadata, such that both files come from the same source.
+    mirrors.insert(0, mirrors.pop(mirrors.index(mirror)))
+
+    with attempt('downloading selected pseudo potentials metadata... ', include_traceback=traceback):
+        md5 = fetch_checksum(mirrors, filename_metadata, retries=1)
+        with progress.phase('download metadata', 'B') as phase:
+            _, checksum = download_from_mirrors(mirrors, filename_metadata, filepath_metadata, md5=md5, phase=phase)
+        description += '\nPseudo metadata md5: {}'.format(checksum)
+
+    return filepath_archive, filepath_metadata, description
+
+
+def install_configuration(
+    version, functional, protocol, filepath_archive, filepath_metadata, checksums=None, traceback=False, progress=None
+):
+    """Install the given configuration of the SSSP from a local archive and metadata file.
+
+    :param version: the version of the configuration
+    :param functional: the functional of the configuration
+    :param protocol: the protocol of the configuration
+    :param filepath_archive: absolute filepath of the archive with the pseudo potentials
+    :param filepath_metadata: absolute filepath of the metadata of the pseudo potentials
+    :param checksums: optional description with the checksums of the files, computed from the files if not specified
+    :param traceback: boolean, if True, will print the traceback if the installation fails
+    :param progress: optional `Progress` to which the phases of parsing the pseudos and storing the nodes are added
+    :return: the newly created `SsspFamily`
+    """
+    from aiida.common.files import md5_file
+
+    from aiida_sssp import __version__
+
+    label = '{}/{}/{}/{}'.format('SSSP', version, functional, protocol)
+    description = 'SSSP v{} {} {} installed with aiida-sssp v{}'.format(version, functional, protocol, __version__)
+
+    if checksums is None:
+        checksums = '\nArchive pseudos md5: {}\nPseudo metadata md5: {}'.format(
+            md5_file(filepath_archive), md5_file(filepath_metadata)
+        )
+
+    with attempt('unpacking archive and parsing pseudos... ', include_traceback=traceback):
+        family = create_family_from_archive(label, filepath_archive, filepath_metadata, progress=progress)
+
+    family.description = description + checksums
+    echo.echo_success('installed `{}` containing {} pseudo potentials'.format(label, family.count()))
+
+    return family
+
+
+def is_installed(version, functional, protocol):
+    """Return whether the given configuration of the SSSP is already installed.
+
+    :return: boolean
+    """
+    from aiida.orm import QueryBuilder
+
+    from aiida_sssp.groups import SsspFamily
+
+    label = '{}/{}/{}/{}'.format('SSSP', version, functional, protocol)
+
+    return QueryBuilder().append(SsspFamily, filters={'label': label}).count() > 0
+
+
 @cmd_root.command('install')
 @options.VERSION(type=click.Choice(['1.0', '1.1']), default='1.1')
 @options.FUNCTIONAL(type=click.Choice(['PBE', 'PBEsol']), default='PBE')
 @options.PROTOCOL(type=click.Choice(['efficiency', 'precision']), default='efficiency')
+@click.option(
+    '-m',
+    '--mirror',
+    'mirrors',
+    multiple=True,
+    help='Download from this mirror instead of the configured ones, can be specified multiple times.'
+)
+@click.option(
+    '--archive',
+    type=click.Path(exists=True, dir_okay=False, resolve_path=True),
+    help='Install from this local archive instead of downloading it, requires `--metadata`.'
+)
+@click.option(
+    '--metadata',
+    type=click.Path(exists=True, dir_okay=False, resolve_path=True),
+    help='Local metadata file of the archive passed with `--archive`.'
+)
+@click.option(
+    '-d',
+    '--directory',
+    type=click.Path(exists=True, file_okay=False, resolve_path=True),
+    help='Install all configurations whose archive and metadata are in this directory, with the same filenames as on '
+    'the mirrors. Configurations that are already installed are skipped.'
+)
+@click.option(
+    '-s',
+    '--summary',
+    type=click.Choice(['text', 'json']),
+    help='Print a summary of the timings of all phases of the installation in the given format.'
+)
 @click.option('-t', '--traceback', is_flag=True, help='Include the stacktrace if an exception is encountered.')
 @decorators.with_dbenv()
-def cmd_install(version, functional, protocol, traceback):
-    """Install a configuration of the SSSP."""
-    # pylint: disable=too-many-locals
-    import requests
+def cmd_install(version, functional, protocol, mirrors, archive, metadata, directory, summary, traceback):
+    """Install a configuration of the SSSP.
+
+    By default the configuration is downloaded, but it can also be installed without internet access from a local
+    archive and metadata file with `--archive` and `--metadata`, or from a directory with the files of any number of
+    configurations, as downloaded from a mirror, with `--directory`.
+    """
+    import json
     import tempfile
 
-    from aiida.common import exceptions
-    from aiida.common.files import md5_file
-    from aiida.orm import QueryBuilder
+    from aiida_sssp.common import Progress
 
-    from aiida_sssp import __version__
-    from aiida_sssp.groups import SsspFamily
+    from .utils import ProgressPrinter
 
-    label = '{}/{}/{}/{}'.format('SSSP', version, functional, protocol)
-    description = 'SSSP v{} {} {} installed with aiida-sssp v{}'.format(version, functional, protocol, __version__)
+    if (archive is None) != (metadata is None):
+        echo.echo_critical('the options `--archive` and `--metadata` have to be specified together.')
 
-    try:
-        QueryBuilder().append(SsspFamily, filters={'label': label}).limit(1).one()
-    except exceptions.NotExistent:
-        pass
-    else:
-        echo.echo_critical('SSSP {} {} {} is already installed: {}'.format(version, functional, protocol, label))
+    if len([value for value in (mirrors, archive, directory) if value]) > 1:
+        echo.echo_critical('the options `--mirror`, `--archive` and `--directory` are mutually exclusive.')
 
-    try:
-        url_base = os.path.join(URL_BASE, URL_MAPPING[(version, functional, protocol)])
-    except KeyError:
-        echo.echo_critical('No SSSP available for {} {} {}'.format(version, functional, protocol))
+    progress = Progress(ProgressPrinter())
+
+    if directory is not None:
+        configurations = []
 
-    with tempfile.TemporaryDirectory() as dirpath:
+        for configuration, basename in sorted(URL_MAPPING.items()):
+            filepath_archive = os.path.join(directory, basename + '.tar.gz')
+            filepath_metadata = os.path.join(directory, basename + '.json')
 
-        url_archive = url_base + '.tar.gz'
-        url_metadata = url_base + '.json'
+            if os.path.isfile(filepath_archive) and os.path.isfile(filepath_metadata):
+                configurations.append((configuration, filepath_archive, filepath_metadata))
 
-        filepath_archive = os.path.join(dirpath, 'archive.tar.gz')
-        filepath_metadata = os.path.join(dirpath, 'metadata.json')
+        if not configurations:
+            echo.echo_critical('no SSSP configurations found in `{}`.'.format(directory))
 
-        with attempt('downloading selected pseudo potentials archive... ', include_traceback=traceback):
-            response = requests.get(url_archive)
-            response.raise_for_status()
-            with open(filepath_archive, 'wb') as handle:
-                handle.write(response.content)
-                handle.flush()
-                description += '\nArchive pseudos md5: {}'.format(md5_file(filepath_archive))
+        for configuration, filepath_archive, filepath_metadata in configurations:
+            if is_installed(*configuration):
+                echo.echo_info('SSSP {} {} {} is already installed: skipping'.format(*configuration))
+                continue
 
-        with attempt('downloading selected pseudo potentials metadata... ', include_traceback=traceback):
-            response = requests.get(url_metadata)
-            response.raise_for_status()
-            with open(filepath_metadata, 'wb') as handle:
-                handle.write(response.content)
-                handle.flush()
-                description += '\nPseudo metadata md5: {}'.format(md5_file(filepath_metadata))
+            install_configuration(
+                *configuration, filepath_archive, filepath_metadata, traceback=traceback, progress=progress
+            )
 
-        with attempt('unpacking archive and parsing pseudos... ', include_traceback=traceback):
-            family = create_family_from_archive(label, filepath_archive, filepath_metadata)
+    elif is_installed(version, functional, protocol):
+        label = '{}/{}/{}/{}'.format('SSSP', version, functional, protocol)
+        echo.echo_critical('SSSP {} {} {} is already installed: {}'.format(version, functional, protocol, label))
+
+    elif archive is not None:
+        install_configuration(version, functional, protocol, archive, metadata, traceback=traceback, progress=progress)
 
-        family.description = description
-        echo.echo_success('installed `{}` containing {} pseudo potentials'.format(label, family.count()))
+    else:
+        with tempfile.TemporaryDirectory() as dirpath:
+
+            filepath_archive, filepath_metadata, checksums = download_configuration(
+                version, functional, protocol, dirpath, traceback, list(mirrors), progress
+            )
+            install_configuration(
+                version,
+                functional,
+                protocol,
+                filepath_archive,
+                filepath_metadata,
+                checksums,
+                traceback=traceback,
+                progress=progress
+            )
+
+    if summary == 'text':
+        echo.echo(progress.format_summary())
+    elif summary == 'json':
+        echo.echo(json.dumps(progress.as_dict(), indent=4))
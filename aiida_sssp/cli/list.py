@@ -7,8 +7,11 @@ from aiida.cmdline.utils import decorators, echo
 from . import options
 from .root import cmd_root
 
-PROJECTIONS_VALID = ('pk', 'uuid', 'label', 'description', 'count', 'version', 'functional', 'protocol')
+PROJECTIONS_VALID = (
+    'pk', 'uuid', 'label', 'description', 'count', 'version', 'functional', 'protocol', 'cutoff_wfc', 'cutoff_rho'
+)
 PROJECTIONS_DEFAULT = ('label', 'version', 'functional', 'protocol', 'count')
+PROJECTIONS_CUTOFFS = ('cutoff_wfc', 'cutoff_rho')
 
 
 def get_sssp_families_builder(version=None, functional=None, protocol=None):
@@ -37,24 +40,54 @@ def get_sssp_families_builder(version=None, functional=None, protocol=None):
 @options.VERSION(help='Filter for families with this version.')
 @options.FUNCTIONAL(help='Filter for families with this functional.')
 @options.PROTOCOL(help='Filter for families with this protocol.')
-@options_core.PROJECT(type=click.Choice(PROJECTIONS_VALID), default=PROJECTIONS_DEFAULT)
+@options.STRUCTURE(help='Filter for families that contain all elements of the given structure.')
+@options.ELEMENTS(help='Filter for families that contain all of the given elements.')
+@options_core.PROJECT(type=click.Choice(PROJECTIONS_VALID), default=None)
 @options_core.RAW()
 @decorators.with_dbenv()
-def cmd_list(version, functional, protocol, project, raw):
-    """List installed configurations of the SSSP."""
+def cmd_list(version, functional, protocol, structure, elements, project, raw):
+    """List installed configurations of the SSSP.
+
+    When filtering on elements, the maximum recommended cutoffs of those elements are shown for each family. Otherwise,
+    the cutoffs are the maximum over all elements of the family.
+    """
     from tabulate import tabulate
 
+    from aiida_sssp.groups import get_element_index
+
+    if structure and elements:
+        echo.echo_critical('the `--structure` and `--elements` options are mutually exclusive.')
+
+    if structure:
+        elements = structure.get_symbols_set()
+
+    if not project:
+        project = PROJECTIONS_DEFAULT + (PROJECTIONS_CUTOFFS if elements else ())
+
+    index = get_element_index() if elements or set(project).intersection(PROJECTIONS_CUTOFFS) else None
+    uuids = index.get_family_uuids(elements) if elements else None
+
+    def get_cutoff(family, position):
+        """Return the cutoff at the given position of the family for the selected elements."""
+        cutoffs = index.get_cutoffs(family.uuid, elements or index.get_elements(family.uuid))
+        return cutoffs[position] if cutoffs is not None else None
+
     mapping_project = {
         'count': lambda family: family.count(),
         'version': lambda family: family.label.split('/')[1],
         'functional': lambda family: family.label.split('/')[2],
         'protocol': lambda family: family.label.split('/')[3],
+        'cutoff_wfc': lambda family: get_cutoff(family, 0),
+        'cutoff_rho': lambda family: get_cutoff(family, 1),
     }
 
     rows = []
 
     for [group] in get_sssp_families_builder(version, functional, protocol).iterall():
 
+        if uuids is not None and group.uuid not in uuids:
+            continue
+
         row = []
 
         for projection in project:
@@ -66,6 +99,10 @@ def cmd_list(version, functional, protocol, project, raw):
 
         rows.append(row)
 
+    if not rows and elements:
+        echo.echo_info('no SSSP family contains all of the elements: {}'.format(', '.join(sorted(elements))))
+        return
+
     if not rows:
         echo.echo_info('SSSP has not yet been installed: use `aiida-sssp install` to install it.')
         return
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Command to load test the lookups of instances of `SsspFamily`."""
+import click
+
+from aiida.cmdline.params import types
+from aiida.cmdline.utils import decorators, echo
+
+from aiida_sssp.groups.loadtest import OPERATIONS
+
+from .root import cmd_root
+
+
+@cmd_root.command('loadtest')
+@click.argument('sssp_families', type=types.GroupParamType(sub_classes=('aiida.groups:sssp.family',)), nargs=-1)
+@click.option(
+    '-w', '--workers', type=click.IntRange(min=1), default=8, show_default=True, help='Worker threads per process.'
+)
+@click.option('-P', '--processes', type=click.IntRange(min=1), default=1, show_default=True, help='Processes.')
+@click.option(
+    '-n', '--requests', type=click.IntRange(min=1), default=1000, show_default=True, help='Requests per worker.'
+)
+@click.option(
+    '-o',
+    '--operation',
+    'operations',
+    type=click.Choice(OPERATIONS),
+    multiple=True,
+    help='Operation to perform, can be specified multiple times. By default all operations are performed.'
+)
+@click.option('--no-share', is_flag=True, help='Let each worker load its own family instances instead of sharing them.')
+@click.option(
+    '-c',
+    '--cache-backend',
+    type=click.Choice(['snapshot', 'shared', 'none']),
+    help='Use this cache backend instead of the configured.'
+)
+@click.option('-s', '--seed', type=click.INT, default=0, show_default=True, help='Seed for the random requests.')
+@click.option('-j', '--json', 'as_json', is_flag=True, help='Print the result as JSON.')
+@decorators.with_dbenv()
+def cmd_loadtest(sssp_families, workers, processes, requests, operations, no_share, cache_backend, seed, as_json):
+    """Load test the lookups of SSSP_FAMILIES by many concurrent workers.
+
+    Each worker resolves the pseudos and cutoffs of random synthetic structures against the families, which by default
+    are all installed families. The throughput, the latency percentiles of each operation and the number of database
+    queries are reported, such that caching strategies can be compared. The load test only reads from the database, but
+    should be run against a local test profile.
+    """
+    import json
+
+    from aiida.orm import QueryBuilder
+
+    from aiida_sssp.groups import SsspFamily, run_load_test
+
+    if not sssp_families:
+        sssp_families = [family for [family] in QueryBuilder().append(SsspFamily).iterall()]
+
+    if not sssp_families:
+        echo.echo_critical('SSSP has not yet been installed: use `aiida-sssp install` to install it.')
+
+    try:
+        result = run_load_test(
+            [family.uuid for family in sssp_families],
+            workers=workers,
+            processes=processes,
+            requests=requests,
+            operations=operations or OPERATIONS,
+            share_instances=not no_share,
+            cache_backend=cache_backend,
+            seed=seed,
+        )
+    except ValueError as exception:
+        echo.echo_critical(str(exception))
+
+    if as_json:
+        echo.echo(json.dumps(result.as_dict(), indent=4))
+    else:
+        echo.echo(result.format())
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""Command to configure the mirrors from which SSSP configurations are downloaded."""
+import click
+
+from aiida.cmdline.utils import decorators, echo
+
+from .root import cmd_root
+
+
+@cmd_root.command('mirrors')
+@click.argument('mirrors', nargs=-1)
+@click.option('-r', '--reset', is_flag=True, help='Reset the mirrors to the default.')
+@click.option('-p', '--probe', is_flag=True, help='Probe the mirrors and show their response times.')
+@decorators.with_dbenv()
+def cmd_mirrors(mirrors, reset, probe):
+    """Show or set the ordered list of MIRRORS from which SSSP configurations are downloaded.
+
+    Each mirror is either a base URL or the absolute path of a local directory containing the same files. On install,
+    the mirrors are probed concurrently and the fastest healthy one is used, failing over to the next on error.
+    """
+    from aiida_sssp.cache.config import set_option, unset_option
+    from aiida_sssp.common import probe_mirrors
+
+    from .install import OPTION_MIRRORS, URL_MAPPING, get_mirrors
+
+    if mirrors and reset:
+        echo.echo_critical('cannot specify both mirrors and `--reset`.')
+
+    if reset:
+        unset_option(OPTION_MIRRORS)
+        echo.echo_success('reset the mirrors to the default')
+    elif mirrors:
+        set_option(OPTION_MIRRORS, list(mirrors))
+        echo.echo_success('configured {} mirrors'.format(len(mirrors)))
+
+    if not probe:
+        for mirror in get_mirrors():
+            echo.echo(mirror)
+        return
+
+    filename = sorted(URL_MAPPING.values())[0] + '.tar.gz'
+
+    for mirror, latency in probe_mirrors(get_mirrors(), filename):
+        status = 'unavailable' if latency is None else '{:.3f} s'.format(latency)
+        echo.echo('{:<12} {}'.format(status, mirror))
@@ -3,9 +3,10 @@
 import click
 
 from aiida.cmdline.params.options import OverridableOption
+from aiida.cmdline.params.options.multivalue import MultipleValueOption
 from aiida.cmdline.params.types import DataParamType, GroupParamType
 
-__all__ = ('SSSP_FAMILY', 'VERSION', 'FUNCTIONAL', 'PROTOCOL')
+__all__ = ('SSSP_FAMILY', 'STRUCTURE', 'ELEMENTS', 'VERSION', 'FUNCTIONAL', 'PROTOCOL')
 
 
 def default_sssp_family(ctx, param, identifier):  # pylint: disable=unused-argument
@@ -39,6 +40,10 @@ STRUCTURE = OverridableOption(
     help='Filter for elements of the given structure.'
 )
 
+ELEMENTS = OverridableOption(
+    '-e', '--elements', cls=MultipleValueOption, type=click.STRING, help='Filter for the given elements.'
+)
+
 VERSION = OverridableOption(
     '-v', '--version', type=click.STRING, required=False, help='Select the version of the SSSP configuration.'
 )
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""Commands to stage the pseudo potentials of an `SsspFamily`."""
+import click
+
+from aiida.cmdline.params import options as options_core
+from aiida.cmdline.params import types
+from aiida.cmdline.utils import decorators, echo
+
+from .root import cmd_root
+from . import options
+
+
+@cmd_root.command('stage')
+@click.argument('sssp_family', type=types.GroupParamType(sub_classes=('aiida.groups:sssp.family',)))
+@options.STRUCTURE(help='Only stage the pseudo potentials for the elements of the given structure.')
+@options.ELEMENTS(help='Only stage the pseudo potentials for the given elements.')
+@click.option(
+    '-t',
+    '--target',
+    type=click.Path(exists=True, file_okay=False, writable=True, resolve_path=True),
+    help='Link the staged pseudo potentials into this directory.'
+)
+@click.option('--symlink', is_flag=True, help='Create symbolic links in the target directory instead of hardlinks.')
+@options_core.RAW()
+@decorators.with_dbenv()
+def cmd_stage(sssp_family, structure, elements, target, symlink, raw):
+    """Materialize the pseudo potentials of SSSP_FAMILY in the persistent content-addressed pseudo store.
+
+    Each file is copied out of the repository only once, after which it can be linked into any number of directories.
+    """
+    from tabulate import tabulate
+
+    if structure and elements:
+        echo.echo_critical('the `--structure` and `--elements` options are mutually exclusive.')
+
+    link = 'symlink' if symlink else 'hardlink'
+
+    try:
+        staged = sssp_family.stage_pseudos(target, tuple(elements or ()) or None, structure, link=link)
+    except ValueError as exception:
+        echo.echo_critical(str(exception))
+
+    rows = sorted(staged.items())
+
+    if raw:
+        echo.echo(tabulate(rows, tablefmt='plain'))
+    else:
+        echo.echo(tabulate(rows, headers=['Element', 'Filepath']))
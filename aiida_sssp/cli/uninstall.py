@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""Command to uninstall instances of `SsspFamily`."""
+import click
+
+from aiida.cmdline.params import options as options_core
+from aiida.cmdline.params import types
+from aiida.cmdline.utils import decorators, echo
+
+from .root import cmd_root
+
+
+@cmd_root.command('uninstall')
+@click.argument('sssp_families', type=types.GroupParamType(sub_classes=('aiida.groups:sssp.family',)), nargs=-1)
+@click.option('-a', '--all', 'uninstall_all', is_flag=True, help='Uninstall all SSSP families.')
+@click.option('-k', '--keep-pseudos', is_flag=True, help='Do not delete the pseudos, even if no longer referenced.')
+@click.option('-n', '--dry-run', is_flag=True, help='Only show what would be deleted.')
+@options_core.FORCE()
+@decorators.with_dbenv()
+def cmd_uninstall(sssp_families, uninstall_all, keep_pseudos, dry_run, force):
+    """Uninstall one or more SSSP_FAMILIES.
+
+    The families are deleted together with their parameters. Their pseudos are deleted as well, unless they are still
+    contained in another group or have links, for example because they were used in a calculation. Parameters that have
+    links are kept as well, which is reported with a warning.
+    """
+    from aiida.orm import QueryBuilder
+
+    from aiida_sssp.groups import SsspFamily, uninstall_families
+
+    if uninstall_all and sssp_families:
+        echo.echo_critical('the `--all` option cannot be combined with explicit families.')
+
+    if uninstall_all:
+        sssp_families = [family for [family] in QueryBuilder().append(SsspFamily).iterall()]
+
+    if not sssp_families:
+        echo.echo_critical('no SSSP families to uninstall: specify them explicitly or use `--all`.')
+
+    labels = ', '.join(sorted(family.label for family in sssp_families))
+
+    if dry_run:
+        result = uninstall_families(sssp_families, keep_pseudos=keep_pseudos, dry_run=True)
+        echo.echo_info(
+            'would delete {families} families, {parameters} parameters and {pseudos} pseudos, '
+            'keeping {kept} pseudos that are still referenced'.format(**result)
+        )
+        _warn_kept_parameters(result, 'would keep')
+        return
+
+    if not force:
+        click.confirm('Are you sure you want to uninstall {}?'.format(labels), abort=True)
+
+    result = uninstall_families(sssp_families, keep_pseudos=keep_pseudos)
+
+    echo.echo_success(
+        'deleted {families} families, {parameters} parameters and {pseudos} pseudos, '
+        'keeping {kept} pseudos that are still referenced'.format(**result)
+    )
+    _warn_kept_parameters(result, 'kept')
+
+
+def _warn_kept_parameters(result, verb):
+    """Warn about the parameters of the uninstalled families that are not deleted because they have links.
+
+    :param result: the dictionary returned by `uninstall_families`
+    :param verb: the verb that describes what happens to the parameters
+    """
+    if result['kept_parameters']:
+        echo.echo_warning(
+            '{} {} parameters that have links, for example because they were used in a calculation'.format(
+                verb, result['kept_parameters']
+            )
+        )
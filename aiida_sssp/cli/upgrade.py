@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Commands to upgrade an installed `SsspFamily` to another configuration."""
+import click
+
+from aiida.cmdline.params import types
+from aiida.cmdline.utils import decorators, echo
+
+from .install import download_configuration
+from .root import cmd_root
+from .utils import attempt, upgrade_family_from_archive
+from . import options
+
+
+@cmd_root.command('upgrade')
+@click.argument('sssp_family', type=types.GroupParamType(sub_classes=('aiida.groups:sssp.family',)))
+@options.VERSION(type=click.Choice(['1.0', '1.1']), default='1.1')
+@options.FUNCTIONAL(
+    type=click.Choice(['PBE', 'PBEsol']), help='Select the functional, by default the one of SSSP_FAMILY.'
+)
+@options.PROTOCOL(
+    type=click.Choice(['efficiency', 'precision']), help='Select the protocol, by default the one of SSSP_FAMILY.'
+)
+@click.option('-t', '--traceback', is_flag=True, help='Include the stacktrace if an exception is encountered.')
+@decorators.with_dbenv()
+def cmd_upgrade(sssp_family, version, functional, protocol, traceback):
+    """Install a configuration of the SSSP by upgrading the installed SSSP_FAMILY.
+
+    Only the pseudo potentials that differ from those in SSSP_FAMILY are stored, all others are reused. SSSP_FAMILY
+    itself is left untouched.
+    """
+    import tempfile
+
+    from aiida.common import exceptions
+    from aiida.orm import QueryBuilder
+
+    from aiida_sssp import __version__
+    from aiida_sssp.groups import SsspFamily
+
+    try:
+        _, _, functional_source, protocol_source = sssp_family.label.split('/')
+    except ValueError:
+        functional_source, protocol_source = None, None
+
+    functional = functional or functional_source
+    protocol = protocol or protocol_source
+
+    if functional is None or protocol is None:
+        echo.echo_critical(
+            'cannot determine configuration of {}: specify `--functional` and `--protocol`'.format(sssp_family)
+        )
+
+    label = '{}/{}/{}/{}'.format('SSSP', version, functional, protocol)
+    description = 'SSSP v{} {} {} upgraded from `{}` with aiida-sssp v{}'.format(
+        version, functional, protocol, sssp_family.label, __version__
+    )
+
+    try:
+        QueryBuilder().append(SsspFamily, filters={'label': label}).limit(1).one()
+    except exceptions.NotExistent:
+        pass
+    else:
+        echo.echo_critical('SSSP {} {} {} is already installed: {}'.format(version, functional, protocol, label))
+
+    with tempfile.TemporaryDirectory() as dirpath:
+
+        filepath_archive, filepath_metadata, checksums = download_configuration(
+            version, functional, protocol, dirpath, traceback
+        )
+        description += checksums
+
+        with attempt('unpacking archive and storing changed pseudos... ', include_traceback=traceback):
+            family = upgrade_family_from_archive(sssp_family, label, filepath_archive, filepath_metadata)
+
+        family.description = description
+        reused = len(set(node.uuid for node in family.nodes) & set(node.uuid for node in sssp_family.nodes))
+        echo.echo_success(
+            'installed `{}` containing {} pseudo potentials, of which {} reused from `{}`'.format(
+                label, family.count(), reused, sssp_family.label
+            )
+        )
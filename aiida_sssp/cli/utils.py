@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 """Command line interface utilities."""
 from contextlib import contextmanager
+
 from aiida.cmdline.utils import echo
 
-__all__ = ('attempt', 'create_family_from_archive')
+__all__ = ('ProgressPrinter', 'attempt', 'create_family_from_archive', 'upgrade_family_from_archive')
 
 
 @contextmanager
@@ -30,33 +31,102 @@ def attempt(message, exception_types=Exception, include_traceback=False):
         echo.echo_highlight(' [OK]', color='success', bold=True)
 
 
-def create_family_from_archive(label, filepath_archive, filepath_metadata=None, fmt=None):
-    """Construct a new `SsspFamily` instance from a tar.gz archive.
+class ProgressPrinter:
+    """Listener for a `Progress` that shows the state of the current phase after the message of the last `attempt`.
+
+    The state is overwritten in place and erased when the phase finishes, such that the `attempt` can still append its
+    result to the same line. Updates are throttled and only shown if the output is a terminal.
+    """
+
+    def __init__(self, interval=0.2):
+        """Construct a new instance.
+
+        :param interval: the minimum number of seconds between two updates
+        """
+        import click
+
+        self._stream = click.get_text_stream('stdout')
+        self._enabled = self._stream.isatty()
+        self._interval = interval
+        self._updated = None
+        self._width = 0
+
+    def __call__(self, phase):
+        """Show the state of the given phase, or erase it if the phase has finished.
+
+        :param phase: the `ProgressPhase` that started, advanced or finished
+        """
+        import time
+
+        if not self._enabled:
+            return
+
+        now = time.monotonic()
+
+        if phase.finished is None and self._updated is not None and now - self._updated < self._interval:
+            return
+
+        self._updated = None if phase.finished is not None else now
+        text = '' if phase.finished is not None else phase.format()
+        padding = max(self._width - len(text), 0)
+
+        self._stream.write('\b' * self._width + text + ' ' * padding + '\b' * padding)
+        self._stream.flush()
+        self._width = len(text)
+
+
+def create_family_from_archive(label, filepath_archive, filepath_metadata=None, fmt=None, progress=None):
+    """Construct a new `SsspFamily` instance from an archive, without extracting it to disk.
 
-    .. warning:: the archive should not contain any subdirectories, but just the pseudos in UPF format.
+    Directories and files that are not in UPF format are skipped. Pseudo potentials that already exist in the database
+    are reused instead of being stored again.
 
     :param label: the label for the new family
-    :param filepath: absolute filepath to the .tar.gz archive containing the pseudo potentials.
-    :param filepath: optional absolute filepath to the .json file containing the pseudo potentials metadata.
+    :param filepath_archive: absolute filepath to the archive containing the pseudo potentials.
+    :param filepath_metadata: optional absolute filepath to the .json file containing the pseudo potentials metadata.
     :param fmt: the format of the archive, if not specified will attempt to guess based on extension of `filepath`
+    :param progress: optional `Progress` to which the phases of parsing the pseudos and storing the nodes are added
     :return: newly created `SsspFamily`
-    :raises OSError: if the archive could not be unpacked or pseudos in it could not be parsed into a `SsspFamily`
+    :raises OSError: if the archive could not be read or pseudos in it could not be parsed into a `SsspFamily`
     """
-    import shutil
-    import tempfile
-
     from aiida_sssp.groups import SsspFamily
 
-    with tempfile.TemporaryDirectory() as dirpath:
+    try:
+        family = SsspFamily.create_from_archive(
+            filepath_archive,
+            label,
+            filepath_parameters=filepath_metadata,
+            fmt=fmt,
+            deduplicate=True,
+            progress=progress
+        )
+    except OSError as exception:
+        raise OSError('failed to unpack the archive `{}`: {}'.format(filepath_archive, exception))
+    except ValueError as exception:
+        raise OSError('failed to parse pseudos from `{}`: {}'.format(filepath_archive, exception))
 
-        try:
-            shutil.unpack_archive(filepath_archive, dirpath, format=fmt)
-        except shutil.ReadError as exception:
-            raise OSError('failed to unpack the archive `{}`: {}'.format(filepath_archive, exception))
+    return family
 
-        try:
-            family = SsspFamily.create_from_folder(dirpath, label, filepath_parameters=filepath_metadata)
-        except ValueError as exception:
-            raise OSError('failed to parse pseudos from `{}`: {}'.format(dirpath, exception))
 
-    return family
+def upgrade_family_from_archive(family, label, filepath_archive, filepath_metadata=None, fmt=None):
+    """Construct a new `SsspFamily` instance from an archive, reusing the pseudos of an existing family.
+
+    The archive is not extracted to disk and, if the metadata is specified, only the files whose filename or checksum
+    changed with respect to the existing family are read. Directories and files that are not in UPF format are skipped.
+
+    :param family: the existing `SsspFamily` whose pseudos to reuse where unchanged
+    :param label: the label for the new family
+    :param filepath_archive: absolute filepath to the archive containing the pseudo potentials.
+    :param filepath_metadata: optional absolute filepath to the .json file containing the pseudo potentials metadata.
+    :param fmt: the format of the archive, if not specified will attempt to guess based on extension of `filepath`
+    :return: newly created `SsspFamily`
+    :raises OSError: if the archive could not be unpacked or pseudos in it could not be parsed into a `SsspFamily`
+    """
+    try:
+        upgraded = family.upgrade_from_archive(filepath_archive, label, filepath_parameters=filepath_metadata, fmt=fmt)
+    except OSError as exception:
+        raise OSError('failed to unpack the archive `{}`: {}'.format(filepath_archive, exception))
+    except ValueError as exception:
+        raise OSError('failed to parse pseudos from `{}`: {}'.format(filepath_archive, exception))
+
+    return upgraded
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=undefined-variable
+from .archive import *
+from .download import *
+from .progress import *
+from .synthetic import *
+from .upf import *
+
+__all__ = (archive.__all__ + download.__all__ + progress.__all__ + synthetic.__all__ + upf.__all__)
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""Readers that stream the members of archives of pseudo potentials without extracting them to disk.
+
+Each supported format is implemented by a subclass of :py:class:`ArchiveReader` that is registered with the decorator
+:py:func:`register_archive_reader`, which is also how support for additional formats can be added. The reader for an
+archive is selected by its filename extension, or explicitly by the name of its format.
+"""
+import os
+import tarfile
+import zipfile
+
+__all__ = (
+    'ArchiveReader', 'TarArchiveReader', 'ZipArchiveReader', 'ZstdTarArchiveReader', 'get_archive_reader',
+    'iter_upf_members', 'register_archive_reader'
+)
+
+ARCHIVE_READERS = []
+UPF_EXTENSION = '.upf'
+
+
+def register_archive_reader(cls):
+    """Register the given subclass of `ArchiveReader`, such that it is used for archives of its formats.
+
+    Readers that are registered later take precedence over earlier ones for the same format or extension.
+
+    :param cls: subclass of `ArchiveReader`
+    :return: the class itself, such that this function can be used as a class decorator
+    """
+    ARCHIVE_READERS.insert(0, cls)
+    return cls
+
+
+class ArchiveReader:
+    """Base class for a reader that streams the members of archives of a particular format."""
+
+    formats = ()
+    extensions = ()
+
+    def __init__(self, filepath):
+        """Construct a new instance.
+
+        :param filepath: absolute filepath of the archive
+        """
+        self._filepath = filepath
+
+    @property
+    def filepath(self):
+        """Return the absolute filepath of the archive.
+
+        :return: absolute filepath
+        """
+        return self._filepath
+
+    def iter_members(self):
+        """Yield the regular files in the archive in the order in which they are stored, skipping directories.
+
+        Each handle is only valid until the next member is requested.
+
+        :return: generator of tuples of the name of the member and a binary filelike object with its content
+        :raises OSError: if the archive could not be read
+        """
+        raise NotImplementedError
+
+
+@register_archive_reader
+class TarArchiveReader(ArchiveReader):
+    """Reader for tar archives, either uncompressed or compressed with gzip, bzip2 or xz."""
+
+    formats = ('tar', 'gztar', 'bztar', 'xztar')
+    extensions = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+
+    def iter_members(self):
+        """Yield the regular files in the archive in the order in which they are stored, skipping directories.
+
+        :return: generator of tuples of the name of the member and a binary filelike object with its content
+        :raises OSError: if the archive could not be read
+        """
+        try:
+            with tarfile.open(self._filepath, 'r|*') as archive:
+                yield from self._iter_tar_members(archive)
+        except tarfile.TarError as exception:
+            raise OSError('failed to read the archive `{}`: {}'.format(self._filepath, exception))
+
+    @staticmethod
+    def _iter_tar_members(archive):
+        """Yield the regular files of an opened `TarFile`."""
+        for member in archive:
+            if member.isfile():
+                yield member.name, archive.extractfile(member)
+
+
+@register_archive_reader
+class ZstdTarArchiveReader(TarArchiveReader):
+    """Reader for tar archives compressed with zstandard, which requires the optional `zstandard` package."""
+
+    formats = ('zstdtar',)
+    extensions = ('.tar.zst', '.tzst')
+
+    def iter_members(self):
+        """Yield the regular files in the archive in the order in which they are stored, skipping directories.
+
+        :return: generator of tuples of the name of the member and a binary filelike object with its content
+        :raises OSError: if the archive could not be read or the `zstandard` package is not installed
+        """
+        try:
+            import zstandard
+        except ImportError:
+            raise OSError(
+                'reading `{}` requires the `zstandard` package: pip install aiida-sssp[zstd]'.format(self._filepath)
+            )
+
+        try:
+            with open(self._filepath, 'rb') as handle:
+                with zstandard.ZstdDecompressor().stream_reader(handle) as stream:
+                    with tarfile.open(fileobj=stream, mode='r|') as archive:
+                        yield from self._iter_tar_members(archive)
+        except (tarfile.TarError, zstandard.ZstdError) as exception:
+            raise OSError('failed to read the archive `{}`: {}'.format(self._filepath, exception))
+
+
+@register_archive_reader
+class ZipArchiveReader(ArchiveReader):
+    """Reader for zip archives."""
+
+    formats = ('zip',)
+    extensions = ('.zip',)
+
+    def iter_members(self):
+        """Yield the regular files in the archive in the order in which they are stored, skipping directories.
+
+        :return: generator of tuples of the name of the member and a binary filelike object with its content
+        :raises OSError: if the archive could not be read
+        """
+        try:
+            with zipfile.ZipFile(self._filepath) as archive:
+                for info in archive.infolist():
+                    if not info.filename.endswith('/'):
+                        with archive.open(info) as handle:
+                            yield info.filename, handle
+        except zipfile.BadZipFile as exception:
+            raise OSError('failed to read the archive `{}`: {}'.format(self._filepath, exception))
+
+
+def get_archive_reader(filepath, fmt=None):
+    """Return a reader for the given archive.
+
+    :param filepath: absolute filepath of the archive
+    :param fmt: optional name of the format of the archive, by default it is determined from the filename extension
+    :return: instance of a subclass of `ArchiveReader`
+    :raises OSError: if the format is not supported
+    """
+    filename = os.path.basename(filepath).lower()
+
+    for cls in ARCHIVE_READERS:
+        if fmt is not None and fmt in cls.formats:
+            return cls(filepath)
+
+        if fmt is None and any(filename.endswith(extension) for extension in cls.extensions):
+            return cls(filepath)
+
+    if fmt is not None:
+        raise OSError('unsupported archive format `{}`'.format(fmt))
+
+    raise OSError('unsupported archive format of `{}`'.format(filepath))
+
+
+def iter_upf_members(filepath, fmt=None):
+    """Yield the UPF files in the given archive, skipping directories and all other files.
+
+    Files are recognized by their `.upf` extension, regardless of case, and are yielded by their filename without the
+    path of the directory, if any, in which they are placed in the archive.
+
+    :param filepath: absolute filepath of the archive
+    :param fmt: optional name of the format of the archive, by default it is determined from the filename extension
+    :return: generator of tuples of the filename and a binary filelike object with the content of the file, which is
+        only valid until the next file is requested
+    :raises OSError: if the format is not supported or the archive could not be read
+    """
+    for name, handle in get_archive_reader(filepath, fmt).iter_members():
+        filename = os.path.basename(name)
+
+        if filename.lower().endswith(UPF_EXTENSION):
+            yield filename, handle
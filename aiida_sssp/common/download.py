@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""Utilities to download files over HTTP that are robust against unreliable connections.
+
+A download that fails partway is not restarted from scratch, but resumed from the bytes that were already written, by
+means of an HTTP `Range` request. If the server does not support range requests, or the file changed on the server in
+the meantime, as determined through the `If-Range` header, the server responds with the full file and the download
+starts over. Failed attempts are retried a bounded number of times with exponential backoff, such that a download over
+a bad link either completes or fails in a predictable amount of time.
+
+Files can be served by multiple mirrors, which are either base URLs or paths of local directories. The mirrors are
+probed concurrently and files are fetched from the fastest healthy mirror, failing over to the next one on error.
+Mirrors can publish the MD5 checksum of a file next to it, see :py:func:`fetch_checksum`, against which the download is
+then verified.
+"""
+import hashlib
+import os
+import re
+import shutil
+import time
+
+__all__ = ('download_file', 'download_from_mirrors', 'fetch_checksum', 'probe_mirrors')
+
+DEFAULT_RETRIES = 5
+DEFAULT_BACKOFF = 1.0
+DEFAULT_TIMEOUT = 30
+DEFAULT_CHUNK_SIZE = 2**16
+DEFAULT_PROBE_TIMEOUT = 5
+SUFFIX_CHECKSUM = '.md5'
+
+
+def download_file(
+    url,
+    filepath,
+    md5=None,
+    retries=DEFAULT_RETRIES,
+    backoff=DEFAULT_BACKOFF,
+    timeout=DEFAULT_TIMEOUT,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    phase=None
+):
+    """Download the file at the given URL to the given filepath, resuming partial downloads where possible.
+
+    If `filepath` already exists, it is considered a partial download of the same file and only the remaining bytes are
+    requested. Once complete, the size of the file is verified against the size reported by the server and, if given,
+    its content against the expected MD5 checksum. A file that fails verification is removed.
+
+    :param url: the URL of the file to download
+    :param filepath: absolute filepath to which to write the file
+    :param md5: optional expected MD5 checksum of the file
+    :param retries: the maximum number of times to retry after a failed attempt
+    :param backoff: the number of seconds to wait before the first retry, which is doubled for every following retry
+    :param timeout: the number of seconds to wait for the server to connect or send data before an attempt fails
+    :param chunk_size: the number of bytes to write to disk at a time
+    :param phase: optional `ProgressPhase` that is advanced by the number of bytes downloaded
+    :return: the MD5 checksum of the downloaded file
+    :raises requests.RequestException: if the download still fails after all retries or the server responds with an
+        error that is not worth retrying
+    :raises ValueError: if the downloaded file does not match the expected size or checksum
+    """
+    import requests
+    from requests.exceptions import ChunkedEncodingError
+
+    validators = {}
+    attempt = 0
+
+    while True:
+        try:
+            _download(url, filepath, validators, timeout, chunk_size, phase)
+        except (requests.ConnectionError, requests.Timeout, requests.HTTPError, ChunkedEncodingError) as exception:
+            response = getattr(exception, 'response', None)
+            if response is not None and response.status_code < 500:
+                raise
+            if attempt >= retries:
+                raise
+            time.sleep(backoff * 2**attempt)
+            attempt += 1
+        else:
+            break
+
+    checksum = _md5_file(filepath, chunk_size)
+
+    if md5 is not None and checksum != md5:
+        os.remove(filepath)
+        raise ValueError('checksum of `{}` is `{}` but expected `{}`'.format(url, checksum, md5))
+
+    return checksum
+
+
+def fetch_checksum(mirrors, path, **kwargs):
+    """Return the MD5 checksum that the given mirrors publish for the file with the given path.
+
+    The checksum is published in a file with the path of the file followed by `.md5`, in the format written by `md5sum`:
+    the checksum, optionally followed by the filename.
+
+    :param mirrors: list of mirrors in the order in which to try them, each either a base URL or the absolute path of a
+        local directory
+    :param path: the path of the file relative to the base of the mirrors
+    :param kwargs: keyword arguments that are passed to :py:func:`download_file` for mirrors that are URLs
+    :return: the checksum, or `None` if none of the mirrors publishes a valid checksum for the file
+    """
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as dirpath:
+        filepath = os.path.join(dirpath, os.path.basename(path) + SUFFIX_CHECKSUM)
+
+        try:
+            download_from_mirrors(mirrors, path + SUFFIX_CHECKSUM, filepath, **kwargs)
+        except OSError:
+            return None
+
+        with open(filepath, 'r', encoding='utf-8', errors='replace') as handle:
+            fields = handle.read().split()
+
+    checksum = fields[0].lower() if fields else ''
+
+    return checksum if re.fullmatch(r'[0-9a-f]{32}', checksum) else None
+
+
+def probe_mirrors(mirrors, path, timeout=DEFAULT_PROBE_TIMEOUT):
+    """Probe the given mirrors concurrently for the file with the given path and order them by their response time.
+
+    A mirror is healthy if it responds to a `HEAD` request for the file with a success status within the timeout, or,
+    for a local directory, if it contains the file. Healthy mirrors are returned first, fastest first, followed by the
+    unhealthy ones in their original order, such that they are still tried as a last resort.
+
+    :param mirrors: list of mirrors, each either a base URL or the absolute path of a local directory
+    :param path: the path of the file relative to the base of the mirrors
+    :param timeout: the number of seconds after which a mirror that did not respond is considered unhealthy
+    :return: list of tuples of a mirror and its response time in seconds, which is `None` for unhealthy mirrors
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if not mirrors:
+        return []
+
+    with ThreadPoolExecutor(max_workers=len(mirrors)) as executor:
+        latencies = list(executor.map(lambda mirror: _probe_mirror(mirror, path, timeout), mirrors))
+
+    healthy = sorted((latency, index) for index, latency in enumerate(latencies) if latency is not None)
+    unhealthy = [index for index, latency in enumerate(latencies) if latency is None]
+
+    return [(mirrors[index], latency) for latency, index in healthy] + [(mirrors[index], None) for index in unhealthy]
+
+
+def download_from_mirrors(mirrors, path, filepath, md5=None, phase=None, **kwargs):
+    """Download the file with the given path from the first of the given mirrors that succeeds.
+
+    :param mirrors: list of mirrors in the order in which to try them, each either a base URL or the absolute path of a
+        local directory
+    :param path: the path of the file relative to the base of the mirrors
+    :param filepath: absolute filepath to which to write the file
+    :param md5: optional expected MD5 checksum of the file
+    :param phase: optional `ProgressPhase` that is advanced by the number of bytes downloaded
+    :param kwargs: keyword arguments that are passed to :py:func:`download_file` for mirrors that are URLs
+    :return: tuple of the mirror from which the file was downloaded and the MD5 checksum of the file
+    :raises OSError: if the file could not be downloaded from any of the mirrors
+    """
+    import requests
+
+    errors = []
+
+    for mirror in mirrors:
+        try:
+            if _is_local(mirror):
+                checksum = _copy_file(os.path.join(_get_local_dirpath(mirror), path), filepath, md5, phase)
+            else:
+                url = '{}/{}'.format(mirror.rstrip('/'), path)
+                checksum = download_file(url, filepath, md5, phase=phase, **kwargs)
+        except (OSError, ValueError, requests.RequestException) as exception:
+            errors.append('{}: {}'.format(mirror, exception))
+            if os.path.exists(filepath):
+                os.remove(filepath)
+        else:
+            return mirror, checksum
+
+    raise OSError('failed to download `{}` from any mirror:\n{}'.format(path, '\n'.join(errors)))
+
+
+def _download(url, filepath, validators, timeout, chunk_size, phase=None):
+    """Perform a single attempt at downloading the given URL, continuing from the content already in `filepath`.
+
+    :param validators: dictionary that is shared between attempts, in which the `ETag` or `Last-Modified` value of the
+        first response is stored. It is sent as the `If-Range` header of subsequent requests, such that the server only
+        returns a partial response if the file did not change in the meantime.
+    :param phase: optional `ProgressPhase` that is advanced by the number of bytes downloaded
+    :raises ValueError: if the size of the downloaded file does not match the size reported by the server
+    """
+    import requests
+
+    try:
+        offset = os.path.getsize(filepath)
+    except FileNotFoundError:
+        offset = 0
+
+    # Content encoding is disabled such that the size of the body corresponds to the size reported by the server.
+    headers = {'Accept-Encoding': 'identity'}
+
+    if offset:
+        headers['Range'] = 'bytes={}-'.format(offset)
+        if url in validators:
+            headers['If-Range'] = validators[url]
+
+    with requests.get(url, headers=headers, stream=True, timeout=timeout) as response:
+
+        if response.status_code == 416:
+            # The requested range starts at or beyond the end of the file. If the partial download has exactly the size
+            # of the file, a previous attempt wrote all content but failed before completing, otherwise it is invalid.
+            total = _get_total_size(response)
+            if total is not None and total == offset:
+                if phase is not None:
+                    phase.total = phase.count = total
+                    phase.notify()
+                return
+            os.remove(filepath)
+            raise requests.ConnectionError('partial download of `{}` is invalid, restarting'.format(url))
+
+        response.raise_for_status()
+
+        if response.status_code != 206:
+            offset = 0
+
+        validator = response.headers.get('ETag', response.headers.get('Last-Modified', None))
+
+        if validator is not None:
+            validators[url] = validator
+
+        total = _get_total_size(response)
+
+        if phase is not None:
+            phase.total = total
+            phase.count = offset
+
+        with open(filepath, 'ab' if offset else 'wb') as handle:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                handle.write(chunk)
+                if phase is not None:
+                    phase.update(len(chunk))
+
+    size = os.path.getsize(filepath)
+
+    if total is not None and size != total:
+        if size > total:
+            os.remove(filepath)
+            raise ValueError('downloaded {} bytes from `{}` but expected {}'.format(size, url, total))
+        raise requests.ConnectionError('download of `{}` ended after {} of {} bytes'.format(url, size, total))
+
+
+def _get_total_size(response):
+    """Return the total size of the file in bytes as reported by the headers of the response, if any.
+
+    :param response: a `requests.Response`
+    :return: the size in bytes or `None` if the server did not report it
+    """
+    content_range = response.headers.get('Content-Range', None)
+
+    if content_range is not None:
+        _, _, total = content_range.rpartition('/')
+        return int(total) if total.isdigit() else None
+
+    content_length = response.headers.get('Content-Length', None)
+
+    if content_length is not None and response.status_code == 200:
+        return int(content_length)
+
+    return None
+
+
+def _md5_file(filepath, chunk_size):
+    """Return the MD5 checksum of the file with the given filepath."""
+    md5 = hashlib.md5()
+
+    with open(filepath, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b''):
+            md5.update(chunk)
+
+    return md5.hexdigest()
+
+
+def _is_local(mirror):
+    """Return whether the given mirror is a local directory, either as an absolute path or a `file://` URL."""
+    return mirror.startswith('file://') or os.path.isabs(mirror)
+
+
+def _get_local_dirpath(mirror):
+    """Return the absolute path of the directory of the given local mirror."""
+    return mirror[len('file://'):] if mirror.startswith('file://') else mirror
+
+
+def _probe_mirror(mirror, path, timeout):
+    """Probe the given mirror for the file with the given path.
+
+    :return: the response time in seconds or `None` if the mirror is unhealthy
+    """
+    import requests
+
+    if _is_local(mirror):
+        return 0. if os.path.isfile(os.path.join(_get_local_dirpath(mirror), path)) else None
+
+    start = time.monotonic()
+
+    try:
+        response = requests.head('{}/{}'.format(mirror.rstrip('/'), path), timeout=timeout, allow_redirects=True)
+        response.raise_for_status()
+    except requests.RequestException:
+        return None
+
+    return time.monotonic() - start
+
+
+def _copy_file(source, filepath, md5=None, phase=None):
+    """Copy the file from a local mirror, verifying the expected MD5 checksum if specified.
+
+    :param phase: optional `ProgressPhase` that is advanced by the number of bytes copied
+    :return: the MD5 checksum of the copied file
+    :raises ValueError: if the copied file does not match the expected checksum
+    """
+    shutil.copyfile(source, filepath)
+
+    if phase is not None:
+        phase.total = os.path.getsize(filepath)
+        phase.count = 0
+        phase.update(phase.total)
+    checksum = _md5_file(filepath, DEFAULT_CHUNK_SIZE)
+
+    if md5 is not None and checksum != md5:
+        raise ValueError('checksum of `{}` is `{}` but expected `{}`'.format(source, checksum, md5))
+
+    return checksum
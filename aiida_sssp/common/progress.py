@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""Tracking of the progress and timings of long running operations, such as the installation of a family.
+
+An operation consists of one or more phases, for example downloading a file or parsing pseudo potentials, that each
+count the quantity of some unit that they processed. A :py:class:`Progress` records the phases of an operation and
+notifies an optional listener whenever a phase starts, advances or finishes, which can be used to display live
+progress. Once the operation is done, it provides a summary of the timings of all phases.
+"""
+import contextlib
+import time
+
+__all__ = ('Progress', 'ProgressPhase', 'format_quantity')
+
+UNIT_BYTES = 'B'
+
+
+def format_quantity(value, unit):
+    """Format the given quantity for humans, using binary prefixes for bytes.
+
+    :param value: the quantity, an integer or a float
+    :param unit: the unit of the quantity
+    :return: the formatted quantity
+    """
+    if unit != UNIT_BYTES:
+        return '{:.0f} {}'.format(value, unit) if float(value).is_integer() else '{:.1f} {}'.format(value, unit)
+
+    for prefix in ('', 'Ki', 'Mi', 'Gi'):
+        if abs(value) < 1024 or prefix == 'Gi':
+            break
+        value /= 1024
+
+    return '{:.0f} {}{}'.format(value, prefix, unit) if not prefix else '{:.1f} {}{}'.format(value, prefix, unit)
+
+
+class ProgressPhase:
+    """A single phase of an operation that counts the quantity of some unit that it processed."""
+
+    def __init__(self, name, unit, total=None, listener=None):
+        """Construct a new phase, which is started immediately.
+
+        :param name: the name of the phase
+        :param unit: the unit of the quantity that the phase counts, for example `B` for bytes or `files`
+        :param total: optional total quantity that the phase is expected to process, if known
+        :param listener: optional callable that is called with the phase whenever it advances
+        """
+        self.name = name
+        self.unit = unit
+        self.total = total
+        self.count = 0
+        self.started = time.monotonic()
+        self.finished = None
+        self._listener = listener
+
+    @property
+    def elapsed(self):
+        """Return the number of seconds that the phase took, or has taken so far if it is not yet finished.
+
+        :return: the elapsed time in seconds
+        """
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def rate(self):
+        """Return the average quantity processed per second.
+
+        :return: the rate, which is zero if no time has elapsed yet
+        """
+        elapsed = self.elapsed
+        return self.count / elapsed if elapsed > 0 else 0.
+
+    def update(self, amount=1):
+        """Advance the phase by the given quantity and notify the listener.
+
+        :param amount: the quantity that was processed since the last update
+        """
+        self.count += amount
+        self.notify()
+
+    def notify(self):
+        """Notify the listener, if any, of the current state of the phase."""
+        if self._listener is not None:
+            self._listener(self)
+
+    def format(self):
+        """Return a human readable representation of the current state of the phase.
+
+        :return: string with the processed quantity, the total if known and the rate
+        """
+        quantity = format_quantity(self.count, self.unit)
+
+        if self.total is not None:
+            quantity += ' of {}'.format(format_quantity(self.total, self.unit))
+
+        return '{} at {}/s'.format(quantity, format_quantity(self.rate, self.unit))
+
+    def as_dict(self):
+        """Return the state of the phase as a JSON-serializable dictionary.
+
+        :return: dictionary with the name, unit, count, total, elapsed time in seconds and rate of the phase
+        """
+        return {
+            'name': self.name,
+            'unit': self.unit,
+            'count': self.count,
+            'total': self.total,
+            'seconds': self.elapsed,
+            'rate': self.rate,
+        }
+
+
+class Progress:
+    """Record of the phases of an operation, which notifies an optional listener of their progress."""
+
+    def __init__(self, listener=None):
+        """Construct a new instance.
+
+        :param listener: optional callable that is called with a `ProgressPhase` when it starts, advances or finishes
+        """
+        self._listener = listener
+        self._phases = []
+
+    @property
+    def phases(self):
+        """Return the phases that have been started so far, in the order in which they were started.
+
+        :return: list of `ProgressPhase` instances
+        """
+        return list(self._phases)
+
+    @property
+    def elapsed(self):
+        """Return the total number of seconds spent in all phases.
+
+        :return: the elapsed time in seconds
+        """
+        return sum(phase.elapsed for phase in self._phases)
+
+    @contextlib.contextmanager
+    def phase(self, name, unit, total=None):
+        """Start a new phase, which is finished when the context is exited.
+
+        :param name: the name of the phase
+        :param unit: the unit of the quantity that the phase counts, for example `B` for bytes or `files`
+        :param total: optional total quantity that the phase is expected to process, if known
+        :return: the new `ProgressPhase`
+        """
+        phase = ProgressPhase(name, unit, total, self._listener)
+        self._phases.append(phase)
+        phase.notify()
+
+        try:
+            yield phase
+        finally:
+            phase.finished = time.monotonic()
+            phase.notify()
+
+    def as_dict(self):
+        """Return the timings of all phases as a JSON-serializable dictionary.
+
+        :return: dictionary with the total elapsed time in seconds and the state of each phase
+        """
+        return {'seconds': self.elapsed, 'phases': [phase.as_dict() for phase in self._phases]}
+
+    def format_summary(self):
+        """Return a human readable summary of the timings of all phases.
+
+        :return: string with one line per phase and a final line with the total elapsed time
+        """
+        width = max([len(phase.name) for phase in self._phases] + [len('total')])
+        lines = [
+            '{:<{}} {:>8.2f} s  {}'.format(phase.name, width, phase.elapsed, phase.format()) for phase in self._phases
+        ]
+        lines.append('{:<{}} {:>8.2f} s'.format('total', width, self.elapsed))
+
+        return '\n'.join(lines)
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""Generators of synthetic pseudo potentials, metadata and structures for scale testing.
+
+The pseudo potentials are valid UPF files with a header for the requested element and a mesh of random values, such
+that each file has a distinct checksum, accompanied by metadata in the format accepted by `SsspParameters`. Together
+with batches of structures composed of random subsets of the elements, they allow to measure the creation, listing and
+lookup of families at production scale without real data. All content is determined by a seed, such that a run can be
+reproduced exactly.
+"""
+import hashlib
+import json
+import os
+import random
+import shutil
+
+__all__ = (
+    'create_structure', 'generate_compositions', 'generate_upf', 'get_element_symbols', 'iter_structure_batches',
+    'write_synthetic_family'
+)
+
+ARCHIVE_FORMATS = ('tar', 'gztar', 'bztar', 'xztar', 'zip')
+DEFAULT_MESH_SIZE = 100
+DEFAULT_MAX_ELEMENTS = 4
+FILENAME_PARAMETERS = 'parameters.json'
+DIRNAME_PSEUDOS = 'pseudos'
+
+TEMPLATE_UPF = """<UPF version="2.0.1">
+    <PP_INFO>
+        <PP_INPUTFILE>
+        </PP_INPUTFILE>
+    </PP_INFO>
+    <PP_HEADER
+        generated="Synthetic pseudo potential for scale testing"
+        author="aiida-sssp"
+        date=""
+        comment="seed {seed}"
+        element="{element}"
+        pseudo_type="NC"
+        mesh_size="{mesh_size}"
+    />
+    <PP_MESH>
+        <PP_R type="real" size="{mesh_size}">
+{values}
+        </PP_R>
+    </PP_MESH>
+</UPF>
+"""
+
+
+def get_element_symbols(count=None):
+    """Return the symbols of the known elements in order of their atomic number.
+
+    Placeholder symbols of elements without a name, such as `Uuo`, are excluded since element symbols have at most two
+    characters everywhere else, for example in the records of an `SsspSnapshot`.
+
+    :param count: optional number of elements to return, by default all known elements are returned
+    :return: list of element symbols
+    :raises ValueError: if more elements are requested than are known
+    """
+    from aiida.common.constants import elements
+
+    symbols = [elements[number]['symbol'] for number in sorted(elements) if number > 0]
+    symbols = [symbol for symbol in symbols if len(symbol) <= 2]
+
+    if count is not None:
+        if count > len(symbols):
+            raise ValueError('requested {} elements but only {} are known'.format(count, len(symbols)))
+        symbols = symbols[:count]
+
+    return symbols
+
+
+def generate_upf(element, seed=0, mesh_size=DEFAULT_MESH_SIZE):
+    """Return the content of a synthetic UPF file for the given element.
+
+    :param element: the element symbol
+    :param seed: the seed of the random values of the mesh, files for the same element but a different seed have a
+        different checksum
+    :param mesh_size: the number of values of the mesh, which determines the size of the file
+    :return: the content of the file in bytes
+    """
+    rng = random.Random('{}-{}'.format(seed, element))
+    values = '\n'.join('            {:.12e}'.format(rng.random()) for _ in range(mesh_size))
+    return TEMPLATE_UPF.format(seed=seed, element=element, mesh_size=mesh_size, values=values).encode('utf-8')
+
+
+def write_synthetic_family(dirpath, elements, seed=0, mesh_size=DEFAULT_MESH_SIZE, fmt=None):
+    """Write the UPF files and the metadata parameters of a synthetic family to the given directory.
+
+    The cutoffs are chosen randomly, but like those of a real family, the density cutoff is a multiple of the
+    wavefunction cutoff.
+
+    :param dirpath: absolute path of an existing directory
+    :param elements: list of element symbols
+    :param seed: the seed of the content of the files and of the cutoffs
+    :param mesh_size: the number of values of the mesh of each UPF file
+    :param fmt: optional archive format, one of `ARCHIVE_FORMATS`, in which case the UPF files are written to an archive
+        instead of a directory
+    :return: tuple of the absolute path of the directory or archive with the UPF files and of the parameters file
+    :raises ValueError: if the archive format is not supported
+    """
+    if fmt is not None and fmt not in ARCHIVE_FORMATS:
+        raise ValueError('invalid archive format `{}`, choose from: {}'.format(fmt, ', '.join(ARCHIVE_FORMATS)))
+
+    rng = random.Random(seed)
+    dirpath_pseudos = os.path.join(dirpath, DIRNAME_PSEUDOS)
+    filepath_parameters = os.path.join(dirpath, FILENAME_PARAMETERS)
+    parameters = {}
+
+    os.makedirs(dirpath_pseudos)
+
+    for element in elements:
+        filename = '{}.upf'.format(element)
+        content = generate_upf(element, seed, mesh_size)
+        cutoff_wfc = float(rng.randrange(20, 125, 5))
+
+        with open(os.path.join(dirpath_pseudos, filename), 'wb') as handle:
+            handle.write(content)
+
+        parameters[element] = {
+            'filename': filename,
+            'md5': hashlib.md5(content).hexdigest(),
+            'cutoff_wfc': cutoff_wfc,
+            'cutoff_rho': cutoff_wfc * rng.choice((4, 8, 12)),
+        }
+
+    with open(filepath_parameters, 'w') as handle:
+        json.dump(parameters, handle)
+
+    if fmt is not None:
+        filepath_archive = shutil.make_archive(dirpath_pseudos, fmt, root_dir=dirpath_pseudos)
+        shutil.rmtree(dirpath_pseudos)
+        return filepath_archive, filepath_parameters
+
+    return dirpath_pseudos, filepath_parameters
+
+
+def generate_compositions(elements, count, max_elements=DEFAULT_MAX_ELEMENTS, seed=0):
+    """Return random compositions of the given elements.
+
+    :param elements: list of element symbols
+    :param count: the number of compositions
+    :param max_elements: the maximum number of distinct elements per composition
+    :param seed: the seed of the random choices
+    :return: list of sorted tuples of element symbols
+    :raises ValueError: if no elements are given
+    """
+    if not elements:
+        raise ValueError('at least one element should be specified')
+
+    rng = random.Random(seed)
+    elements = sorted(elements)
+    maximum = min(max_elements, len(elements))
+
+    return [tuple(sorted(rng.sample(elements, rng.randint(1, maximum)))) for _ in range(count)]
+
+
+def create_structure(symbols):
+    """Return an unstored structure with a single site for each of the given elements in a cubic cell.
+
+    :param symbols: list of element symbols
+    :return: unstored `StructureData`
+    """
+    from aiida.plugins import DataFactory
+
+    StructureData = DataFactory('structure')  # pylint: disable=invalid-name
+
+    structure = StructureData(cell=[[1., 0., 0.], [0., 1., 0.], [0., 0., 1.]])
+
+    for index, symbol in enumerate(symbols):
+        structure.append_atom(symbols=symbol, position=(index / len(symbols), 0., 0.))
+
+    return structure
+
+
+def iter_structure_batches(elements, count, batch_size=1000, max_elements=DEFAULT_MAX_ELEMENTS, seed=0):
+    """Yield batches of unstored structures composed of random subsets of the given elements.
+
+    Only a single batch is held in memory at a time, such that arbitrarily many structures can be generated.
+
+    :param elements: list of element symbols
+    :param count: the total number of structures
+    :param batch_size: the maximum number of structures per batch
+    :param max_elements: the maximum number of distinct elements per structure
+    :param seed: the seed of the random choices
+    :return: generator of lists of unstored `StructureData`
+    :raises ValueError: if no elements are given
+    """
+    for offset in range(0, count, batch_size):
+        size = min(batch_size, count - offset)
+        compositions = generate_compositions(elements, size, max_elements, seed='{}-{}'.format(seed, offset))
+        yield [create_structure(symbols) for symbols in compositions]
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""Utilities to scan pseudo potential files in UPF format without constructing `UpfData` nodes.
+
+Constructing a `UpfData` reads and parses the entire file, computes its checksum and copies it into a sandbox folder.
+When all that is needed is the element and the checksum, for example to check whether a set of files matches some
+metadata, it suffices to parse the header and stream the content through the checksum, which is what `scan_upf` does.
+The element is determined in the same way as `aiida.orm.nodes.data.upf.parse_upf`, such that the result is identical to
+what a `UpfData` constructed from the same file would report.
+"""
+import codecs
+import collections
+import hashlib
+import os
+
+__all__ = ('UpfHeader', 'UpfHeaderParser', 'create_upf', 'scan_upf')
+
+UpfHeader = collections.namedtuple('UpfHeader', ['element', 'filename', 'md5sum'])
+
+DEFAULT_CHUNK_SIZE = 2**16
+
+
+class UpfHeaderParser:
+    """Incremental parser of the element of a UPF file, which is fed the content of the file in chunks.
+
+    Content is only buffered until the element has been found, which for valid files is somewhere in the header, after
+    which any further content is ignored.
+    """
+
+    def __init__(self, filename):
+        """Construct a new instance.
+
+        :param filename: the filename of the file that is parsed, which should start with the element symbol
+        """
+        self._filename = filename
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._buffer = ''
+        self._element = None
+
+    @property
+    def element(self):
+        """Return the element if it has been found.
+
+        :return: the element symbol or `None`
+        """
+        return self._element
+
+    def feed(self, chunk):
+        """Feed the next chunk of the content of the file.
+
+        :param chunk: bytes
+        """
+        if self._element is None:
+            self._buffer += self._decoder.decode(chunk)
+            self._element = self._parse(final=False)
+
+    def close(self):
+        """Signal the end of the content and return the element.
+
+        :return: the element symbol
+        :raises `~aiida.common.exceptions.ParsingError`: if the element could not be determined or is invalid
+        """
+        from aiida.common.exceptions import ParsingError
+        from aiida.orm.nodes.data.structure import _valid_symbols
+
+        if self._element is None:
+            self._buffer += self._decoder.decode(b'', final=True)
+            self._element = self._parse(final=True)
+
+        self._buffer = ''
+
+        if self._element is None:
+            raise ParsingError('Unable to find the element of UPF {}'.format(self._filename))
+
+        element = self._element.capitalize()
+
+        if element not in _valid_symbols:
+            raise ParsingError('Unknown element symbol {} for file {}'.format(element, self._filename))
+
+        if not os.path.basename(self._filename).lower().startswith(element.lower()):
+            raise ParsingError(
+                'Filename {0} was recognized for element {1}, but the filename does not start with {1}'.format(
+                    self._filename, element
+                )
+            )
+
+        return element
+
+    def _parse(self, final):
+        """Parse the element from the current buffer.
+
+        The version is only determined once the first line is complete, since the version tag of UPF v2 files is on the
+        first line. Until then, a match of the element pattern of UPF v1 files is not to be trusted.
+
+        :param final: boolean, True if the buffer contains the complete content of the file
+        :return: the element symbol or `None` if it cannot be determined (yet)
+        """
+        from aiida.orm.nodes.data.upf import REGEX_ELEMENT_V1, REGEX_ELEMENT_V2, REGEX_UPF_VERSION
+
+        if not final and '\n' not in self._buffer:
+            return None
+
+        match = REGEX_UPF_VERSION.search(self._buffer)
+
+        try:
+            version_major = int(match.group('version').partition('.')[0]) if match else 1
+        except ValueError:
+            version_major = 1
+
+        regex = REGEX_ELEMENT_V1 if version_major == 1 else REGEX_ELEMENT_V2
+        match = regex.search(self._buffer)
+
+        return match.group('element_name') if match else None
+
+
+def scan_upf(source, filename=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Scan a UPF file for its element and checksum, without constructing a `UpfData` node.
+
+    The content is streamed in chunks, so memory usage is bounded regardless of the size of the file.
+
+    :param source: absolute filepath or filelike object opened in binary mode
+    :param filename: the filename of the file, which is required if `source` is a filelike object without a name
+    :param chunk_size: the size in bytes of the chunks in which the content is read
+    :return: `UpfHeader` with the element, filename and MD5 checksum of the file
+    :raises `~aiida.common.exceptions.ParsingError`: if the element could not be determined or is invalid
+    """
+    if isinstance(source, str):
+        with open(source, 'rb') as handle:
+            return scan_upf(handle, filename or os.path.basename(source), chunk_size)
+
+    filename = filename or os.path.basename(source.name)
+    parser = UpfHeaderParser(filename)
+    md5 = hashlib.md5()
+
+    for chunk in iter(lambda: source.read(chunk_size), b''):
+        md5.update(chunk)
+        parser.feed(chunk)
+
+    return UpfHeader(parser.close(), filename, md5.hexdigest())
+
+
+class _ScanningReader:
+    """Wrapper of a binary filelike object that feeds all content that is read through a checksum and header parser."""
+
+    def __init__(self, handle, parser):
+        self._handle = handle
+        self._parser = parser
+        self._md5 = hashlib.md5()
+
+    def read(self, size=-1):
+        chunk = self._handle.read(size)
+        self._md5.update(chunk)
+        self._parser.feed(chunk)
+        return chunk
+
+    def hexdigest(self):
+        return self._md5.hexdigest()
+
+
+def create_upf(handle, filename):
+    """Construct an unstored `UpfData` from a binary filelike object, reading its content only once.
+
+    The content is copied straight into the repository of the node, while the checksum is computed and the element is
+    parsed from the header on the fly. This allows to construct nodes from streams, such as members of an archive,
+    without first writing them to disk and without holding their entire content in memory.
+
+    :param handle: filelike object opened in binary mode
+    :param filename: the filename to give to the file in the repository of the node
+    :return: unstored `UpfData` with the `element`, `md5` and `filename` attributes set
+    :raises `~aiida.common.exceptions.ParsingError`: if the element could not be determined or is invalid
+    """
+    from aiida.plugins import DataFactory
+
+    UpfData = DataFactory('upf')  # pylint: disable=invalid-name
+
+    parser = UpfHeaderParser(filename)
+    reader = _ScanningReader(handle, parser)
+
+    upf = UpfData()
+    upf.put_object_from_filelike(reader, filename, mode='wb')
+    upf.set_attribute('filename', filename)
+    upf.set_attribute('element', parser.close())
+    upf.set_attribute('md5', reader.hexdigest())
+
+    return upf
@@ -72,6 +72,32 @@ class SsspParameters(orm.Data):
         """Represent the instance for human-readable purposes."""
         return self.__repr__()
 
+    def store(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        """Store the node, bump the generation of the associated family and invalidate the caches of its cutoffs.
+
+        The generation is only bumped and the caches are only invalidated the first time the node is stored, since the
+        parameters are immutable afterwards.
+
+        :return: the stored node
+        """
+        from aiida.common import exceptions
+        from aiida_sssp.cache import invalidate_caches
+        from aiida_sssp.groups import SsspFamily
+
+        if self.is_stored:
+            return super().store(*args, **kwargs)
+
+        result = super().store(*args, **kwargs)
+
+        try:
+            SsspFamily.objects.get(uuid=self.family_uuid).bump_generation()
+        except exceptions.NotExistent:
+            pass
+
+        invalidate_caches(self.family_uuid)
+
+        return result
+
     @property
     def family_uuid(self):
         """Return the UUID of the `SsspFamily` to which this parameters instance is associated.
@@ -1,5 +1,17 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=undefined-variable
 from .family import *
+from .bundle import *
+from .index import *
+from .table import *
+from .aio import *
+from .uninstall import *
+from .ephemeral import *
+from .loadtest import *
+from .diff import *
+from .warmup import *
 
-__all__ = (family.__all__,)
+__all__ = (
+    family.__all__ + bundle.__all__ + index.__all__ + table.__all__ + aio.__all__ + uninstall.__all__ +
+    ephemeral.__all__ + loadtest.__all__ + diff.__all__ + warmup.__all__
+)
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=protected-access
+"""Resolution of the pseudo potentials and parameters of `SsspFamily` instances for coroutines.
+
+The database is not accessed from the event loop but from a dedicated worker thread. Requests that are made while the
+event loop runs the same iteration are pooled: all families for which the pseudo potentials or the parameters are
+requested are loaded with a single query, and concurrent requests for the same family share the result of a single
+query, including requests that are made while that query is in flight. As a result, the number of queries, and so the
+time spent waiting for the database, grows with the number of distinct batches instead of with the number of requests.
+
+The results are stored in the same caches as those of the synchronous methods of `SsspFamily`, together with the
+generation of the family at the time of the query, such that both can be used interchangeably on the same instances and
+`SsspFamily.revalidate` applies to either.
+
+Since pending requests are flushed by a callback of the event loop that made them, each event loop has its own
+resolver, see :py:func:`get_async_resolver`.
+"""
+import asyncio
+import functools
+import threading
+import weakref
+
+from aiida.common import exceptions
+from aiida.orm import QueryBuilder
+from aiida.plugins import DataFactory
+
+__all__ = ('AsyncResolver', 'get_async_resolver')
+
+UpfData = DataFactory('upf')
+
+QUERY_PSEUDOS = 'pseudos'
+QUERY_PARAMETERS = 'parameters'
+
+# The resolvers of this process, indexed on the event loop from which they are used.
+_ASYNC_RESOLVERS = weakref.WeakKeyDictionary()
+_LOCK = threading.Lock()
+
+
+class AsyncResolver:
+    """Resolver of the pseudo potentials and parameters of families that pools the requests of concurrent coroutines.
+
+    An instance should only be used from a single event loop.
+    """
+
+    def __init__(self, executor=None):
+        """Construct a new instance.
+
+        :param executor: optional `concurrent.futures.Executor` in which to run the queries, by default a dedicated
+            single worker thread is used, such that all queries use the same database session
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._executor = executor if executor is not None else ThreadPoolExecutor(max_workers=1)
+        self._pending = {QUERY_PSEUDOS: {}, QUERY_PARAMETERS: {}}
+        self._inflight = {QUERY_PSEUDOS: {}, QUERY_PARAMETERS: {}}
+        self._flush_scheduled = False
+
+    async def get_pseudos(self, family):
+        """Return the dictionary of pseudo potentials of the given family indexed on the element symbol.
+
+        :param family: a stored `SsspFamily`
+        :return: dictionary of element symbol mapping `UpfData`
+        """
+        if family._pseudos is None:
+            await self._request(QUERY_PSEUDOS, family)
+
+        return family.pseudos
+
+    async def get_parameters_node(self, family):
+        """Return the associated `SsspParameters` node of the given family.
+
+        :param family: a stored `SsspFamily`
+        :return: the associated `SsspParameters` node
+        :raises: `aiida.common.exceptions.NotExistent` if the family does not have associated parameters
+        """
+        if family._parameters_node is None:
+            await self._request(QUERY_PARAMETERS, family)
+
+        return family._parameters_node
+
+    def _request(self, query, family):
+        """Register a request for the given query of the given family and return an awaitable for its completion.
+
+        :param query: the type of query, either `QUERY_PSEUDOS` or `QUERY_PARAMETERS`
+        :param family: a stored `SsspFamily`
+        :return: awaitable that completes once the results of the query are stored in the caches of the family
+        """
+        loop = asyncio.get_event_loop()
+
+        try:
+            future, families = self._inflight[query][family.uuid]
+        except KeyError:
+            try:
+                future, families = self._pending[query][family.uuid]
+            except KeyError:
+                future, families = loop.create_future(), []
+                self._pending[query][family.uuid] = (future, families)
+
+        families.append(family)
+
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self._flush, loop)
+
+        # The future is shared by all requests for the family, so one of them being cancelled should not cancel others.
+        return asyncio.shield(future)
+
+    def _flush(self, loop):
+        """Submit a single query to the executor for each type of query with pending requests."""
+        self._flush_scheduled = False
+
+        for query, function in ((QUERY_PSEUDOS, _query_pseudos), (QUERY_PARAMETERS, _query_parameters)):
+            batch = self._pending[query]
+
+            if not batch:
+                continue
+
+            self._pending[query] = {}
+            self._inflight[query].update(batch)
+
+            result = loop.run_in_executor(self._executor, function, list(batch))
+            result.add_done_callback(functools.partial(self._resolve, query, batch))
+
+    def _resolve(self, query, batch, result):
+        """Store the results of a query in the caches of the requesting families and complete their futures."""
+        for uuid, (future, families) in batch.items():
+            self._inflight[query].pop(uuid, None)
+
+            if future.done():
+                continue
+
+            if result.cancelled():
+                future.cancel()
+                continue
+
+            if result.exception() is not None:
+                future.set_exception(result.exception())
+                continue
+
+            generation, value = result.result()[uuid]
+
+            if isinstance(value, Exception):
+                future.set_exception(value)
+                continue
+
+            for family in families:
+                with family._lock:
+                    family._generations[query] = generation
+
+                    if query == QUERY_PSEUDOS:
+                        family._pseudos = dict(value)
+                    else:
+                        family._parameters_node, family._parameters = value
+
+            future.set_result(None)
+
+
+def get_async_resolver():
+    """Return the resolver of the current event loop that is used by the awaitable methods of `SsspFamily`.
+
+    A resolver is created the first time it is requested from an event loop. The resolvers of event loops that have been
+    closed, possibly with requests that were never flushed, are discarded and their executors shut down.
+
+    :return: instance of `AsyncResolver`
+    """
+    loop = asyncio.get_event_loop()
+
+    with _LOCK:
+        for closed in [other for other in _ASYNC_RESOLVERS if other.is_closed()]:
+            _ASYNC_RESOLVERS.pop(closed)._executor.shutdown(wait=False)
+
+        try:
+            resolver = _ASYNC_RESOLVERS[loop]
+        except KeyError:
+            resolver = _ASYNC_RESOLVERS[loop] = AsyncResolver()
+
+    return resolver
+
+
+def _query_generations(uuids):
+    """Return the generation tokens of the families with the given UUIDs, see `SsspFamily.generation`.
+
+    :param uuids: list of family UUIDs
+    :return: dictionary of family UUID mapping the generation token
+    """
+    from .family import SsspFamily
+
+    project = ['uuid', 'extras.{}'.format(SsspFamily.KEY_GENERATION)]
+    builder = QueryBuilder().append(SsspFamily, filters={'uuid': {'in': uuids}}, project=project)
+
+    return {uuid: generation for uuid, generation in builder.iterall()}
+
+
+def _query_pseudos(uuids):
+    """Return the pseudo potentials of the families with the given UUIDs.
+
+    The generations are queried first, such that a change of a family during the query leaves the result stale.
+
+    :param uuids: list of family UUIDs
+    :return: dictionary of family UUID mapping a tuple of its generation token and a dictionary of element symbol
+        mapping `UpfData`
+    """
+    from .family import SsspFamily
+
+    generations = _query_generations(uuids)
+    pseudos = {uuid: {} for uuid in uuids}
+
+    builder = QueryBuilder().append(SsspFamily, filters={'uuid': {'in': uuids}}, project='uuid', tag='group')
+    builder.append(UpfData, with_group='group', project='*')
+
+    for uuid, upf in builder.iterall():
+        pseudos[uuid][upf.element] = upf
+
+    return {uuid: (generations.get(uuid, None), value) for uuid, value in pseudos.items()}
+
+
+def _query_parameters(uuids):
+    """Return the associated `SsspParameters` nodes of the families with the given UUIDs, along with their attributes.
+
+    The attributes are read here, since accessing them can query the database through the session of this thread, which
+    should therefore not happen on the thread of the event loop.
+
+    :param uuids: list of family UUIDs
+    :return: dictionary of family UUID mapping a tuple of its generation token and a tuple of the `SsspParameters` node
+        and its attributes, or the exception that the synchronous `SsspFamily.get_parameters_node` would raise if the
+        family does not have exactly one associated node
+    """
+    from aiida_sssp.data import SsspParameters
+
+    generations = _query_generations(uuids)
+    nodes = {uuid: [] for uuid in uuids}
+
+    filters = {'attributes.{}'.format(SsspParameters.KEY_FAMILY_UUID): {'in': uuids}}
+
+    for [node] in QueryBuilder().append(SsspParameters, filters=filters).iterall():
+        nodes[node.family_uuid].append(node)
+
+    parameters = {}
+
+    for uuid, candidates in nodes.items():
+        if not candidates:
+            parameters[uuid] = exceptions.NotExistent('family `{}` has no associated parameters'.format(uuid))
+        elif len(candidates) > 1:
+            parameters[uuid] = exceptions.MultipleObjectsError('family `{}` has multiple parameters'.format(uuid))
+        else:
+            parameters[uuid] = (candidates[0], candidates[0].attributes)
+
+    return {uuid: (generations.get(uuid, None), value) for uuid, value in parameters.items()}
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""Export and import of an `SsspFamily` as a single self-contained bundle.
+
+A bundle is a compressed tar archive with the following members, in this order:
+
+    * `manifest.json`: the label and description of the family and the filename and checksum of each pseudo potential
+    * `parameters.json`: the metadata of the associated `SsspParameters`, if the family has any
+    * `pseudos/<filename>`: the UPF file of each pseudo potential
+
+Since the manifest comes first, a bundle can be imported in a single streaming pass over the archive: pseudo potentials
+that already exist in the database, as determined by their element, filename and checksum, are reused and their members
+are skipped, whereas all others are streamed straight into the repository of new nodes.
+"""
+import io
+import json
+import os
+import tarfile
+
+from aiida.common import exceptions
+from aiida.common.lang import type_check
+from aiida.plugins import DataFactory
+
+from aiida_sssp.common import UpfHeader, create_upf
+from .family import SsspFamily
+
+__all__ = ('export_family', 'import_family')
+
+UpfData = DataFactory('upf')
+SsspParameters = DataFactory('sssp.parameters')
+
+BUNDLE_FORMAT_VERSION = 1
+FILENAME_MANIFEST = 'manifest.json'
+FILENAME_PARAMETERS = 'parameters.json'
+DIRNAME_PSEUDOS = 'pseudos'
+
+
+def export_family(family, filepath):
+    """Export the given family to a bundle.
+
+    :param family: the `SsspFamily` to export
+    :param filepath: absolute filepath of the bundle to write
+    """
+    type_check(family, SsspFamily)
+
+    manifest = {
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'label': family.label,
+        'description': family.description,
+        'pseudos':
+        {element: {
+            'filename': pseudo.filename,
+            'md5': pseudo.md5sum
+        } for element, pseudo in family.pseudos.items()},
+    }
+
+    try:
+        parameters = family.get_parameters_node().get_metadata()
+    except exceptions.NotExistent:
+        parameters = None
+
+    with tarfile.open(filepath, 'w:gz') as archive:
+        _add_json(archive, FILENAME_MANIFEST, manifest)
+
+        if parameters is not None:
+            _add_json(archive, FILENAME_PARAMETERS, parameters)
+
+        for element, handle in family.iter_pseudo_handles():
+            tarinfo = tarfile.TarInfo(os.path.join(DIRNAME_PSEUDOS, manifest['pseudos'][element]['filename']))
+            tarinfo.size = os.fstat(handle.fileno()).st_size
+            archive.addfile(tarinfo, handle)
+
+
+def import_family(filepath, label=None):
+    """Import a family from a bundle.
+
+    Pseudo potentials of which a `UpfData` with the same element, filename and checksum already exists are reused and
+    their content is not even read. All new nodes, the parameters and the family itself are stored in a single
+    transaction.
+
+    :param filepath: absolute filepath of the bundle
+    :param label: optional label for the family, by default the label stored in the bundle is used
+    :return: the newly created `SsspFamily`
+    :raises ValueError: if the bundle is invalid or a family with the same label already exists
+    """
+    from aiida.common.exceptions import ParsingError
+    from aiida.manage.manager import get_manager
+    manifest = None
+    parameters = None
+    existing = {}
+    filenames = {}
+    pseudos = {}
+
+    try:
+        archive = tarfile.open(filepath, 'r|*')
+    except tarfile.TarError as exception:
+        raise ValueError('failed to open the bundle `{}`: {}'.format(filepath, exception))
+
+    with archive:
+        for member in archive:
+
+            if member.name == FILENAME_MANIFEST:
+                manifest = _read_json(archive, member)
+
+                if manifest.get('format_version', None) != BUNDLE_FORMAT_VERSION:
+                    raise ValueError('bundle `{}` has an unsupported format version'.format(filepath))
+
+                label = label or manifest['label']
+
+                try:
+                    SsspFamily.objects.get(label=label)
+                except exceptions.NotExistent:
+                    family = SsspFamily(label=label, description=manifest['description'])
+                else:
+                    raise ValueError('the SsspFamily `{}` already exists'.format(label))
+
+                filenames = {values['filename']: element for element, values in manifest['pseudos'].items()}
+                headers = [
+                    UpfHeader(element, values['filename'], values['md5'])
+                    for element, values in manifest['pseudos'].items()
+                ]
+                existing = SsspFamily._get_existing_pseudos(headers)  # pylint: disable=protected-access
+                continue
+
+            if manifest is None:
+                raise ValueError('bundle `{}` does not start with a manifest'.format(filepath))
+
+            if member.name == FILENAME_PARAMETERS:
+                parameters = SsspParameters(_read_json(archive, member), family.uuid)
+                continue
+
+            if member.isdir():
+                continue
+
+            filename = os.path.basename(member.name)
+            element = filenames.get(filename, None)
+
+            if element is None or not member.isfile():
+                raise ValueError('bundle `{}` contains the unexpected member `{}`'.format(filepath, member.name))
+
+            header = UpfHeader(element, filename, manifest['pseudos'][element]['md5'])
+
+            try:
+                pseudos[element] = existing[header]
+                continue
+            except KeyError:
+                pass
+
+            try:
+                upf = create_upf(archive.extractfile(member), filename)
+            except ParsingError as exception:
+                raise ValueError('failed to parse `{}`: {}'.format(member.name, exception))
+
+            if UpfHeader(upf.element, upf.filename, upf.md5sum) != header:
+                raise ValueError('`{}` does not match the manifest of bundle `{}`'.format(member.name, filepath))
+
+            pseudos[element] = upf
+
+    if manifest is None:
+        raise ValueError('bundle `{}` does not contain a manifest'.format(filepath))
+
+    if set(pseudos) != set(manifest['pseudos']):
+        raise ValueError('bundle `{}` is missing pseudos defined in the manifest'.format(filepath))
+
+    if parameters is not None:
+        SsspFamily.validate_parameters(list(pseudos.values()), parameters)
+
+    with get_manager().get_backend().transaction():
+        if parameters is not None:
+            parameters.store()
+        family.store()
+        family.add_nodes([upf.store() for upf in pseudos.values()])
+
+    return family
+
+
+def _add_json(archive, name, content):
+    """Add a member with the given name and JSON serialized content to the archive."""
+    data = json.dumps(content, indent=4, sort_keys=True).encode('utf-8')
+    tarinfo = tarfile.TarInfo(name)
+    tarinfo.size = len(data)
+    archive.addfile(tarinfo, io.BytesIO(data))
+
+
+def _read_json(archive, member):
+    """Return the JSON deserialized content of the given member of the archive."""
+    return json.loads(archive.extractfile(member).read().decode('utf-8'))
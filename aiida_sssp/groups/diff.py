@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""Comparison of the pseudo potentials and recommended cutoffs of two `SsspFamily` instances.
+
+The element, filename, checksum and cutoffs of the pseudo potentials of both families are fetched with projected queries
+that do not load any node, see :py:func:`aiida_sssp.cache.query_records`, such that comparing two families takes a
+constant number of queries regardless of their size.
+"""
+import math
+
+from aiida_sssp.cache import query_records
+
+__all__ = ('diff_families',)
+
+FIELDS = ('filename', 'md5', 'cutoff_wfc', 'cutoff_rho')
+
+
+def diff_families(source, target):
+    """Return the differences between the pseudo potentials and cutoffs of two families.
+
+    Cutoffs that are not defined, because a family does not have parameters or its parameters do not contain the
+    element, are reported as `None`.
+
+    :param source: the stored `SsspFamily` to compare from
+    :param target: the stored `SsspFamily` to compare to
+    :return: JSON-serializable dictionary with the `uuid` and `label` of the `source` and `target` families, the lists
+        of pseudos that were `added` in or `removed` from the target, each a dictionary with the `element` and the
+        fields `filename`, `md5`, `cutoff_wfc` and `cutoff_rho`, the list of pseudos that `changed`, each a dictionary
+        with the `element`, the fields of the `source` and `target` and the cutoff deltas `delta_wfc` and `delta_rho`,
+        and the number of pseudos that are `unchanged`
+    """
+    entries = {source.uuid: {}, target.uuid: {}}
+
+    for record in query_records([source.uuid, target.uuid]):
+        entries[record.family_uuid][record.element] = {
+            'filename': record.filename,
+            'md5': record.md5,
+            'cutoff_wfc': _get_cutoff(record.cutoff_wfc),
+            'cutoff_rho': _get_cutoff(record.cutoff_rho),
+        }
+
+    entries_source = entries[source.uuid]
+    entries_target = entries[target.uuid]
+
+    added = [
+        dict(element=element, **entries_target[element])
+        for element in sorted(entries_target)
+        if element not in entries_source
+    ]
+    removed = [
+        dict(element=element, **entries_source[element])
+        for element in sorted(entries_source)
+        if element not in entries_target
+    ]
+    changed = []
+    unchanged = 0
+
+    for element in sorted(set(entries_source).intersection(entries_target)):
+        before = entries_source[element]
+        after = entries_target[element]
+
+        if before == after:
+            unchanged += 1
+            continue
+
+        changed.append({
+            'element': element,
+            'source': before,
+            'target': after,
+            'delta_wfc': _get_delta(before['cutoff_wfc'], after['cutoff_wfc']),
+            'delta_rho': _get_delta(before['cutoff_rho'], after['cutoff_rho']),
+        })
+
+    return {
+        'source': {
+            'uuid': source.uuid,
+            'label': source.label
+        },
+        'target': {
+            'uuid': target.uuid,
+            'label': target.label
+        },
+        'added': added,
+        'removed': removed,
+        'changed': changed,
+        'unchanged': unchanged,
+    }
+
+
+def _get_cutoff(value):
+    """Return the given cutoff or `None` if it is not defined, which is represented by `NaN` in the records."""
+    return None if math.isnan(value) else value
+
+
+def _get_delta(before, after):
+    """Return the difference between two cutoffs or `None` if either is not defined."""
+    return after - before if before is not None and after is not None else None
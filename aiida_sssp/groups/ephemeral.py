@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=protected-access
+"""In-memory family of pseudo potentials that exposes the lookup API of `SsspFamily` without using the database.
+
+An :py:class:`EphemeralSsspFamily` is built from a directory or an archive of UPF files and an optional metadata file,
+just as a regular family, but its `UpfData` and `SsspParameters` nodes are never stored. This makes it suitable for dry
+runs and unit tests that only need to look up pseudo potentials and cutoffs. It can be converted into a stored
+`SsspFamily` at any time with :py:meth:`EphemeralSsspFamily.store`.
+"""
+import io
+import json
+import uuid
+
+from aiida.common import exceptions
+from aiida.common.lang import type_check
+from aiida.plugins import DataFactory
+
+from aiida_sssp.common import UpfHeader, create_upf, iter_upf_members
+from .family import DEFAULT_CHUNK_SIZE, SsspFamily
+
+__all__ = ('EphemeralSsspFamily',)
+
+SsspParameters = DataFactory('sssp.parameters')
+StructureData = DataFactory('structure')
+
+
+class EphemeralSsspFamily:
+    """Family of unstored pseudo potentials with the same lookup API as `SsspFamily`, which never accesses the database.
+
+    Each instance can only contain a single `UpfData` for each element. All lookups of `SsspFamily`, including their
+    awaitable versions, are supported, such that an instance can be used in place of a stored family wherever pseudo
+    potentials or cutoffs are only looked up. Methods that change or stage the contents of a family are not available.
+    """
+
+    def __init__(self, label, pseudos, description=None, parameters=None):
+        """Construct a new instance.
+
+        :param label: the label of the family
+        :param pseudos: list of `UpfData` nodes, which are typically not stored
+        :param description: optional description of the family
+        :param parameters: optional dictionary of metadata parameters, as accepted by `SsspParameters`
+        :raises ValueError: if multiple pseudos have the same element or the parameters are incompatible with the
+            pseudos
+        """
+        type_check(label, str)
+        type_check(description, str, allow_none=True)
+        type_check(parameters, dict, allow_none=True)
+
+        self._uuid = str(uuid.uuid4())
+        self._label = label
+        self._description = description or ''
+        self._pseudos = {upf.element: upf for upf in pseudos}
+
+        if len(self._pseudos) != len(pseudos):
+            raise ValueError('the pseudo potentials of family `{}` have duplicate elements'.format(label))
+
+        if parameters is not None:
+            self._parameters_node = SsspParameters(parameters, self._uuid)
+            SsspFamily.validate_parameters(list(pseudos), self._parameters_node)
+        else:
+            self._parameters_node = None
+
+    @classmethod
+    def create_from_folder(cls, dirpath, label, description=None, filepath_parameters=None):
+        """Create a new family from the pseudo potentials contained in a directory.
+
+        :param dirpath: absolute path to the folder containing the UPF files.
+        :param label: the label to give to the family
+        :param description: optional description to give to the family.
+        :param filepath_parameters: a filelike object or filepath to a file containing metadata for `SsspParameters`.
+        :return: new instance of `EphemeralSsspFamily`
+        :raises ValueError: if the directory contains anything other than valid UPF files or the parameters are
+            incompatible with the pseudos
+        """
+        pseudos = SsspFamily.parse_pseudos_from_directory(dirpath)
+        return cls(label, pseudos, description, cls._read_parameters(filepath_parameters))
+
+    @classmethod
+    def create_from_archive(cls, filepath, label, description=None, filepath_parameters=None, fmt=None):
+        """Create a new family from the pseudo potentials contained in an archive.
+
+        :param filepath: absolute filepath of the archive containing the UPF files.
+        :param label: the label to give to the family
+        :param description: optional description to give to the family.
+        :param filepath_parameters: a filelike object or filepath to a file containing metadata for `SsspParameters`.
+        :param fmt: optional name of the format of the archive, by default it is determined from the filename extension
+        :return: new instance of `EphemeralSsspFamily`
+        :raises ValueError: if the files cannot be parsed or the parameters are incompatible with the pseudos
+        :raises OSError: if the archive could not be read
+        """
+        from aiida.common.exceptions import ParsingError
+
+        pseudos = []
+
+        for filename, handle in iter_upf_members(filepath, fmt):
+            try:
+                pseudos.append(create_upf(handle, filename))
+            except ParsingError as exception:
+                raise ValueError('failed to parse `{}`: {}'.format(filename, exception))
+
+        return cls(label, pseudos, description, cls._read_parameters(filepath_parameters))
+
+    def __repr__(self):
+        """Represent the instance for debugging purposes."""
+        return '{}<{}>'.format(self.__class__.__name__, self._uuid)
+
+    def __str__(self):
+        """Represent the instance for human-readable purposes."""
+        return '{}<{}>'.format(self.__class__.__name__, self._label)
+
+    @property
+    def uuid(self):
+        """Return the UUID of this family, which is random and not that of the family it is eventually stored as."""
+        return self._uuid
+
+    @property
+    def label(self):
+        """Return the label of this family."""
+        return self._label
+
+    @property
+    def description(self):
+        """Return the description of this family."""
+        return self._description
+
+    @property
+    def is_stored(self):
+        """Return whether this family is stored, which is never the case."""
+        return False
+
+    def count(self):
+        """Return the number of pseudo potentials in this family."""
+        return len(self._pseudos)
+
+    @property
+    def pseudos(self):
+        """Return the dictionary of pseudo potentials of this family indexed on the element symbol.
+
+        :return: dictionary of element symbol mapping `UpfData`
+        """
+        return self._pseudos
+
+    @property
+    def elements(self):
+        """Return the list of elements of the `UpfData` nodes contained in this family.
+
+        :return: list of element symbols
+        """
+        return list(self._pseudos.keys())
+
+    def get_pseudo(self, element):
+        """Return the `UpfData` for the given element.
+
+        :param element: the element for which to return the corresponding `UpfData` node.
+        :return: `UpfData` instance if it exists
+        :raises ValueError: if the family does not contain a `UpfData` for the given element
+        """
+        try:
+            return self._pseudos[element]
+        except KeyError:
+            raise ValueError('family `{}` does not contain pseudo for element `{}`'.format(self._label, element))
+
+    def get_pseudo_uuid(self, element):
+        """Return the UUID of the `UpfData` for the given element.
+
+        :param element: the element for which to return the UUID of the corresponding `UpfData` node.
+        :return: the UUID of the `UpfData`
+        :raises ValueError: if the family does not contain a `UpfData` for the given element
+        """
+        return self.get_pseudo(element).uuid
+
+    def get_pseudos(self, structure):
+        """Return the mapping of kind names on `UpfData` for the given structure.
+
+        :param structure: the `StructureData` for which to return the corresponding `UpfData` mapping.
+        :return: dictionary of kind name mapping `UpfData`
+        :raises ValueError: if the family does not contain a `UpfData` for any of the elements of the given structure.
+        """
+        type_check(structure, StructureData)
+        return {kind.name: self.get_pseudo(kind.symbol) for kind in structure.kinds}
+
+    async def get_pseudos_async(self, structure):
+        """Awaitable version of :py:meth:`get_pseudos`, which completes immediately.
+
+        :param structure: the `StructureData` for which to return the corresponding `UpfData` mapping.
+        :return: dictionary of kind name mapping `UpfData`
+        :raises ValueError: if the family does not contain a `UpfData` for any of the elements of the given structure.
+        """
+        return self.get_pseudos(structure)
+
+    def open_pseudo(self, element):
+        """Return a binary file handle to the UPF file of the given element.
+
+        :param element: the element for which to open the UPF file
+        :return: file handle opened in binary mode
+        :raises ValueError: if the family does not contain a `UpfData` for the given element
+        """
+        return self.get_pseudo(element).open(mode='rb')
+
+    def iter_pseudo_handles(self, elements=None):
+        """Iterate over binary file handles to the UPF files of this family, see `SsspFamily.iter_pseudo_handles`.
+
+        :param elements: optional list of elements, by default the handles of all elements are yielded
+        :return: generator of tuples of element and binary file handle, sorted by element
+        :raises ValueError: if the family does not contain a `UpfData` for any of the given elements
+        """
+        for element in sorted(elements if elements is not None else self.elements):
+            with self.open_pseudo(element) as handle:
+                yield element, handle
+
+    def iter_pseudo_chunks(self, element, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Iterate over the content of the UPF file of the given element in chunks.
+
+        :param element: the element for which to read the UPF file
+        :param chunk_size: the maximum size in bytes of each chunk
+        :return: generator of chunks of bytes
+        :raises ValueError: if the family does not contain a `UpfData` for the given element
+        """
+        with self.open_pseudo(element) as handle:
+            for chunk in iter(lambda: handle.read(chunk_size), b''):
+                yield chunk
+
+    def get_parameters_node(self):
+        """Return the unstored `SsspParameters` node of this family if it has one.
+
+        :return: the `SsspParameters` node containing information like recommended cutoffs
+        :raises: `aiida.common.exceptions.NotExistent` if the family does not have parameters
+        """
+        if self._parameters_node is None:
+            raise exceptions.NotExistent('family `{}` does not have parameters'.format(self._label))
+
+        return self._parameters_node
+
+    async def get_parameters_node_async(self):
+        """Awaitable version of :py:meth:`get_parameters_node`, which completes immediately.
+
+        :return: the `SsspParameters` node containing information like recommended cutoffs
+        :raises: `aiida.common.exceptions.NotExistent` if the family does not have parameters
+        """
+        return self.get_parameters_node()
+
+    @property
+    def parameters(self):
+        """Return the attributes of the `SsspParameters` node of this family if it has one.
+
+        :return: a dictionary with all attributes of the `SsspParameters` node
+        :raises: `aiida.common.exceptions.NotExistent` if the family does not have parameters
+        """
+        return self.get_parameters_node().attributes
+
+    def get_parameter(self, element, parameter):
+        """Return a specific parameter for a given element.
+
+        :param element: the element
+        :param parameter: the key of the parameter
+        :raises: `aiida.common.exceptions.NotExistent` if the family does not have parameters
+        """
+        try:
+            values = self.parameters[element]
+        except KeyError:
+            raise KeyError('family `{}` does not contain the element `{}`'.format(self._label, element))
+
+        try:
+            return values[parameter]
+        except KeyError:
+            raise KeyError('parameter `{}` is not available for element `{}`'.format(parameter, element))
+
+    def get_cutoffs(self, elements=None, structure=None):
+        """Return the tuple of recommended cutoffs for either the given elements or `StructureData`.
+
+        .. note:: at least one and only one of arguments `elements` or `structure` should be passed.
+
+        :param elements: single or tuple of elements
+        :param structure: a `StructureData` node
+        :return: tuple of recommended wavefunction and density cutoff
+        :raises: `aiida.common.exceptions.NotExistent` if the family does not have parameters
+        """
+        symbols = SsspFamily._get_symbols(elements, structure)
+        parameters = self.parameters
+        cutoffs_wfc = [parameters[element]['cutoff_wfc'] for element in symbols]
+        cutoffs_rho = [parameters[element]['cutoff_rho'] for element in symbols]
+
+        return (max(cutoffs_wfc), max(cutoffs_rho))
+
+    async def get_cutoffs_async(self, elements=None, structure=None):
+        """Awaitable version of :py:meth:`get_cutoffs`, which completes immediately.
+
+        :param elements: single or tuple of elements
+        :param structure: a `StructureData` node
+        :return: tuple of recommended wavefunction and density cutoff
+        :raises: `aiida.common.exceptions.NotExistent` if the family does not have parameters
+        """
+        return self.get_cutoffs(elements, structure)
+
+    def store(self, label=None, deduplicate=False):
+        """Store this family as a new `SsspFamily`, together with its pseudos and parameters.
+
+        :param label: optional label for the stored family, by default the label of this family
+        :param deduplicate: boolean, if True, existing `UpfData` nodes with the same element, filename and checksum are
+            reused instead of storing the nodes of this family.
+        :return: new stored instance of `SsspFamily`
+        :raises ValueError: if a `SsspFamily` already exists with the given label
+        """
+        label = label or self._label
+
+        try:
+            SsspFamily.objects.get(label=label)
+        except exceptions.NotExistent:
+            family = SsspFamily(label=label)
+        else:
+            raise ValueError('the SsspFamily `{}` already exists'.format(label))
+
+        pseudos = list(self._pseudos.values())
+
+        if deduplicate:
+            headers = [UpfHeader(upf.element, upf.filename, upf.md5sum) for upf in pseudos]
+            existing = SsspFamily._get_existing_pseudos(headers)
+            pseudos = [existing.get(header, upf) for header, upf in zip(headers, pseudos)]
+
+        if self._parameters_node is not None:
+            filepath_parameters = io.StringIO(json.dumps(self._parameters_node.get_metadata()))
+        else:
+            filepath_parameters = None
+
+        return SsspFamily._store_family(family, pseudos, self._description or None, filepath_parameters)
+
+    @staticmethod
+    def _read_parameters(filepath_parameters):
+        """Return the metadata parameters in the given file, if any.
+
+        :param filepath_parameters: a filelike object or filepath to a file containing metadata for `SsspParameters`,
+            or `None`
+        :return: dictionary of metadata parameters or `None`
+        """
+        if filepath_parameters is None:
+            return None
+
+        return SsspParameters.create_from_file(filepath_parameters, str(uuid.uuid4())).get_metadata()
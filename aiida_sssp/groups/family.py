@@ -1,30 +1,62 @@
 # -*- coding: utf-8 -*-
 """Subclass of `Group` designed to represent a family of `UpfData` nodes."""
+import collections
+import io
+import json
 import os
+import threading
+import uuid
+from concurrent.futures import Future
 
 from aiida.common import exceptions
 from aiida.common.lang import type_check
 from aiida.orm import Group, QueryBuilder
 from aiida.plugins import DataFactory
 
+from aiida_sssp.cache import get_cache_backend, invalidate_caches
+from aiida_sssp.common import Progress, UpfHeader, create_upf, iter_upf_members, scan_upf
+from .warmup import is_warm_up_requested, start_warm_up
+
 __all__ = ('SsspFamily',)
 
 UpfData = DataFactory('upf')
 SsspParameters = DataFactory('sssp.parameters')
 StructureData = DataFactory('structure')
 
+DEFAULT_CHUNK_SIZE = 2**16
+
 
 class SsspFamily(Group):
     """Group to represent a pseudo potential family.
 
     Each instance can only contain `UpfData` nodes and can only contain one for each element.
+
+    The pseudo potentials and parameters of an instance are cached once loaded. The caches can be shared by threads:
+    concurrent misses for the same key are coalesced, such that only one of the threads queries the database while the
+    others wait for its result.
+
+    Every change to the content of a family, made in any process, sets a new random generation token in its extras.
+    Long-running processes can therefore keep instances around and call :py:meth:`revalidate` before using them, which
+    costs a single query and only drops the caches if the family changed since they were loaded.
     """
 
+    KEY_GENERATION = 'sssp_generation'
+
     _node_types = (UpfData,)
     _pseudos = None
     _parameters_node = None
     _parameters = None
 
+    def initialize(self):
+        """Initialize the lock that guards the caches of this instance and start the warm-up if the process opted in."""
+        super().initialize()
+        self._lock = threading.Lock()
+        self._loading = {}
+        self._generations = {}
+
+        if is_warm_up_requested():
+            start_warm_up()
+
     def __repr__(self):
         """Represent the instance for debugging purposes."""
         return '{}<{}>'.format(self.__class__.__name__, self.pk or self.uuid)
@@ -37,7 +69,8 @@ class SsspFamily(Group):
     def validate_parameters(cls, pseudos, parameters):
         """Validate the compatibility of a list of pseudos and the given metadata parameters.
 
-        :param pseudos: list of `UpfData` nodes
+        :param pseudos: list of `UpfData` nodes or `UpfHeader` tuples, as returned by `parse_pseudos_from_directory`
+            when `scan=True`, which allows to validate a set of files without constructing any nodes.
         :param parameters: an instance of `SsspParameters`
         :raises ValueError: if the `SsspParameters` are not compatible with the list of pseudos
         """
@@ -48,7 +81,7 @@ class SsspFamily(Group):
 
         for pseudo in pseudos:
 
-            type_check(pseudo, UpfData)
+            type_check(pseudo, (UpfData, UpfHeader))
             element = pseudo.element
 
             try:
@@ -65,11 +98,14 @@ class SsspFamily(Group):
                 raise ValueError('{} inconsistent `{}` for element `{}`: {} != {}'.format(*args))
 
     @classmethod
-    def parse_pseudos_from_directory(cls, dirpath):
+    def parse_pseudos_from_directory(cls, dirpath, scan=False):
         """Parse the UPF files in the given directory into a list of `UpfData` nodes.
 
         :param dirpath: absolute path to a directory containing pseudo potentials in UPF format.
-        :return: list of `UpfData` nodes
+        :param scan: boolean, if True, only the header of each file is parsed and its checksum computed, without
+            constructing any nodes. This is a lot faster and suffices to check whether the directory can be turned into
+            a family, for example, by passing the result to `validate_parameters`.
+        :return: list of `UpfData` nodes, or list of `UpfHeader` tuples if `scan=True`
         :raises ValueError: if `dirpath` is not a directory or contains anything other than files with .UPF format
         :raises ValueError: if `dirpath` contains multiple pseudo potentials for the same element
         """
@@ -86,7 +122,7 @@ class SsspFamily(Group):
                 raise ValueError('dirpath `{}` contains at least one entry that is not a file'.format(dirpath))
 
             try:
-                pseudos.append(UpfData(filepath))
+                pseudos.append(scan_upf(filepath) if scan else UpfData(filepath))
             except ParsingError as exception:
                 raise ValueError('failed to parse `{}`: {}'.format(filepath, exception))
 
@@ -96,7 +132,7 @@ class SsspFamily(Group):
         return pseudos
 
     @classmethod
-    def create_from_folder(cls, dirpath, label, description=None, filepath_parameters=None):
+    def create_from_folder(cls, dirpath, label, description=None, filepath_parameters=None, deduplicate=False):
         """Create a new `SsspFamily` from the pseudo potentials contained in a directory.
 
         .. note:: the directory pointed to by `dirpath` should only contain UPF files. If it contains any folders or any
@@ -106,9 +142,14 @@ class SsspFamily(Group):
         :param label: the label to give to the `SsspFamily`, should not already exist
         :param description: optional description to give to the family.
         :param filepath_parameters: a filelike object or filepath to a file containing metadata for `SsspParameters`.
+        :param deduplicate: boolean, if True, the files are first only scanned and existing `UpfData` nodes with the
+            same element, filename and checksum are reused, such that nodes are only created for new pseudo potentials.
+            This makes installing many families that share pseudo potentials a lot cheaper.
         :return: new stored instance of `SsspFamily`
         :raises ValueError: if a `SsspFamily` already exists with the given name
         """
+        from aiida.common.exceptions import ParsingError
+
         type_check(description, str, allow_none=True)
 
         try:
@@ -118,31 +159,265 @@ class SsspFamily(Group):
         else:
             raise ValueError('the SsspFamily `{}` already exists'.format(label))
 
-        pseudos = cls.parse_pseudos_from_directory(dirpath)
+        if deduplicate:
+            headers = cls.parse_pseudos_from_directory(dirpath, scan=True)
+            existing = cls._get_existing_pseudos(headers)
+            pseudos = []
+
+            for header in headers:
+                filepath = os.path.join(dirpath, header.filename)
+
+                try:
+                    pseudos.append(existing[header] if header in existing else UpfData(filepath))
+                except ParsingError as exception:
+                    raise ValueError('failed to parse `{}`: {}'.format(filepath, exception))
+        else:
+            pseudos = cls.parse_pseudos_from_directory(dirpath)
+
+        return cls._store_family(family, pseudos, description, filepath_parameters)
+
+    @classmethod
+    def create_from_archive(
+        cls, filepath, label, description=None, filepath_parameters=None, fmt=None, deduplicate=False, progress=None
+    ):
+        """Create a new `SsspFamily` from the pseudo potentials contained in an archive.
+
+        The archive is read in a single pass and the content of each UPF file is streamed straight into the repository
+        of its node, without extracting the archive to disk. Directories and files without the `.upf` extension are
+        skipped. See :py:mod:`aiida_sssp.common.archive` for the supported formats.
+
+        :param filepath: absolute filepath of the archive containing the UPF files.
+        :param label: the label to give to the `SsspFamily`, should not already exist
+        :param description: optional description to give to the family.
+        :param filepath_parameters: a filelike object or filepath to a file containing metadata for `SsspParameters`.
+        :param fmt: optional name of the format of the archive, by default it is determined from the filename extension
+        :param deduplicate: boolean, if True, existing `UpfData` nodes with the same element, filename and checksum are
+            reused instead of the newly parsed ones.
+        :param progress: optional `Progress` to which the phases of parsing the files and storing the nodes are added
+        :return: new stored instance of `SsspFamily`
+        :raises ValueError: if a `SsspFamily` already exists with the given name or the files cannot be parsed
+        :raises OSError: if the archive could not be read
+        """
+        from aiida.common.exceptions import ParsingError
+
+        type_check(description, str, allow_none=True)
+
+        try:
+            cls.objects.get(label=label)
+        except exceptions.NotExistent:
+            family = SsspFamily(label=label)
+        else:
+            raise ValueError('the SsspFamily `{}` already exists'.format(label))
+
+        pseudos = []
+        progress = progress or Progress()
+
+        with progress.phase('parse pseudos', 'files') as phase:
+            for filename, handle in iter_upf_members(filepath, fmt):
+                try:
+                    pseudos.append(create_upf(handle, filename))
+                except ParsingError as exception:
+                    raise ValueError('failed to parse `{}`: {}'.format(filename, exception))
+                phase.update()
+
+        if len(pseudos) != len(set(pseudo.element for pseudo in pseudos)):
+            raise ValueError('archive `{}` contains pseudo potentials with duplicate elements'.format(filepath))
+
+        if deduplicate:
+            headers = [UpfHeader(upf.element, upf.filename, upf.md5sum) for upf in pseudos]
+            existing = cls._get_existing_pseudos(headers)
+            pseudos = [existing.get(header, upf) for header, upf in zip(headers, pseudos)]
+
+        return cls._store_family(family, pseudos, description, filepath_parameters, progress)
+
+    def upgrade(self, dirpath, label, description=None, filepath_parameters=None):
+        """Create a new `SsspFamily` from the pseudo potentials contained in a directory, reusing the nodes of this one.
+
+        Only pseudo potentials whose filename or checksum differ from those of the same element in this family are
+        parsed and stored as new `UpfData` nodes. For all others, the existing nodes are added to the new family. If
+        `filepath_parameters` is specified, the checksums are taken from the metadata, such that the files of unchanged
+        pseudo potentials are not even read and the cost of the upgrade is proportional to the number of changed files.
+        Otherwise, all files are scanned to compute their checksum, but no nodes are created for unchanged files. This
+        family itself is not modified.
+
+        .. note:: the directory pointed to by `dirpath` should only contain UPF files, just as for `create_from_folder`.
+            If `filepath_parameters` is specified, the directory should contain exactly the files that are defined in
+            the metadata.
+
+        :param dirpath: absolute path to the folder containing the UPF files.
+        :param label: the label to give to the new `SsspFamily`, should not already exist
+        :param description: optional description to give to the new family.
+        :param filepath_parameters: a filelike object or filepath to a file containing metadata for `SsspParameters`.
+        :return: new stored instance of `SsspFamily`
+        :raises ValueError: if a `SsspFamily` already exists with the given label, the directory is invalid or its files
+            do not correspond to those defined in the metadata
+        """
+        from aiida.common.exceptions import ParsingError
+
+        type_check(description, str, allow_none=True)
+
+        try:
+            self.objects.get(label=label)
+        except exceptions.NotExistent:
+            family = SsspFamily(label=label)
+        else:
+            raise ValueError('the SsspFamily `{}` already exists'.format(label))
+
+        if not os.path.isdir(dirpath):
+            raise ValueError('`{}` is not a directory'.format(dirpath))
 
         if filepath_parameters is not None:
-            parameters = SsspParameters.create_from_file(filepath_parameters, family.uuid)
-            cls.validate_parameters(pseudos, parameters)
-            parameters.store()
+            metadata = SsspParameters.create_from_file(filepath_parameters, family.uuid).get_metadata()
+            filenames = {values['filename'] for values in metadata.values()}
+            present = set(os.listdir(dirpath))
 
-        if description is not None:
-            family.description = description
+            for filename in sorted(present):
+                if filename not in filenames:
+                    raise ValueError('`{}` in `{}` is not defined in the parameters'.format(filename, dirpath))
 
-        # Only store the `Group` and the `UpfData` nodes now, such that we don't have to worry about the clean up in
-        # the case that an exception is raised during creating them.
-        family.store()
-        family.add_nodes([upf.store() for upf in pseudos])
+            self._check_missing_files(metadata, present, dirpath)
+            headers = [UpfHeader(element, values['filename'], values['md5']) for element, values in metadata.items()]
+        else:
+            metadata = None
+            headers = self.parse_pseudos_from_directory(dirpath, scan=True)
 
-        return family
+        builder = QueryBuilder().append(
+            SsspFamily, filters={'id': self.pk}, tag='group').append(
+            self._node_types, with_group='group', project='*')  # yapf:disable
+        existing = {upf.element: upf for [upf] in builder.iterall()}
+        pseudos = []
+
+        for header in headers:
+            upf = existing.get(header.element, None)
+
+            if upf is not None and (upf.filename, upf.md5sum) == (header.filename, header.md5sum):
+                pseudos.append(upf)
+                continue
+
+            filepath = os.path.join(dirpath, header.filename)
+
+            try:
+                pseudos.append(UpfData(filepath))
+            except ParsingError as exception:
+                raise ValueError('failed to parse `{}`: {}'.format(filepath, exception))
+
+        # The parameters file may be a filelike object that has already been consumed, so pass the parsed metadata
+        filepath_parameters = io.StringIO(json.dumps(metadata)) if metadata is not None else None
+
+        return self._store_family(family, pseudos, description, filepath_parameters)
+
+    def upgrade_from_archive(self, filepath, label, description=None, filepath_parameters=None, fmt=None):
+        """Create a new `SsspFamily` from the pseudo potentials contained in an archive, reusing the nodes of this one.
+
+        This is the equivalent of :py:meth:`upgrade` for an archive, which is read in a single pass without extracting
+        it to disk. If `filepath_parameters` is specified, members whose filename and checksum in the metadata match
+        those of the same element in this family are skipped without being read, such that only changed files are
+        parsed. Otherwise, each member is read once to compute its checksum, but nodes are only created for changed
+        files. This family itself is not modified.
+
+        :param filepath: absolute filepath of the archive containing the UPF files.
+        :param label: the label to give to the new `SsspFamily`, should not already exist
+        :param description: optional description to give to the new family.
+        :param filepath_parameters: a filelike object or filepath to a file containing metadata for `SsspParameters`.
+        :param fmt: optional name of the format of the archive, by default it is determined from the filename extension
+        :return: new stored instance of `SsspFamily`
+        :raises ValueError: if a `SsspFamily` already exists with the given label, the files cannot be parsed or they
+            do not correspond to those defined in the metadata
+        :raises OSError: if the archive could not be read
+        """
+        from aiida.common.exceptions import ParsingError
+
+        type_check(description, str, allow_none=True)
+
+        try:
+            self.objects.get(label=label)
+        except exceptions.NotExistent:
+            family = SsspFamily(label=label)
+        else:
+            raise ValueError('the SsspFamily `{}` already exists'.format(label))
+
+        existing = self.pseudos
+
+        if filepath_parameters is not None:
+            metadata = SsspParameters.create_from_file(filepath_parameters, family.uuid).get_metadata()
+            filenames = {values['filename'] for values in metadata.values()}
+            unchanged = {}
+
+            for element, values in metadata.items():
+                upf = existing.get(element, None)
+
+                if upf is not None and (upf.filename, upf.md5sum) == (values['filename'], values['md5']):
+                    unchanged[values['filename']] = upf
+        else:
+            metadata = None
+
+        pseudos = []
+        present = set()
+
+        for filename, handle in iter_upf_members(filepath, fmt):
+            present.add(filename)
+
+            try:
+                if metadata is not None:
+                    if filename not in filenames:
+                        raise ValueError('`{}` in `{}` is not defined in the parameters'.format(filename, filepath))
+
+                    if filename in unchanged:
+                        pseudos.append(unchanged[filename])
+                        continue
+
+                    pseudos.append(create_upf(handle, filename))
+                    continue
+
+                content = handle.read()
+                header = scan_upf(io.BytesIO(content), filename)
+                upf = existing.get(header.element, None)
+
+                if upf is not None and (upf.filename, upf.md5sum) == (header.filename, header.md5sum):
+                    pseudos.append(upf)
+                else:
+                    pseudos.append(create_upf(io.BytesIO(content), filename))
+            except ParsingError as exception:
+                raise ValueError('failed to parse `{}`: {}'.format(filename, exception))
+
+        if len(pseudos) != len(set(upf.element for upf in pseudos)):
+            raise ValueError('archive `{}` contains pseudo potentials with duplicate elements'.format(filepath))
+
+        if metadata is not None:
+            self._check_missing_files(metadata, present, filepath)
+
+        filepath_parameters = io.StringIO(json.dumps(metadata)) if metadata is not None else None
+
+        return self._store_family(family, pseudos, description, filepath_parameters)
+
+    @staticmethod
+    def _check_missing_files(metadata, filenames, source):
+        """Check that the files of all elements defined in the given metadata are among the given filenames.
+
+        :param metadata: dictionary of metadata parameters, as returned by `SsspParameters.get_metadata`
+        :param filenames: set of the filenames that are available
+        :param source: the directory or archive that contains the files, which is only used in the error message
+        :raises ValueError: if the files of any of the elements are missing
+        """
+        missing = sorted(element for element, values in metadata.items() if values['filename'] not in filenames)
+
+        if missing:
+            args = ('`, `'.join(missing), source)
+            raise ValueError('the files of elements `{}` defined in the parameters are missing from `{}`'.format(*args))
 
     def add_nodes(self, nodes):
         """Add a node or a set of nodes to the family.
 
         .. note: Each family instance can only contain a single `UpfData` for each element.
 
+        The nodes are validated as a batch before any of them is added: if the pseudos of the family are not yet cached,
+        conflicts with the pseudos already in the family are determined with a single query instead of loading them all.
+        All nodes are then added in a single operation.
+
         :param nodes: a single `Node` or a list of `Nodes` of type `SsspFamily._node_types`
         :raises TypeError: if nodes are not an instance or list of instance of `SsspFamily._node_types`
-        :raises ValueError: if any of the elements of the nodes already exist in this family
+        :raises ValueError: if multiple nodes have the same element or any of the elements of the nodes already exist in
+            this family
         """
         if not isinstance(nodes, (list, tuple)):
             nodes = [nodes]
@@ -150,28 +425,107 @@ class SsspFamily(Group):
         if any([not isinstance(node, self._node_types) for node in nodes]):
             raise TypeError('only nodes of type `{}` can be added'.format(self._node_types))
 
-        pseudos = {}
+        pseudos = {upf.element: upf for upf in nodes}
+
+        if len(pseudos) != len(nodes):
+            counts = collections.Counter(upf.element for upf in nodes)
+            duplicates = sorted(element for element, count in counts.items() if count > 1)
+            raise ValueError('multiple nodes for element `{}` in the nodes to add'.format('`, `'.join(duplicates)))
 
         # Check for duplicates before adding any pseudo to the internal cache
-        for upf in nodes:
-            if upf.element in self.elements:
-                raise ValueError('element `{}` already present in this family'.format(upf.element))
-            pseudos[upf.element] = upf
+        conflicts = self._get_conflicting_elements(pseudos)
 
-        self.pseudos.update(pseudos)
+        if conflicts:
+            raise ValueError('element `{}` already present in this family'.format('`, `'.join(sorted(conflicts))))
 
         super().add_nodes(nodes)
 
+        with self._lock:
+            if self._pseudos is not None:
+                self._pseudos.update(pseudos)
+
+            # The cache is up to date with this change, but may miss changes made by other processes since it was loaded
+            self._generations.pop('pseudos', None)
+
+        self.bump_generation()
+        invalidate_caches(self.uuid)
+
+    def remove_nodes(self, nodes):
+        """Remove a node or a set of nodes from the family.
+
+        :param nodes: a single `Node` or a list of `Nodes`
+        """
+        super().remove_nodes(nodes)
+
+        self._drop_caches('pseudos')
+        self.bump_generation()
+        invalidate_caches(self.uuid)
+
+    @property
+    def generation(self):
+        """Return the generation token of this family, which changes every time the content of the family changes.
+
+        The token is always queried from the database, such that it reflects changes made by other processes.
+
+        :return: the opaque generation token, or `None` if the family was not changed since it was first stored
+        """
+        if not self.is_stored:
+            return None
+
+        builder = QueryBuilder().append(
+            SsspFamily, filters={'id': self.pk}, project='extras.{}'.format(self.KEY_GENERATION)
+        )
+
+        return builder.one()[0]
+
+    def bump_generation(self):
+        """Set a new generation token for this family, which signals all processes that its content changed.
+
+        This is called automatically when pseudos are added or removed or when `SsspParameters` for the family are
+        stored, but should be called explicitly when the family is changed by any other means.
+        """
+        self.set_extra(self.KEY_GENERATION, uuid.uuid4().hex)
+
+    def revalidate(self):
+        """Drop the cached pseudos and parameters of this instance if the family changed since they were loaded.
+
+        :return: `True` if all caches were still valid, `False` if any were dropped
+        """
+        generation = self.generation
+
+        with self._lock:
+            stale = [key for key, value in self._generations.items() if value != generation]
+            stale += [
+                key for key, cached in (('pseudos', self._pseudos), ('parameters', self._parameters_node))
+                if cached is not None and key not in self._generations
+            ]
+
+        self._drop_caches(*stale)
+
+        return not stale
+
     @property
     def pseudos(self):
         """Return the dictionary of pseudo potentials of this family indexed on the element symbol.
 
         :return: dictionary of element symbol mapping `UpfData`
         """
-        if self._pseudos is None:
-            self._pseudos = {upf.element: upf for upf in self.nodes}
+        pseudos = self._pseudos
 
-        return self._pseudos
+        if pseudos is None:
+            state = {}
+
+            def load():
+                state['generation'] = self.generation
+                return {upf.element: upf for upf in self.nodes}
+
+            def store(value):
+                self._generations['pseudos'] = state['generation']
+                self._pseudos = value
+
+            pseudos = self._load_cached('pseudos', lambda: self._pseudos, load, store)
+
+        return pseudos
 
     @property
     def elements(self):
@@ -188,23 +542,49 @@ class SsspFamily(Group):
         :return: `UpfData` instance if it exists
         :raises ValueError: if the family does not contain a `UpfData` for the given element
         """
+        pseudos = self.pseudos
+
         try:
-            pseudo = self.pseudos[element]
+            return pseudos[element]
         except KeyError:
+            pass
+
+        def load():
             builder = QueryBuilder().append(
                 SsspFamily, filters={'id': self.pk}, tag='group').append(
                 self._node_types, filters={'attributes.element': element}, with_group='group')  # yapf:disable
 
             try:
-                pseudo = builder.one()[0]
+                return builder.one()[0]
             except exceptions.MultipleObjectsError:
                 raise RuntimeError('family `{}` contains multiple pseudos for `{}`'.format(self.label, element))
             except exceptions.NotExistent:
                 raise ValueError('family `{}` does not contain pseudo for element `{}`'.format(self.label, element))
-            else:
-                self.pseudos[element] = pseudo
 
-        return pseudo
+        def store(value):
+            pseudos[element] = value
+
+        return self._load_cached(('pseudo', element), lambda: pseudos.get(element, None), load, store)
+
+    def get_pseudo_uuid(self, element):
+        """Return the UUID of the `UpfData` for the given element.
+
+        .. note:: if the configured cache backend contains this family, the UUID is taken from it without accessing the
+            database. See :py:func:`aiida_sssp.cache.set_cache_backend`.
+
+        :param element: the element for which to return the UUID of the corresponding `UpfData` node.
+        :return: the UUID of the `UpfData`
+        :raises ValueError: if the family does not contain a `UpfData` for the given element
+        """
+        snapshot = self._get_snapshot()
+
+        if snapshot is not None:
+            try:
+                return snapshot.get_record(self.uuid, element).uuid
+            except KeyError:
+                pass
+
+        return self.get_pseudo(element).uuid
 
     def get_pseudos(self, structure):
         """Return the mapping of kind names on `UpfData` for the given structure.
@@ -216,6 +596,101 @@ class SsspFamily(Group):
         type_check(structure, StructureData)
         return {kind.name: self.get_pseudo(kind.symbol) for kind in structure.kinds}
 
+    def open_pseudo(self, element):
+        """Return a binary file handle to the UPF file of the given element, read directly from the repository.
+
+        The handle should be used as a context manager, such that it is closed once it is no longer needed.
+
+        :param element: the element for which to open the UPF file
+        :return: file handle opened in binary mode
+        :raises ValueError: if the family does not contain a `UpfData` for the given element
+        """
+        return self.get_pseudo(element).open(mode='rb')
+
+    def iter_pseudo_handles(self, elements=None):
+        """Iterate over binary file handles to the UPF files of this family, without reading them into memory.
+
+        The handles are opened one at a time: each handle is closed as soon as the iterator is advanced, so at most one
+        file is open at any time. The handles should therefore not be used after advancing the iterator.
+
+        :param elements: optional list of elements, by default the handles of all elements are yielded
+        :return: generator of tuples of element and binary file handle, sorted by element
+        :raises ValueError: if the family does not contain a `UpfData` for any of the given elements
+        """
+        for element in sorted(elements if elements is not None else self.elements):
+            with self.open_pseudo(element) as handle:
+                yield element, handle
+
+    def iter_pseudo_chunks(self, element, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Iterate over the content of the UPF file of the given element in chunks, keeping memory usage bounded.
+
+        :param element: the element for which to read the UPF file
+        :param chunk_size: the maximum size in bytes of each chunk
+        :return: generator of chunks of bytes
+        :raises ValueError: if the family does not contain a `UpfData` for the given element
+        """
+        with self.open_pseudo(element) as handle:
+            for chunk in iter(lambda: handle.read(chunk_size), b''):
+                yield chunk
+
+    def stage_pseudos(self, dirpath=None, elements=None, structure=None, link='hardlink'):
+        """Materialize pseudos of this family in the persistent pseudo store and optionally link them into a directory.
+
+        Each file is copied out of the repository only the first time it is staged, after which staging it merely
+        requires creating a link. If the configured cache backend contains this family, this does not access the
+        database at all. See :py:class:`aiida_sssp.cache.PseudoStore` for details.
+
+        .. note:: at most one of the arguments `elements` or `structure` should be passed. If neither is passed, all
+            pseudos of the family are staged.
+
+        :param dirpath: optional absolute path of a directory in which to link the files, using their original filename
+        :param elements: optional single or tuple of elements
+        :param structure: optional `StructureData` node
+        :param link: the type of link to create in `dirpath`, either `hardlink` or `symlink`
+        :return: dictionary of element symbol mapping the absolute filepath of the staged file, which is the link in
+            `dirpath` if specified, or the file in the store otherwise
+        :raises ValueError: if the family does not contain a `UpfData` for any of the requested elements
+        """
+        from aiida_sssp.cache import get_pseudo_store
+
+        if elements is not None and structure is not None:
+            raise ValueError('at most one of `elements` or `structure` should be defined')
+
+        type_check(elements, (tuple, str), allow_none=True)
+        type_check(structure, StructureData, allow_none=True)
+
+        snapshot = self._get_snapshot()
+        records = {record.element: record for record in snapshot.get_records(self.uuid)} if snapshot else {}
+
+        if structure is not None:
+            symbols = structure.get_symbols_set()
+        elif isinstance(elements, str):
+            symbols = (elements,)
+        elif elements is not None:
+            symbols = elements
+        else:
+            symbols = list(records) or self.elements
+
+        store = get_pseudo_store()
+        staged = {}
+
+        for element in symbols:
+            try:
+                md5, filename = records[element].md5, records[element].filename
+            except KeyError:
+                pseudo = self.get_pseudo(element)
+                md5, filename = pseudo.md5sum, pseudo.filename
+
+            if not store.contains(md5):
+                store.materialize(self.get_pseudo(element))
+
+            if dirpath is not None:
+                staged[element] = store.link(md5, os.path.join(dirpath, filename), link)
+            else:
+                staged[element] = store.get_filepath(md5)
+
+        return staged
+
     def get_parameters_node(self):
         """Return the associated `SsspParameters` node if it exists.
 
@@ -224,13 +699,19 @@ class SsspFamily(Group):
         """
         from aiida_sssp.data import SsspParameters
 
-        if self._parameters_node is None:
+        state = {}
+
+        def load():
+            state['generation'] = self.generation
             filters = {'attributes.{}'.format(SsspParameters.KEY_FAMILY_UUID): self.uuid}
-            builder = QueryBuilder().append(SsspParameters, filters=filters)
-            self._parameters_node = builder.one()[0]
-            self._parameters = self._parameters_node.attributes
+            return QueryBuilder().append(SsspParameters, filters=filters).one()[0]
 
-        return self._parameters_node
+        def store(value):
+            self._generations['parameters'] = state['generation']
+            self._parameters_node = value
+            self._parameters = value.attributes
+
+        return self._load_cached('parameters', lambda: self._parameters_node, load, store)
 
     @property
     def parameters(self):
@@ -271,6 +752,137 @@ class SsspFamily(Group):
         :return: tuple of recommended wavefunction and density cutoff
         :raises: `aiida.common.exceptions.NotExistent` if the family does not have associated parameters
         """
+        symbols = self._get_symbols(elements, structure)
+        cutoffs_wfc = []
+        cutoffs_rho = []
+
+        if self._parameters is None:
+            cutoffs = self._get_cutoffs_from_snapshot(symbols)
+            if cutoffs is not None:
+                return cutoffs
+
+        for element in symbols:
+            values = self.parameters[element]
+            cutoffs_wfc.append(values['cutoff_wfc'])
+            cutoffs_rho.append(values['cutoff_rho'])
+
+        return (max(cutoffs_wfc), max(cutoffs_rho))
+
+    async def get_pseudos_async(self, structure):
+        """Awaitable version of :py:meth:`get_pseudos`, see :py:mod:`aiida_sssp.groups.aio`.
+
+        :param structure: the `StructureData` for which to return the corresponding `UpfData` mapping.
+        :return: dictionary of kind name mapping `UpfData`
+        :raises ValueError: if the family does not contain a `UpfData` for any of the elements of the given structure.
+        """
+        from .aio import get_async_resolver
+
+        type_check(structure, StructureData)
+        pseudos = await get_async_resolver().get_pseudos(self)
+
+        try:
+            return {kind.name: pseudos[kind.symbol] for kind in structure.kinds}
+        except KeyError as exception:
+            raise ValueError(
+                'family `{}` does not contain pseudo for element `{}`'.format(self.label, exception.args[0])
+            )
+
+    async def get_parameters_node_async(self):
+        """Awaitable version of :py:meth:`get_parameters_node`, see :py:mod:`aiida_sssp.groups.aio`.
+
+        :return: the associated `SsspParameters` node containing information like recommended cutoffs
+        :raises: `aiida.common.exceptions.NotExistent` if the family does not have associated parameters
+        """
+        from .aio import get_async_resolver
+
+        return await get_async_resolver().get_parameters_node(self)
+
+    async def get_cutoffs_async(self, elements=None, structure=None):
+        """Awaitable version of :py:meth:`get_cutoffs`, see :py:mod:`aiida_sssp.groups.aio`.
+
+        :param elements: single or tuple of elements
+        :param structure: a `StructureData` node
+        :return: tuple of recommended wavefunction and density cutoff
+        :raises: `aiida.common.exceptions.NotExistent` if the family does not have associated parameters
+        """
+        from .aio import get_async_resolver
+
+        if self._parameters is None:
+            cutoffs = self._get_cutoffs_from_snapshot(self._get_symbols(elements, structure))
+            if cutoffs is not None:
+                return cutoffs
+
+            await get_async_resolver().get_parameters_node(self)
+
+        return self.get_cutoffs(elements, structure)
+
+    def _load_cached(self, key, get, load, store):
+        """Return a cached value, loading it on a miss such that concurrent misses for the same key share a single load.
+
+        The first thread that misses loads the value without holding the lock, while other threads that miss the same
+        key in the meantime wait for its result, or the exception it raised.
+
+        :param key: hashable key that identifies the value
+        :param get: callable that returns the cached value or `None` on a miss, which is called while holding the lock
+        :param load: callable that loads the value, which is called without holding the lock
+        :param store: callable that stores the loaded value in the cache, which is called while holding the lock
+        :return: the cached or loaded value
+        """
+        with self._lock:
+            value = get()
+
+            if value is not None:
+                return value
+
+            future = self._loading.get(key, None)
+            owner = future is None
+
+            if owner:
+                future = self._loading[key] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = load()
+        except BaseException as exception:
+            with self._lock:
+                del self._loading[key]
+            future.set_exception(exception)
+            raise
+
+        with self._lock:
+            store(value)
+            del self._loading[key]
+
+        future.set_result(value)
+
+        return value
+
+    def _drop_caches(self, *keys):
+        """Drop the given caches of this instance, which are reloaded the next time they are needed.
+
+        :param keys: the caches to drop, each either `pseudos` or `parameters`
+        """
+        with self._lock:
+            for key in keys:
+                self._generations.pop(key, None)
+
+                if key == 'pseudos':
+                    self._pseudos = None
+                else:
+                    self._parameters_node = None
+                    self._parameters = None
+
+    @staticmethod
+    def _get_symbols(elements=None, structure=None):
+        """Return the element symbols for either the given elements or `StructureData`.
+
+        :param elements: single or tuple of elements
+        :param structure: a `StructureData` node
+        :return: iterable of element symbols
+        :raises ValueError: if not exactly one of `elements` or `structure` is defined
+        """
         if (elements is None and structure is None) or (elements is not None and structure is not None):
             raise ValueError('at least one and only one of `elements` or `structure` should be defined')
 
@@ -278,18 +890,135 @@ class SsspFamily(Group):
         type_check(structure, StructureData, allow_none=True)
 
         if structure is not None:
-            symbols = structure.get_symbols_set()
-        elif isinstance(elements, tuple):
-            symbols = elements
+            return structure.get_symbols_set()
+
+        if isinstance(elements, tuple):
+            return elements
+
+        return (elements,)
+
+    @classmethod
+    def _store_family(cls, family, pseudos, description=None, filepath_parameters=None, progress=None):
+        """Store the given unstored family with the given pseudo potentials and optional parameters.
+
+        :param family: the unstored `SsspFamily`
+        :param pseudos: list of `UpfData` nodes, which may or may not be stored
+        :param description: optional description to give to the family.
+        :param filepath_parameters: a filelike object or filepath to a file containing metadata for `SsspParameters`.
+        :param progress: optional `Progress` to which the phase of storing the nodes is added
+        :return: the stored family
+        :raises ValueError: if the parameters are not compatible with the pseudo potentials
+        """
+        from aiida.manage.manager import get_manager
+
+        if filepath_parameters is not None:
+            parameters = SsspParameters.create_from_file(filepath_parameters, family.uuid)
+            cls.validate_parameters(pseudos, parameters)
         else:
-            symbols = (elements,)
+            parameters = None
 
-        cutoffs_wfc = []
-        cutoffs_rho = []
+        if description is not None:
+            family.description = description
 
-        for element in symbols:
-            values = self.parameters[element]
-            cutoffs_wfc.append(values['cutoff_wfc'])
-            cutoffs_rho.append(values['cutoff_rho'])
+        # Only store the `Group` and the `UpfData` nodes now, such that we don't have to worry about the clean up in
+        # the case that an exception is raised during creating them. Everything is stored in a single transaction.
+        unstored = [upf for upf in pseudos if not upf.is_stored]
+        progress = progress or Progress()
+
+        with progress.phase('store nodes', 'nodes', total=len(unstored)) as phase:
+            with get_manager().get_backend().transaction():
+                if parameters is not None:
+                    parameters.store()
+                family.store()
+                for upf in unstored:
+                    upf.store()
+                    phase.update()
+                family.add_nodes(pseudos)
+
+        return family
+
+    @classmethod
+    def _get_existing_pseudos(cls, headers):
+        """Return the stored `UpfData` nodes that correspond to the given headers, with a single query.
+
+        :param headers: list of `UpfHeader` tuples
+        :return: dictionary mapping the headers for which a node exists onto the node, the oldest if there are multiple
+        """
+        if not headers:
+            return {}
+
+        filters = {'attributes.md5': {'in': [header.md5sum for header in headers]}}
+        builder = QueryBuilder().append(UpfData, filters=filters).order_by({UpfData: {'id': 'desc'}})
+        existing = {UpfHeader(upf.element, upf.filename, upf.md5sum): upf for [upf] in builder.iterall()}
+
+        return {header: existing[header] for header in headers if header in existing}
+
+    def _get_conflicting_elements(self, elements):
+        """Return those of the given elements for which this family already contains a pseudo potential.
+
+        :param elements: iterable of element symbols
+        :return: set of element symbols
+        """
+        elements = set(elements)
+        pseudos = self._pseudos
+
+        if pseudos is not None:
+            return elements.intersection(pseudos)
+
+        if not self.is_stored or not elements:
+            return set()
+
+        builder = QueryBuilder().append(SsspFamily, filters={'id': self.pk}, tag='group')
+        builder.append(
+            self._node_types,
+            filters={'attributes.element': {
+                'in': list(elements)
+            }},
+            with_group='group',
+            project='attributes.element'
+        )
+
+        return {element for [element] in builder.iterall()}
+
+    def _get_snapshot(self):
+        """Return the snapshot of the configured cache backend if it exists and contains this family.
+
+        :return: instance of `SsspSnapshot` or `None`
+        """
+        if not self.is_stored:
+            return None
+
+        backend = get_cache_backend()
+        snapshot = backend.get_snapshot() if backend is not None else None
+
+        if snapshot is None or self.uuid not in snapshot:
+            return None
+
+        return snapshot
+
+    def _get_cutoffs_from_snapshot(self, elements):
+        """Return the tuple of recommended cutoffs for the given elements from the cache backend, if possible.
+
+        :param elements: iterable of elements
+        :return: tuple of recommended wavefunction and density cutoff, or `None` if there is no snapshot or it does not
+            define the cutoffs for all the given elements.
+        """
+        import math
+
+        snapshot = self._get_snapshot()
+
+        if snapshot is None:
+            return None
+
+        try:
+            records = [snapshot.get_record(self.uuid, element) for element in elements]
+        except KeyError:
+            return None
+
+        cutoffs_wfc = [record.cutoff_wfc for record in records]
+        cutoffs_rho = [record.cutoff_rho for record in records]
+
+        if not records or any(math.isnan(cutoff) for cutoff in cutoffs_wfc + cutoffs_rho):
+            return None
 
         return (max(cutoffs_wfc), max(cutoffs_rho))
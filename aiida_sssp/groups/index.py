@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""Index of the elements of all `SsspFamily` instances, to find the families that cover a set of elements."""
+import collections
+import math
+
+from aiida.common.lang import type_check
+from aiida.plugins import DataFactory
+
+from aiida_sssp.cache import get_cache_backend, query_records
+
+__all__ = ('ElementIndex', 'find_families', 'get_element_index')
+
+StructureData = DataFactory('structure')
+
+# The index of this process, together with the checksum of the snapshot from which it was built.
+_ELEMENT_INDEX = (None, None)
+
+
+class ElementIndex:
+    """Inverted index that maps each element onto the families that contain it, with their recommended cutoffs.
+
+    Once built, which requires at most two queries, the families that cover any number of sets of elements, and their
+    maximum cutoffs for each set, are determined without accessing the database.
+    """
+
+    def __init__(self, records):
+        """Construct a new index.
+
+        :param records: iterable of `SnapshotRecord`
+        """
+        self._families = collections.defaultdict(dict)
+        self._elements = collections.defaultdict(set)
+
+        for record in records:
+            cutoffs = (record.cutoff_wfc, record.cutoff_rho)
+            self._families[record.family_uuid][record.element] = None if any(map(math.isnan, cutoffs)) else cutoffs
+            self._elements[record.element].add(record.family_uuid)
+
+    @classmethod
+    def from_database(cls):
+        """Build the index of all families from the database.
+
+        :return: instance of `ElementIndex`
+        """
+        return cls(query_records())
+
+    @property
+    def family_uuids(self):
+        """Return the UUIDs of all families in the index.
+
+        :return: set of family UUIDs
+        """
+        return set(self._families)
+
+    def get_elements(self, family_uuid):
+        """Return the elements of the family with the given UUID.
+
+        :param family_uuid: the UUID of the family
+        :return: set of element symbols, which is empty if the index does not contain the family
+        """
+        return set(self._families.get(str(family_uuid), {}))
+
+    def get_family_uuids(self, elements):
+        """Return the UUIDs of the families that contain a pseudo potential for each of the given elements.
+
+        :param elements: iterable of element symbols
+        :return: set of family UUIDs
+        """
+        elements = set(elements)
+
+        if not elements:
+            return self.family_uuids
+
+        # Intersect starting from the smallest set, such that rare elements quickly narrow down the candidates.
+        candidates = sorted((self._elements.get(element, set()) for element in elements), key=len)
+
+        return set(candidates[0]).intersection(*candidates[1:])
+
+    def get_cutoffs(self, family_uuid, elements):
+        """Return the maximum recommended cutoffs of the given elements for the family with the given UUID.
+
+        :param family_uuid: the UUID of the family
+        :param elements: iterable of element symbols
+        :return: tuple of the wavefunction and density cutoff, or `None` if the family does not define recommended
+            cutoffs for all of the elements
+        :raises KeyError: if the family does not contain one of the elements
+        """
+        family = self._families.get(str(family_uuid), {})
+        cutoffs = [family[element] for element in set(elements)]
+
+        if not cutoffs or None in cutoffs:
+            return None
+
+        return (max(cutoff[0] for cutoff in cutoffs), max(cutoff[1] for cutoff in cutoffs))
+
+    def find(self, elements):
+        """Return the families that cover the given elements with their maximum recommended cutoffs for those elements.
+
+        :param elements: iterable of element symbols
+        :return: dictionary mapping the UUID of each covering family onto the tuple of its maximum cutoffs, or `None` if
+            the family does not define recommended cutoffs for all of the elements
+        """
+        elements = set(elements)
+        return {uuid: self.get_cutoffs(uuid, elements) for uuid in self.get_family_uuids(elements)}
+
+
+def get_element_index():
+    """Return the element index of all families of the current profile.
+
+    If the configured cache backend provides a snapshot, the index is built from it and kept for as long as the snapshot
+    does not change, such that it does not access the database at all. Otherwise it is built from the database.
+
+    :return: instance of `ElementIndex`
+    """
+    global _ELEMENT_INDEX  # pylint: disable=global-statement
+
+    backend = get_cache_backend()
+    snapshot = backend.get_snapshot() if backend is not None else None
+
+    if snapshot is None:
+        return ElementIndex.from_database()
+
+    checksum, index = _ELEMENT_INDEX
+
+    if index is None or checksum != snapshot.checksum:
+        index = ElementIndex(snapshot)
+        _ELEMENT_INDEX = (snapshot.checksum, index)
+
+    return index
+
+
+def find_families(elements=None, structure=None):
+    """Return the families that contain a pseudo potential for each of the given elements or those of the structure.
+
+    .. note:: at least one and only one of arguments `elements` or `structure` should be passed.
+
+    :param elements: iterable of element symbols
+    :param structure: a `StructureData` node
+    :return: list of tuples of each covering `SsspFamily`, ordered by label, and its maximum recommended cutoffs for the
+        elements, or `None` if the family does not define recommended cutoffs for all of them
+    """
+    from aiida.orm import QueryBuilder
+
+    from .family import SsspFamily
+
+    if (elements is None) == (structure is None):
+        raise ValueError('at least one and only one of `elements` or `structure` should be defined')
+
+    type_check(structure, StructureData, allow_none=True)
+
+    elements = structure.get_symbols_set() if structure is not None else set(elements)
+    cutoffs = get_element_index().find(elements)
+
+    if not cutoffs:
+        return []
+
+    builder = QueryBuilder().append(SsspFamily, filters={'uuid': {'in': list(cutoffs)}}).order_by({SsspFamily: 'label'})
+
+    return [(family, cutoffs[family.uuid]) for [family] in builder.iterall()]
@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+"""Load test of the lookups of `SsspFamily` instances by many concurrent workers.
+
+A load test simulates the conditions of a busy daemon: a number of processes, each running a number of worker threads,
+repeatedly resolve the pseudo potentials and cutoffs of synthetic structures against installed families. The workers
+either share the family instances of their process, as input builders in a thread pool do, or each load their own, as
+separate calculation jobs do. The result reports the throughput, the latency percentiles of each operation and the
+number of database queries that were executed, such that caching strategies can be compared and contention
+regressions caught.
+
+.. warning:: a load test only reads from the database, but it puts it under heavy load and should therefore be run
+    against a local test profile.
+"""
+import collections
+import contextlib
+import math
+import random
+import threading
+import time
+
+from aiida_sssp.common import create_structure, generate_compositions
+
+__all__ = ('LoadTestResult', 'count_queries', 'run_load_test')
+
+OPERATIONS = ('get_pseudo', 'get_pseudos', 'get_cutoffs')
+PERCENTILES = (50, 90, 99)
+DEFAULT_STRUCTURES = 32
+
+
+class QueryCounter:
+    """Thread-safe counter of the number of database queries."""
+
+    def __init__(self):
+        """Construct a new instance."""
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def increment(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """Increment the count by one, accepting and ignoring any arguments such that it can be used as a callback."""
+        with self._lock:
+            self.count += 1
+
+
+@contextlib.contextmanager
+def count_queries():
+    """Count the SQL statements that are executed by any thread of this process while the context is active.
+
+    :return: the `QueryCounter`, whose `count` attribute is the number of statements executed so far
+    """
+    from aiida.manage.configuration import get_profile
+
+    counter = QueryCounter()
+
+    if get_profile().database_backend == 'sqlalchemy':
+        from sqlalchemy import event
+        from aiida.backends.sqlalchemy import get_scoped_session
+
+        engine = get_scoped_session().bind
+        event.listen(engine, 'before_cursor_execute', counter.increment)
+
+        try:
+            yield counter
+        finally:
+            event.remove(engine, 'before_cursor_execute', counter.increment)
+    else:
+        from django.db.backends.utils import CursorWrapper
+
+        originals = {name: getattr(CursorWrapper, name) for name in ('execute', 'executemany')}
+
+        def wrap(method):
+
+            def wrapper(self, *args, **kwargs):
+                counter.increment()
+                return method(self, *args, **kwargs)
+
+            return wrapper
+
+        for name, method in originals.items():
+            setattr(CursorWrapper, name, wrap(method))
+
+        try:
+            yield counter
+        finally:
+            for name, method in originals.items():
+                setattr(CursorWrapper, name, method)
+
+
+class LoadTestResult:
+    """Result of a load test, with the latencies of all operations, the elapsed time and the number of queries."""
+
+    def __init__(self, latencies, errors, elapsed, queries, workers, processes, cache_backend=None):
+        """Construct a new instance.
+
+        :param latencies: dictionary of operation mapping a list of the latencies of its calls in seconds
+        :param errors: dictionary of operation mapping the number of calls that raised
+        :param elapsed: the number of seconds that the load test took
+        :param queries: the number of database queries executed by the workers
+        :param workers: the number of worker threads per process
+        :param processes: the number of processes
+        :param cache_backend: optional name of the cache backend that was used
+        """
+        self.latencies = latencies
+        self.errors = errors
+        self.elapsed = elapsed
+        self.queries = queries
+        self.workers = workers
+        self.processes = processes
+        self.cache_backend = cache_backend
+
+    @property
+    def count(self):
+        """Return the total number of successful calls of all operations.
+
+        :return: the number of calls
+        """
+        return sum(len(latencies) for latencies in self.latencies.values())
+
+    @property
+    def throughput(self):
+        """Return the number of successful calls per second, over all workers.
+
+        :return: the throughput, which is zero if no time has elapsed
+        """
+        return self.count / self.elapsed if self.elapsed > 0 else 0.
+
+    def get_percentiles(self, operation=None, percentiles=PERCENTILES):
+        """Return the given percentiles of the latencies of the given operation, using the nearest-rank method.
+
+        :param operation: optional operation, by default the latencies of all operations are combined
+        :param percentiles: iterable of percentiles between 0 and 100
+        :return: dictionary of percentile mapping latency in seconds, or `None` if there were no successful calls
+        """
+        if operation is None:
+            latencies = sorted(latency for values in self.latencies.values() for latency in values)
+        else:
+            latencies = sorted(self.latencies.get(operation, []))
+
+        return {
+            percentile: latencies[max(int(math.ceil(percentile / 100 * len(latencies))) - 1, 0)] if latencies else None
+            for percentile in percentiles
+        }
+
+    def as_dict(self):
+        """Return the summary of the result as a JSON-serializable dictionary.
+
+        :return: dictionary with the configuration, the totals and the statistics of each operation
+        """
+        operations = {}
+
+        for operation, latencies in self.latencies.items():
+            operations[operation] = {
+                'count': len(latencies),
+                'errors': self.errors.get(operation, 0),
+                'percentiles': {str(key): value for key, value in self.get_percentiles(operation).items()},
+                'max': max(latencies) if latencies else None,
+            }
+
+        return {
+            'workers': self.workers,
+            'processes': self.processes,
+            'cache_backend': self.cache_backend,
+            'seconds': self.elapsed,
+            'count': self.count,
+            'throughput': self.throughput,
+            'queries': self.queries,
+            'operations': operations,
+        }
+
+    def format(self):
+        """Return a human readable summary of the result.
+
+        :return: string with a line per operation with its latency percentiles in milliseconds, followed by the totals
+        """
+        lines = [
+            '{:<12} {:>8} {:>7} {}'.format(
+                'operation', 'count', 'errors', ' '.join('{:>9}'.format('p{} [ms]'.format(p)) for p in PERCENTILES)
+            )
+        ]
+
+        for operation, latencies in sorted(self.latencies.items()):
+            percentiles = self.get_percentiles(operation)
+            values = ' '.join(
+                '{:>9.3f}'.format(percentiles[p] * 1000) if percentiles[p] is not None else '{:>9}'.format('-')
+                for p in PERCENTILES
+            )
+            lines.append(
+                '{:<12} {:>8} {:>7} {}'.format(operation, len(latencies), self.errors.get(operation, 0), values)
+            )
+
+        count = self.count or 1
+        lines.append(
+            '{} calls by {} workers in {} processes in {:.2f} s: {:.1f} calls/s, {} queries ({:.3f} per call)'.format(
+                self.count, self.workers, self.processes, self.elapsed, self.throughput, self.queries,
+                self.queries / count
+            )
+        )
+
+        return '\n'.join(lines)
+
+
+def run_load_test(
+    family_uuids,
+    workers=8,
+    processes=1,
+    requests=1000,
+    operations=OPERATIONS,
+    share_instances=True,
+    cache_backend=None,
+    seed=0
+):
+    """Run a load test of the lookups of the given families.
+
+    Each worker performs the given number of requests, cycling through the operations, each time for a random family
+    and a random synthetic structure composed of elements of that family. If more than one process is requested, the
+    processes are spawned and each loads the current profile itself.
+
+    :param family_uuids: list of UUIDs of stored `SsspFamily` instances
+    :param workers: the number of worker threads per process
+    :param processes: the number of processes
+    :param requests: the number of requests per worker
+    :param operations: the operations to call, any of `get_pseudo`, `get_pseudos` and `get_cutoffs`
+    :param share_instances: if `True`, the workers of a process share the family instances, otherwise each worker
+        loads its own instances
+    :param cache_backend: optional name of the cache backend to use instead of the configured one
+    :param seed: the seed for the random choices of the workers, such that runs can be reproduced
+    :return: instance of `LoadTestResult`
+    :raises ValueError: if no families or an unknown operation are specified
+    """
+    from aiida.manage.configuration import get_profile
+
+    if not family_uuids:
+        raise ValueError('at least one family should be specified')
+
+    unknown = set(operations).difference(OPERATIONS)
+
+    if unknown or not operations:
+        raise ValueError('invalid operations `{}`, choose from: {}'.format(', '.join(unknown), ', '.join(OPERATIONS)))
+
+    arguments = (list(family_uuids), workers, requests, tuple(operations), share_instances, cache_backend)
+
+    if processes == 1:
+        results = [_run_process(*arguments, seed=seed)]
+    else:
+        import multiprocessing
+
+        profile = get_profile().name
+        seeds = [seed + index * workers for index in range(processes)]
+
+        with multiprocessing.get_context('spawn').Pool(processes) as pool:
+            results = pool.starmap(_run_process, [arguments + (seed, profile) for seed in seeds])
+
+    latencies = {operation: [] for operation in operations}
+    errors = collections.Counter()
+
+    for result in results:
+        for operation, values in result['latencies'].items():
+            latencies[operation].extend(values)
+        errors.update(result['errors'])
+
+    elapsed = max(result['elapsed'] for result in results)
+    queries = sum(result['queries'] for result in results)
+    backend = results[0]['cache_backend']
+
+    return LoadTestResult(latencies, dict(errors), elapsed, queries, workers, processes, backend)
+
+
+def _run_process(family_uuids, workers, requests, operations, share_instances, cache_backend, seed, profile=None):
+    """Run the workers of a single process of a load test.
+
+    :param profile: optional name of the profile to load, which is required in spawned processes
+    :return: dictionary with the `latencies`, `errors`, `elapsed` time, number of `queries` and name of the
+        `cache_backend`
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from aiida.manage.configuration import load_profile
+
+    from aiida_sssp.cache import get_cache_backend, override_cache_backend
+
+    if profile is not None:
+        load_profile(profile)
+
+    override = override_cache_backend(cache_backend) if cache_backend is not None else contextlib.suppress()
+
+    with override:
+        backend = get_cache_backend()
+        shared = _load_families(family_uuids)
+        structures = [_create_structures(family.elements, seed + index) for index, family in enumerate(shared)]
+        instances = [shared if share_instances else _load_families(family_uuids) for _ in range(workers)]
+        barrier = threading.Barrier(workers + 1)
+
+        with count_queries() as counter:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        _run_worker, instances[index], structures, operations, requests, seed + index, barrier
+                    ) for index in range(workers)
+                ]
+                barrier.wait()
+                start = time.perf_counter()
+                results = [future.result() for future in futures]
+                elapsed = time.perf_counter() - start
+
+    latencies = {operation: [] for operation in operations}
+    errors = collections.Counter()
+
+    for worker_latencies, worker_errors in results:
+        for operation, values in worker_latencies.items():
+            latencies[operation].extend(values)
+        errors.update(worker_errors)
+
+    return {
+        'latencies': latencies,
+        'errors': dict(errors),
+        'elapsed': elapsed,
+        'queries': counter.count,
+        'cache_backend': backend.name if backend is not None else 'none',
+    }
+
+
+def _run_worker(families, structures, operations, requests, seed, barrier):
+    """Perform the requests of a single worker once all workers are ready and release its database connection.
+
+    :return: tuple of a dictionary of operation mapping the list of latencies and a counter of the errors per operation
+    """
+    from aiida_sssp.cache import release_connection
+
+    try:
+        return _perform_requests(families, structures, operations, requests, seed, barrier)
+    finally:
+        release_connection()
+
+
+def _perform_requests(families, structures, operations, requests, seed, barrier):
+    """Perform the requests of a single worker once all workers are ready.
+
+    :return: tuple of a dictionary of operation mapping the list of latencies and a counter of the errors per operation
+    """
+    rng = random.Random(seed)
+    latencies = {operation: [] for operation in operations}
+    errors = collections.Counter()
+
+    barrier.wait()
+
+    for index in range(requests):
+        operation = operations[index % len(operations)]
+        position = rng.randrange(len(families))
+        family = families[position]
+        structure, symbols = rng.choice(structures[position])
+        element = rng.choice(symbols)
+
+        start = time.perf_counter()
+
+        try:
+            if operation == 'get_pseudo':
+                family.get_pseudo(element)
+            elif operation == 'get_pseudos':
+                family.get_pseudos(structure)
+            else:
+                family.get_cutoffs(structure=structure)
+        except Exception:  # pylint: disable=broad-except
+            errors[operation] += 1
+        else:
+            latencies[operation].append(time.perf_counter() - start)
+
+    return latencies, errors
+
+
+def _load_families(family_uuids):
+    """Return new instances of the families with the given UUIDs."""
+    from .family import SsspFamily
+
+    return [SsspFamily.objects.get(uuid=uuid) for uuid in family_uuids]
+
+
+def _create_structures(elements, seed, count=DEFAULT_STRUCTURES):
+    """Return unstored structures composed of random subsets of the given elements.
+
+    :param elements: list of element symbols
+    :param seed: the seed of the random compositions
+    :param count: the number of structures to create
+    :return: list of tuples of a `StructureData` and the sorted tuple of its element symbols
+    :raises ValueError: if no elements are given
+    """
+    if not elements:
+        raise ValueError('cannot load test a family without pseudo potentials')
+
+    return [(create_structure(symbols), symbols) for symbols in generate_compositions(elements, count, seed=seed)]
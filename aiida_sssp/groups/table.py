@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""Columnar table of the recommended cutoffs of all `SsspFamily` instances, to compare families in bulk.
+
+The table holds a matrix of the wavefunction and of the density cutoffs, with a row per family and a column per element,
+such that the maximum cutoffs of every family for a composition are computed in a single vectorized reduction over the
+columns of its elements.
+"""
+import itertools
+
+import numpy
+
+from aiida_sssp.cache import get_cache_backend, query_records
+
+__all__ = ('CutoffTable', 'get_cutoff_table', 'iter_group_cutoffs')
+
+DEFAULT_BATCH_SIZE = 1000
+
+# The table of this process, together with the checksum of the snapshot from which it was built.
+_CUTOFF_TABLE = (None, None)
+
+
+class CutoffTable:
+    """Columnar table of the recommended cutoffs of families, with a row per family and a column per element.
+
+    Compositions are sets of element symbols. A family covers a composition if it contains a pseudo potential for each
+    of its elements. The cutoffs of a family for a composition are the maximum cutoffs of its elements, which are `NaN`
+    if the family does not cover the composition or does not define recommended cutoffs for all of its elements.
+    """
+
+    def __init__(self, records):
+        """Construct a new table.
+
+        :param records: iterable of `SnapshotRecord`
+        """
+        records = list(records)
+
+        self._family_uuids = sorted({record.family_uuid for record in records})
+        self._elements = sorted({record.element for record in records})
+
+        rows = {uuid: index for index, uuid in enumerate(self._family_uuids)}
+        self._columns = {element: index for index, element in enumerate(self._elements)}
+
+        shape = (len(self._family_uuids), len(self._elements))
+        self._present = numpy.zeros(shape, dtype=bool)
+        self._cutoff_wfc = numpy.full(shape, numpy.nan)
+        self._cutoff_rho = numpy.full(shape, numpy.nan)
+
+        for record in records:
+            position = (rows[record.family_uuid], self._columns[record.element])
+            self._present[position] = True
+            self._cutoff_wfc[position] = record.cutoff_wfc
+            self._cutoff_rho[position] = record.cutoff_rho
+
+    @classmethod
+    def from_database(cls):
+        """Build the table of all families from the database.
+
+        :return: instance of `CutoffTable`
+        """
+        return cls(query_records())
+
+    @property
+    def family_uuids(self):
+        """Return the UUIDs of the families in the order of the rows of the table.
+
+        :return: list of family UUIDs
+        """
+        return list(self._family_uuids)
+
+    @property
+    def elements(self):
+        """Return the element symbols in the order of the columns of the table.
+
+        :return: list of element symbols
+        """
+        return list(self._elements)
+
+    def get_mask(self, compositions):
+        """Return the boolean matrix that encodes the given compositions, with a row per composition.
+
+        :param compositions: iterable of iterables of element symbols
+        :return: tuple of the mask, of shape (compositions, elements), and a boolean array with for each composition
+            whether it contains an element that is not contained in any of the families
+        """
+        compositions = list(compositions)
+        mask = numpy.zeros((len(compositions), len(self._elements)), dtype=bool)
+        unknown = numpy.zeros(len(compositions), dtype=bool)
+
+        for row, composition in enumerate(compositions):
+            for element in composition:
+                try:
+                    mask[row, self._columns[element]] = True
+                except KeyError:
+                    unknown[row] = True
+
+        return mask, unknown
+
+    def get_cutoffs(self, compositions):
+        """Return the maximum recommended cutoffs of every family for each of the given compositions.
+
+        :param compositions: iterable of iterables of element symbols
+        :return: tuple of the wavefunction and density cutoffs, each an array of shape (compositions, families) that is
+            `NaN` where the family does not cover the composition or does not define cutoffs for all of its elements
+        """
+        mask, unknown = self.get_mask(compositions)
+
+        # A family covers a composition if none of the elements of the composition are missing from the family.
+        missing = mask.astype(numpy.int64) @ (~self._present).T.astype(numpy.int64)
+        covered = (missing == 0) & ~unknown[:, numpy.newaxis] & mask.any(axis=1)[:, numpy.newaxis]
+
+        shape = (len(mask), len(self._family_uuids))
+        cutoffs = (numpy.full(shape, numpy.nan), numpy.full(shape, numpy.nan))
+
+        # The maximum is reduced for each composition over the columns of its elements only, such that no temporary is
+        # larger than the table itself, regardless of the number of compositions. `NaN` of elements without recommended
+        # cutoffs propagate.
+        for row in numpy.flatnonzero(covered.any(axis=1)):
+            columns = numpy.flatnonzero(mask[row])
+
+            for values, result in zip((self._cutoff_wfc, self._cutoff_rho), cutoffs):
+                maximum = numpy.maximum.reduce(values[:, columns], axis=1)
+                result[row] = numpy.where(covered[row], maximum, numpy.nan)
+
+        return cutoffs
+
+    def rank(self, compositions):
+        """Rank the families by their maximum recommended cutoffs for each of the given compositions.
+
+        The families are ordered by their wavefunction cutoff first and their density cutoff second. Families that do
+        not cover a composition or do not define cutoffs for all of its elements are excluded.
+
+        :param compositions: iterable of iterables of element symbols
+        :return: list with for each composition a list of tuples of the family UUID, wavefunction and density cutoff,
+            cheapest first
+        """
+        cutoffs_wfc, cutoffs_rho = self.get_cutoffs(compositions)
+
+        # `lexsort` sorts on the last key first and places `NaN` at the end, after all valid cutoffs.
+        order = numpy.lexsort((cutoffs_rho, cutoffs_wfc), axis=-1)
+        valid = ~numpy.isnan(numpy.take_along_axis(cutoffs_wfc + cutoffs_rho, order, axis=-1))
+        ranking = []
+
+        for row, columns in enumerate(order):
+            ranking.append([(self._family_uuids[column], cutoffs_wfc[row, column], cutoffs_rho[row, column])
+                            for column in columns[valid[row]]])
+
+        return ranking
+
+    def get_cheapest(self, compositions):
+        """Return the family with the lowest maximum recommended cutoffs for each of the given compositions.
+
+        :param compositions: iterable of iterables of element symbols
+        :return: list with for each composition a tuple of the family UUID, wavefunction and density cutoff, or `None`
+            if no family covers the composition with recommended cutoffs for all of its elements
+        """
+        return [ranking[0] if ranking else None for ranking in self.rank(compositions)]
+
+
+def get_cutoff_table():
+    """Return the cutoff table of all families of the current profile.
+
+    If the configured cache backend provides a snapshot, the table is built from it and kept for as long as the snapshot
+    does not change, such that it does not access the database at all. Otherwise it is built from the database.
+
+    :return: instance of `CutoffTable`
+    """
+    global _CUTOFF_TABLE  # pylint: disable=global-statement
+
+    backend = get_cache_backend()
+    snapshot = backend.get_snapshot() if backend is not None else None
+
+    if snapshot is None:
+        return CutoffTable.from_database()
+
+    checksum, table = _CUTOFF_TABLE
+
+    if table is None or checksum != snapshot.checksum:
+        table = CutoffTable(snapshot)
+        _CUTOFF_TABLE = (snapshot.checksum, table)
+
+    return table
+
+
+def iter_group_cutoffs(group, family_uuid=None, batch_size=DEFAULT_BATCH_SIZE, table=None):
+    """Yield the recommended cutoffs of each structure in the given group.
+
+    Only the kinds of the structures are projected and they are streamed from the database in batches, for each of which
+    the cutoffs are computed in a single pass over the cutoff table, such that the memory usage is independent of the
+    number of structures in the group.
+
+    :param group: the `Group` containing the `StructureData` nodes, any other nodes are ignored
+    :param family_uuid: optional UUID of the family whose cutoffs to return, by default the cutoffs of the family with
+        the lowest cutoffs for each structure are returned
+    :param batch_size: the number of structures to fetch from the database and to process at a time
+    :param table: optional `CutoffTable` to use, by default the one returned by :py:func:`get_cutoff_table`
+    :return: generator of tuples of the pk and UUID of the structure, the UUID of the family and the wavefunction and
+        density cutoffs, where the family and cutoffs are `None` if no family covers the elements of the structure
+    :raises ValueError: if the given family does not contain any pseudo potentials
+    """
+    from aiida.orm import Group, QueryBuilder
+    from aiida.plugins import DataFactory
+
+    StructureData = DataFactory('structure')  # pylint: disable=invalid-name
+
+    table = table if table is not None else get_cutoff_table()
+
+    if family_uuid is not None:
+        try:
+            column = table.family_uuids.index(str(family_uuid))
+        except ValueError:
+            raise ValueError('the family `{}` does not contain any pseudo potentials'.format(family_uuid))
+
+    builder = QueryBuilder().append(Group, filters={'id': group.pk}, tag='group')
+    builder.append(StructureData, with_group='group', project=['id', 'uuid', 'attributes.kinds'])
+    rows = builder.iterall(batch_size=batch_size)
+
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+
+        if not batch:
+            break
+
+        compositions = [{symbol for kind in kinds for symbol in kind['symbols']} for _, _, kinds in batch]
+
+        if family_uuid is None:
+            results = table.get_cheapest(compositions)
+        else:
+            cutoffs_wfc, cutoffs_rho = table.get_cutoffs(compositions)
+            results = [(str(family_uuid), cutoff_wfc, cutoff_rho)
+                       for cutoff_wfc, cutoff_rho in zip(cutoffs_wfc[:, column], cutoffs_rho[:, column])]
+
+        for (pk, uuid, _), result in zip(batch, results):
+            if result is None or numpy.isnan(result[1] + result[2]):
+                yield pk, uuid, None, None, None
+            else:
+                yield pk, uuid, result[0], float(result[1]), float(result[2])
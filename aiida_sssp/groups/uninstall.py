@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Removal of `SsspFamily` instances together with their parameters and the pseudo potentials that became orphaned.
+
+A pseudo potential of a removed family is only deleted if it is not contained in any other group and has no links, for
+example because it was used as the input of a calculation, such that no other family or provenance is affected. All
+checks and deletions run in batched queries, such that removing many families at once takes a constant number of
+queries per batch instead of a number of queries per node.
+"""
+from aiida.orm import Group, Node, QueryBuilder
+from aiida.plugins import DataFactory
+
+from aiida_sssp.cache import invalidate_caches
+from .family import SsspFamily
+
+__all__ = ('uninstall_families',)
+
+UpfData = DataFactory('upf')
+SsspParameters = DataFactory('sssp.parameters')
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def uninstall_families(families, keep_pseudos=False, dry_run=False, batch_size=DEFAULT_BATCH_SIZE):
+    """Remove the given families, their parameters and the pseudo potentials that are no longer referenced.
+
+    :param families: list of stored `SsspFamily` instances
+    :param keep_pseudos: if `True`, the pseudo potentials are not deleted even if no longer referenced
+    :param dry_run: if `True`, determine what would be deleted without deleting anything
+    :param batch_size: the maximum number of nodes to check or delete per query
+    :return: dictionary with the number of `families`, `parameters` and `pseudos` that were deleted, the number of
+        pseudos of the families that were `kept` because they are still referenced and the number of parameters that
+        were kept as `kept_parameters` because they have links
+    """
+    from aiida.backends.utils import delete_nodes_and_connections
+    from aiida.manage.manager import get_manager
+
+    group_pks = {family.pk for family in families}
+    family_uuids = [family.uuid for family in families]
+
+    pseudo_pks = set()
+    parameters_pks = set()
+
+    for batch in _iter_batches(list(group_pks), batch_size):
+        builder = QueryBuilder().append(SsspFamily, filters={'id': {'in': batch}}, tag='group')
+        builder.append(UpfData, with_group='group', project='id')
+        pseudo_pks.update(pk for [pk] in builder.iterall())
+
+    for batch in _iter_batches(family_uuids, batch_size):
+        filters = {'attributes.{}'.format(SsspParameters.KEY_FAMILY_UUID): {'in': batch}}
+        builder = QueryBuilder().append(SsspParameters, filters=filters, project='id')
+        parameters_pks.update(pk for [pk] in builder.iterall())
+
+    if keep_pseudos:
+        orphans = set()
+    else:
+        orphans = pseudo_pks - _get_grouped(pseudo_pks, group_pks, batch_size) - _get_linked(pseudo_pks, batch_size)
+
+    # Parameters with links are part of the provenance and are therefore kept, even though their family is removed.
+    kept_parameters = _get_linked(parameters_pks, batch_size)
+    parameters_pks -= kept_parameters
+
+    result = {
+        'families': len(group_pks),
+        'parameters': len(parameters_pks),
+        'pseudos': len(orphans),
+        'kept': len(pseudo_pks) - len(orphans),
+        'kept_parameters': len(kept_parameters),
+    }
+
+    if dry_run:
+        return result
+
+    with get_manager().get_backend().transaction():
+        # The groups are deleted first, which removes their memberships, such that the orphans are no longer referenced.
+        for pk in group_pks:
+            Group.objects.delete(pk)
+
+        for batch in _iter_batches(list(orphans | parameters_pks), batch_size):
+            delete_nodes_and_connections(batch)
+
+    for uuid in family_uuids:
+        invalidate_caches(uuid)
+
+    return result
+
+
+def _get_grouped(pks, excluded_group_pks, batch_size):
+    """Return those of the given nodes that are contained in any group other than the excluded groups.
+
+    :param pks: set of node pks
+    :param excluded_group_pks: set of group pks whose memberships are ignored
+    :param batch_size: the maximum number of nodes to check per query
+    :return: set of node pks
+    """
+    grouped = set()
+
+    for batch in _iter_batches(list(pks), batch_size):
+        builder = QueryBuilder().append(Node, filters={'id': {'in': batch}}, project='id', tag='node')
+        builder.append(Group, with_node='node', filters={'id': {'!in': list(excluded_group_pks)}})
+        grouped.update(pk for [pk] in builder.iterall())
+
+    return grouped
+
+
+def _get_linked(pks, batch_size):
+    """Return those of the given nodes that have any incoming or outgoing link.
+
+    :param pks: set of node pks
+    :param batch_size: the maximum number of nodes to check per query
+    :return: set of node pks
+    """
+    linked = set()
+
+    for batch in _iter_batches(list(pks), batch_size):
+        for relationship in ('with_incoming', 'with_outgoing'):
+            builder = QueryBuilder().append(Node, filters={'id': {'in': batch}}, project='id', tag='node')
+            builder.append(Node, **{relationship: 'node'})
+            linked.update(pk for [pk] in builder.iterall())
+
+    return linked
+
+
+def _iter_batches(values, batch_size):
+    """Yield consecutive slices of the given list with at most `batch_size` values each."""
+    for index in range(0, len(values), batch_size):
+        yield values[index:index + batch_size]
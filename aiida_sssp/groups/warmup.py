@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""Warm-up of the caches of a process for the families that are configured for the current profile.
+
+After a restart of the daemon, every worker starts with cold caches, such that the first workchains that look up
+pseudo potentials or cutoffs all load the snapshot of the cache backend and build the element index and the cutoff table
+at the same time. The warm-up does this once, before the lookups need it, and optionally materializes the pseudo
+potentials of the configured families in the persistent pseudo store, such that staging them does not have to copy them
+out of the repository.
+
+The warm-up is configured per profile with :py:func:`set_warm_up`. Since there is no hook into the start of a daemon
+worker, processes opt in through the `AIIDA_SSSP_WARMUP` environment variable, which daemon workers inherit from the
+command that starts the daemon, for example `AIIDA_SSSP_WARMUP=1 verdi daemon start`. In those processes the warm-up is
+started by :py:func:`start_warm_up` the first time a `SsspFamily` is loaded, in a background thread, such that it delays
+neither the start of the worker nor the lookup that triggered it. Other processes, such as interactive shells and
+commands, are not affected, but can still call :py:func:`start_warm_up` or :py:func:`warm_up` explicitly.
+"""
+import os
+import threading
+import time
+import warnings
+
+from aiida.orm import QueryBuilder
+
+from aiida_sssp.cache import get_cache_backend, get_option, release_connection, set_option, unset_option
+
+__all__ = ('get_warm_up', 'is_warm_up_requested', 'set_warm_up', 'start_warm_up', 'warm_up')
+
+OPTION_WARMUP = 'warmup'
+ENV_WARMUP = 'AIIDA_SSSP_WARMUP'
+
+# The threads of the warm-ups that were started in this process, indexed on the name of the profile, or `None` for
+# profiles for which no warm-up is configured.
+_WARM_UPS = {}
+_LOCK = threading.Lock()
+
+
+def get_warm_up():
+    """Return the warm-up that is configured for the current profile.
+
+    :return: dictionary with the list of labels of the `families` and the boolean `pseudos`, or `None` if no warm-up is
+        configured
+    """
+    return get_option(OPTION_WARMUP, None)
+
+
+def is_warm_up_requested():
+    """Return whether this process opted in to starting the configured warm-up automatically.
+
+    :return: boolean, True if the `AIIDA_SSSP_WARMUP` environment variable is set to a value other than `0`
+    """
+    return os.environ.get(ENV_WARMUP, '') not in ('', '0')
+
+
+def set_warm_up(families, pseudos=False):
+    """Configure the warm-up of the current profile.
+
+    Running daemon workers have to be restarted for a change to take effect, and only those that were started with the
+    `AIIDA_SSSP_WARMUP` environment variable run it.
+
+    :param families: list of labels of families, if empty the warm-up is disabled
+    :param pseudos: boolean, if True, the pseudo potentials of the families are materialized in the pseudo store
+    """
+    if not families:
+        unset_option(OPTION_WARMUP)
+    else:
+        set_option(OPTION_WARMUP, {'families': sorted(families), 'pseudos': pseudos})
+
+
+def warm_up(families, pseudos=False):
+    """Warm up the caches of this process for the given families.
+
+    The snapshot of the configured cache backend is loaded and the element index and cutoff table are built from it. If
+    the backend is the snapshot file and it does not exist, because it was never written or it was invalidated by a
+    change to a family, it is written first, since otherwise the index and table would have to be rebuilt from the
+    database for every lookup. Families that are not contained in the snapshot, or all families if no backend is
+    configured, are still looked up in the database.
+
+    :param families: list of labels of families
+    :param pseudos: boolean, if True, the pseudo potentials of the families are materialized in the pseudo store
+    :return: dictionary with the number of `families` that were found, the sorted labels of those that are `missing`
+        and of those that are `uncached` because they are not in the snapshot, the number of `pseudos` that were staged
+        and the number of `seconds` that the warm-up took
+    """
+    from aiida_sssp.cache import SnapshotCacheBackend, write_snapshot
+
+    from .family import SsspFamily
+    from .index import get_element_index
+    from .table import get_cutoff_table
+
+    start = time.perf_counter()
+
+    if families:
+        builder = QueryBuilder().append(SsspFamily, filters={'label': {'in': list(families)}})
+        found = [family for [family] in builder.iterall()]
+    else:
+        found = []
+
+    backend = get_cache_backend()
+    snapshot = backend.get_snapshot() if backend is not None else None
+
+    if snapshot is None and isinstance(backend, SnapshotCacheBackend):
+        snapshot = write_snapshot()
+
+    if snapshot is not None:
+        get_element_index()
+        get_cutoff_table()
+
+    staged = 0
+
+    if pseudos:
+        for family in found:
+            staged += len(family.stage_pseudos())
+
+    return {
+        'families': len(found),
+        'missing': sorted(set(families).difference(family.label for family in found)),
+        'uncached': sorted(family.label for family in found if snapshot is None or family.uuid not in snapshot),
+        'pseudos': staged,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def start_warm_up():
+    """Start the warm-up that is configured for the current profile in a background thread.
+
+    The configuration is only read the first time this is called in a process, after which this merely returns the
+    thread that was started. `SsspFamily` calls this whenever a family is loaded in a process for which
+    :py:func:`is_warm_up_requested` is True, but it can also be called explicitly, for example by a start-up script.
+
+    :return: the `threading.Thread` that runs the warm-up, or `None` if no warm-up is configured
+    """
+    from aiida.manage.configuration import get_profile
+
+    profile = get_profile()
+
+    with _LOCK:
+        try:
+            return _WARM_UPS[profile.name]
+        except KeyError:
+            pass
+
+        config = get_warm_up()
+
+        if not config:
+            _WARM_UPS[profile.name] = None
+            return None
+
+        thread = threading.Thread(target=_run_warm_up, args=(config,), name='sssp-warmup', daemon=True)
+        _WARM_UPS[profile.name] = thread
+        thread.start()
+
+    return thread
+
+
+def _run_warm_up(config):
+    """Run the warm-up with the given configuration and release the database connection of the thread afterwards.
+
+    :param config: the configuration as returned by `get_warm_up`
+    """
+    try:
+        warm_up(config.get('families', []), config.get('pseudos', False))
+    except Exception as exception:  # pylint: disable=broad-except
+        warnings.warn('the warm-up of the SSSP families failed: {}'.format(exception))
+    finally:
+        release_connection()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument,redefined-outer-name
+"""Tests for the `aiida_sssp.cache.shared` module."""
+import pytest
+
+from aiida import orm
+
+from aiida_sssp.cache import SharedFamilyCache
+
+
+@pytest.fixture
+def shared_cache(tmp_path):
+    """Return a `SharedFamilyCache` whose files are written to a temporary directory."""
+    cache = SharedFamilyCache(dirpath=str(tmp_path))
+    yield cache
+    cache.close()
+
+
+def test_get_snapshot(clear_db, shared_cache, create_sssp_family, create_sssp_parameters):
+    """Test that `SharedFamilyCache.get_snapshot` builds the snapshot once per generation."""
+    family = create_sssp_family()
+    create_sssp_parameters(uuid=family.uuid).store()
+
+    assert shared_cache.generation == 0
+
+    snapshot = shared_cache.get_snapshot()
+    assert snapshot.family_uuids == {family.uuid}
+    assert shared_cache.get_snapshot() is snapshot
+    assert snapshot.get_record(family.uuid, 'Ar').cutoff_wfc == family.get_cutoffs(elements='Ar')[0]
+
+
+def test_invalidate(clear_db, shared_cache, tmp_path, create_sssp_family):
+    """Test that invalidating the cache from another instance is seen by all instances."""
+    other = SharedFamilyCache(dirpath=str(tmp_path))
+    family = create_sssp_family()
+
+    snapshot = shared_cache.get_snapshot()
+    assert other.get_snapshot().checksum == snapshot.checksum
+
+    family_other = create_sssp_family(label='SSSP/1.0/PBE/efficiency')
+    other.invalidate()
+
+    assert shared_cache.generation == 1
+    assert shared_cache.get_snapshot().family_uuids == {family.uuid, family_other.uuid}
+    assert len(list(tmp_path.glob('*.data'))) == 1
+    other.close()
+
+
+def test_invalidate_unused(clear_db, shared_cache, tmp_path):
+    """Test that invalidating a cache that was never used does not create any files."""
+    shared_cache.invalidate()
+    assert not list(tmp_path.iterdir())
+
+
+def test_family_lookups(clear_db, shared_cache, monkeypatch, create_sssp_family, create_sssp_parameters):
+    """Test that an `SsspFamily` answers lookups from the shared cache when it is the configured backend."""
+    from aiida.manage.configuration import get_profile
+
+    from aiida_sssp.cache import override_cache_backend
+    from aiida_sssp.cache import shared
+
+    monkeypatch.setattr(shared, '_SHARED_CACHES', {get_profile().name: shared_cache})
+
+    family = create_sssp_family()
+    parameters = create_sssp_parameters(uuid=family.uuid).store()
+
+    with override_cache_backend('shared'):
+        loaded = orm.load_group(family.pk)
+        expected = parameters.get_attribute('Ne')
+        assert loaded.get_cutoffs(elements=('He', 'Ne')) == (expected['cutoff_wfc'], expected['cutoff_rho'])
+        assert loaded.get_pseudo_uuid('Ar') == family.get_pseudo('Ar').uuid
+        assert loaded._parameters is None  # pylint: disable=protected-access
+
+    assert shared_cache.get_snapshot().family_uuids == {family.uuid}
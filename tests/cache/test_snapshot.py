@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument
+"""Tests for the `aiida_sssp.cache.snapshot` module."""
+import math
+import os
+
+import pytest
+
+from aiida_sssp.cache import SsspSnapshot, SnapshotRecord, get_snapshot, invalidate_snapshot, write_snapshot
+
+
+@pytest.fixture
+def snapshot_records(uuid):
+    """Return a list of `SnapshotRecord` for a single family."""
+    return [
+        SnapshotRecord(str(uuid), 'He', 'a' * 36, '1' * 32, 'He.upf', 20., 80.),
+        SnapshotRecord(str(uuid), 'H', 'b' * 36, '2' * 32, 'H.upf', 30., float('nan')),
+    ]
+
+
+def test_from_records(snapshot_records, uuid):
+    """Test constructing a `SsspSnapshot` from records and looking them up."""
+    snapshot = SsspSnapshot.from_records(snapshot_records)
+
+    assert len(snapshot) == 2
+    assert uuid in snapshot
+    assert 'c' * 36 not in snapshot
+    assert snapshot.family_uuids == {str(uuid)}
+    assert snapshot.get_record(uuid, 'He') == snapshot_records[0]
+    assert [record.element for record in snapshot.get_records(uuid)] == ['H', 'He']
+    assert math.isnan(snapshot.get_record(uuid, 'H').cutoff_rho)
+
+    with pytest.raises(KeyError):
+        snapshot.get_record(uuid, 'Ne')
+
+
+def test_invalid_content(snapshot_records):
+    """Test that invalid or corrupt content raises a `ValueError`."""
+    content = SsspSnapshot.serialize(snapshot_records)
+
+    with pytest.raises(ValueError, match=r'is not a snapshot'):
+        SsspSnapshot(b'X' + content[1:])
+
+    with pytest.raises(ValueError, match=r'is truncated'):
+        SsspSnapshot(content[:-1])
+
+    with pytest.raises(ValueError, match=r'checksum'):
+        SsspSnapshot(content[:-1] + b'X')
+
+    record = snapshot_records[0]._replace(filename='a' * 129)
+
+    with pytest.raises(ValueError, match=r'filename .* is too long'):
+        SsspSnapshot.serialize([record])
+
+    record = snapshot_records[0]._replace(element='Uuo')
+
+    with pytest.raises(ValueError, match=r'element `Uuo` is too long'):
+        SsspSnapshot.serialize([record])
+
+
+def test_write_snapshot(clear_db, create_sssp_family, create_sssp_parameters, tmp_path):
+    """Test the `write_snapshot` and `get_snapshot` functions."""
+    filepath = str(tmp_path / 'snapshot')
+    family = create_sssp_family()
+    create_sssp_parameters(uuid=family.uuid).store()
+
+    assert get_snapshot(filepath) is None
+
+    snapshot = write_snapshot(filepath)
+    assert get_snapshot(filepath) is snapshot
+    assert snapshot.family_uuids == {family.uuid}
+
+    for element in family.elements:
+        record = snapshot.get_record(family.uuid, element)
+        assert record.uuid == family.get_pseudo(element).uuid
+        assert record.md5 == family.get_pseudo(element).md5sum
+        assert (record.cutoff_wfc, record.cutoff_rho) == family.get_cutoffs(elements=element)
+
+    invalidate_snapshot(filepath)
+    assert not os.path.exists(filepath)
+    assert get_snapshot(filepath) is None
+
+
+def test_write_snapshot_invalid(snapshot_records, tmp_path, monkeypatch):
+    """Test that `write_snapshot` raises instead of truncating elements that do not fit the records."""
+    from aiida_sssp.cache import snapshot as module
+
+    filepath = str(tmp_path / 'snapshot')
+    records = snapshot_records + [snapshot_records[0]._replace(element='Uuo')]
+    monkeypatch.setattr(module, 'query_records', lambda: records)
+
+    with pytest.raises(ValueError, match=r'element `Uuo` is too long'):
+        write_snapshot(filepath)
+
+    assert os.listdir(str(tmp_path)) == []
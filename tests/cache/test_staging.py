@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument,redefined-outer-name
+"""Tests for the `aiida_sssp.cache.staging` module."""
+import os
+
+import pytest
+
+from aiida_sssp.cache import PseudoStore
+
+
+@pytest.fixture
+def pseudo_store(tmp_path):
+    """Return a `PseudoStore` in a temporary directory."""
+    return PseudoStore(str(tmp_path / 'store'))
+
+
+def test_materialize(clear_db, pseudo_store, get_upf_data):
+    """Test the `PseudoStore.materialize` method."""
+    pseudo = get_upf_data(element='He').store()
+
+    assert not pseudo_store.contains(pseudo.md5sum)
+
+    filepath = pseudo_store.materialize(pseudo)
+    assert filepath == pseudo_store.get_filepath(pseudo.md5sum)
+    assert pseudo_store.contains(pseudo.md5sum)
+    assert not os.access(filepath, os.W_OK)
+
+    with open(filepath) as handle:
+        assert handle.read() == pseudo.get_content()
+
+    # Materializing again should be a no-op
+    assert pseudo_store.materialize(pseudo) == filepath
+
+
+def test_link(clear_db, pseudo_store, get_upf_data, tmp_path):
+    """Test the `PseudoStore.link` method."""
+    pseudo = get_upf_data(element='He').store()
+    filepath_store = pseudo_store.materialize(pseudo)
+
+    with pytest.raises(FileNotFoundError):
+        pseudo_store.link('0' * 32, str(tmp_path / 'missing.upf'))
+
+    with pytest.raises(ValueError):
+        pseudo_store.link(pseudo.md5sum, str(tmp_path / 'He.upf'), link='copy')
+
+    filepath = pseudo_store.link(pseudo.md5sum, str(tmp_path / 'He.upf'))
+    assert os.path.samefile(filepath, filepath_store)
+    assert not os.path.islink(filepath)
+
+    # Linking onto an existing file should replace it
+    filepath = pseudo_store.link(pseudo.md5sum, str(tmp_path / 'He.upf'), link='symlink')
+    assert os.path.islink(filepath)
+    assert os.readlink(filepath) == filepath_store
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument
+"""Tests for the commands `aiida-sssp export` and `aiida-sssp import`."""
+from aiida import orm
+from aiida_sssp.cli import cmd_export, cmd_import
+
+
+def test_export_import(clear_db, run_cli_command, create_sssp_family, tmp_path):
+    """Test exporting a family and importing it again under another label."""
+    family = create_sssp_family()
+    filepath = str(tmp_path / 'bundle.tar.gz')
+
+    result = run_cli_command(cmd_export, [family.label, filepath])
+    assert 'exported `{}`'.format(family.label) in result.output
+
+    result = run_cli_command(cmd_export, [family.label, filepath], raises=SystemExit)
+    assert 'already exists' in result.output
+
+    result = run_cli_command(cmd_import, [filepath], raises=SystemExit)
+    assert 'already exists' in result.output
+
+    result = run_cli_command(cmd_import, [filepath, '--label', 'SSSP/imported'])
+    assert 'imported `SSSP/imported` containing 3 pseudo potentials' in result.output
+    assert {node.uuid for node in orm.load_group('SSSP/imported').nodes} == {node.uuid for node in family.nodes}
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument
+"""Tests for the command `aiida-sssp cache`."""
+from aiida_sssp.cache import get_snapshot, invalidate_snapshot
+from aiida_sssp.cli import cmd_cache
+
+
+def test_cache_snapshot(clear_db, run_cli_command, create_sssp_family, tmp_path):
+    """Test the `aiida-sssp cache snapshot` command."""
+    family = create_sssp_family()
+    filepath = str(tmp_path / 'snapshot')
+
+    result = run_cli_command(cmd_cache, ['snapshot', '--output', filepath])
+    assert 'wrote snapshot with checksum' in result.output
+    assert get_snapshot(filepath).family_uuids == {family.uuid}
+
+
+def test_cache_backend(clear_db, run_cli_command):
+    """Test the `aiida-sssp cache backend` command."""
+    from aiida_sssp.cache.backends import SharedMemoryCacheBackend, get_cache_backend
+
+    result = run_cli_command(cmd_cache, ['backend'])
+    assert result.output_lines == ['snapshot']
+
+    try:
+        run_cli_command(cmd_cache, ['backend', 'shared'])
+        assert run_cli_command(cmd_cache, ['backend']).output_lines == ['shared']
+        assert isinstance(get_cache_backend(), SharedMemoryCacheBackend)
+
+        run_cli_command(cmd_cache, ['backend', 'none'])
+        assert get_cache_backend() is None
+
+        run_cli_command(cmd_cache, ['backend', 'invalid'], raises=SystemExit)
+    finally:
+        run_cli_command(cmd_cache, ['backend', 'snapshot'])
+
+
+def test_cache_warmup(clear_db, run_cli_command, create_sssp_family):
+    """Test the `aiida-sssp cache warmup` command."""
+    family = create_sssp_family()
+
+    result = run_cli_command(cmd_cache, ['warmup'])
+    assert 'no warm-up is configured' in result.output
+    run_cli_command(cmd_cache, ['warmup', '--now'], raises=SystemExit)
+
+    try:
+        run_cli_command(cmd_cache, ['warmup', family.label, '--reset'], raises=SystemExit)
+        run_cli_command(cmd_cache, ['warmup', family.label, '--pseudos'])
+
+        result = run_cli_command(cmd_cache, ['warmup'])
+        assert family.label in result.output_lines
+        assert 'the pseudos are materialized' in result.output
+
+        result = run_cli_command(cmd_cache, ['warmup', '--now'])
+        assert 'warmed up 1 families and staged {} pseudos'.format(family.count()) in result.output
+    finally:
+        run_cli_command(cmd_cache, ['warmup', '--reset'])
+        invalidate_snapshot()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument,redefined-outer-name
+"""Tests for the command `aiida-sssp cutoffs`."""
+import json
+
+import pytest
+
+from aiida_sssp.cli import cmd_cutoffs
+
+
+@pytest.fixture
+def group_structures(create_structure):
+    """Return a stored group with a structure covered by the test family and one that is not."""
+    from aiida.orm import Group
+
+    group = Group('structures').store()
+    group.add_nodes([create_structure(elements).store() for elements in (['Ar', 'He'], ['Xe'])])
+
+    return group
+
+
+def test_cutoffs_not_installed(clear_db, run_cli_command, group_structures):
+    """Test the `aiida-sssp cutoffs` command without any installed family."""
+    result = run_cli_command(cmd_cutoffs, ['-G', group_structures.label], raises=SystemExit)
+    assert 'SSSP has not yet been installed' in result.output
+
+
+def test_cutoffs(clear_db, run_cli_command, create_sssp_family, create_sssp_parameters, group_structures):
+    """Test the `aiida-sssp cutoffs` command."""
+    family = create_sssp_family()
+    create_sssp_parameters(uuid=family.uuid).store()
+    structure_covered, structure_missing = sorted(group_structures.nodes, key=lambda node: node.pk)
+
+    result = run_cli_command(cmd_cutoffs, ['-G', group_structures.label])
+    assert result.output_lines[0] == 'pk,uuid,family,cutoff_wfc,cutoff_rho'
+    assert sorted(result.output_lines[1:]) == [
+        '{},{},{},20.0,80.0'.format(structure_covered.pk, structure_covered.uuid, family.label),
+        '{},{},,,'.format(structure_missing.pk, structure_missing.uuid),
+    ]
+
+    options = ['-G', group_structures.label, '-F', family.label, '--format', 'jsonl', '--batch-size', '1']
+    result = run_cli_command(cmd_cutoffs, options)
+    rows = sorted((json.loads(line) for line in result.output_lines), key=lambda row: row['pk'])
+    assert rows == [
+        {
+            'pk': structure_covered.pk,
+            'uuid': structure_covered.uuid,
+            'family': family.label,
+            'cutoff_wfc': 20.,
+            'cutoff_rho': 80.
+        },
+        {
+            'pk': structure_missing.pk,
+            'uuid': structure_missing.uuid,
+            'family': None,
+            'cutoff_wfc': None,
+            'cutoff_rho': None
+        },
+    ]
+
+
+def test_cutoffs_output(clear_db, run_cli_command, create_sssp_family, group_structures, tmp_path):
+    """Test the `-o/--output` option."""
+    create_sssp_family()
+    filepath = tmp_path / 'cutoffs.csv'
+
+    result = run_cli_command(cmd_cutoffs, ['-G', group_structures.label, '-o', str(filepath)])
+    assert result.output == ''
+    assert len(filepath.read_text().splitlines()) == 3
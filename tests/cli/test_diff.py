@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument
+"""Tests for the command `aiida-sssp diff`."""
+import copy
+import json
+
+from aiida_sssp.cli import cmd_diff
+
+
+def test_diff(clear_db, run_cli_command, create_sssp_family, create_sssp_parameters, sssp_parameter_metadata):
+    """Test the `aiida-sssp diff` command."""
+    source = create_sssp_family()
+    target = create_sssp_family(label='SSSP/target')
+
+    parameters = copy.deepcopy(sssp_parameter_metadata)
+    parameters['He']['cutoff_rho'] = 100.
+
+    create_sssp_parameters(uuid=source.uuid).store()
+    create_sssp_parameters(parameters, uuid=target.uuid).store()
+
+    result = run_cli_command(cmd_diff, [source.label, target.label])
+    assert any(line.startswith('~') and '100.0 (+20.0)' in line for line in result.output_lines)
+    assert result.output_lines[-1] == '0 added, 0 removed, 1 changed and 2 unchanged pseudos from {} to {}'.format(
+        source.label, target.label
+    )
+
+    result = run_cli_command(cmd_diff, [source.label, target.label, '--format', 'json'])
+    diff = json.loads(result.output)
+    assert diff['changed'][0]['element'] == 'He'
+    assert diff['changed'][0]['delta_rho'] == 20.
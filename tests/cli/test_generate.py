@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument
+"""Tests for the command `aiida-sssp generate`."""
+import os
+
+from aiida import orm
+
+from aiida_sssp.cli import cmd_generate
+from aiida_sssp.groups import SsspFamily
+
+
+def test_generate_files(run_cli_command, tmp_path):
+    """Test the `aiida-sssp generate files` command."""
+    run_cli_command(cmd_generate, ['files', str(tmp_path), '--num-elements', '4', '--archive-format', 'gztar'])
+    assert sorted(os.listdir(str(tmp_path))) == ['parameters.json', 'pseudos.tar.gz']
+
+    run_cli_command(cmd_generate, ['files', str(tmp_path), '--num-elements', '1000'], raises=SystemExit)
+
+
+def test_generate_families(clear_db, run_cli_command):
+    """Test the `aiida-sssp generate families` command."""
+    result = run_cli_command(
+        cmd_generate, ['families', '--count', '2', '--num-elements', '5', '--label-prefix', 'test']
+    )
+    assert 'installed 2 families of 5 elements' in result.output
+
+    for label in ('test/0', 'test/1'):
+        family = SsspFamily.objects.get(label=label)
+        assert family.count() == 5
+        assert family.get_cutoffs(elements=('H', 'He'))
+
+    run_cli_command(cmd_generate, ['families', '--label-prefix', 'test'], raises=SystemExit)
+
+
+def test_generate_structures(clear_db, run_cli_command, create_synthetic_family):
+    """Test the `aiida-sssp generate structures` command."""
+    family = create_synthetic_family(elements=6)
+    group = orm.Group(label='structures').store()
+
+    options = ['structures', '-G', group.label, '-F', family.label, '--count', '25', '--batch-size', '10']
+    result = run_cli_command(cmd_generate, options)
+    assert 'stored 25 structures' in result.output
+    assert group.count() == 25
+
+    for node in group.nodes:
+        assert set(node.get_kind_names()).issubset(family.elements)
@@ -26,3 +26,105 @@ def test_install(clear_db, run_cli_command):
 
     result = run_cli_command(cmd_install, raises=SystemExit)
     assert 'is already installed' in result.output
+
+
+def test_install_mirrors(clear_db, run_cli_command, http_server, sssp_mirror):
+    """Test the `aiida-sssp install` command failing over from an unhealthy mirror to a local directory."""
+    from aiida_sssp.groups import SsspFamily
+
+    options = ['--mirror', http_server.url, '--mirror', sssp_mirror]
+    result = run_cli_command(cmd_install, options)
+    assert 'installed `SSSP/1.1/PBE/efficiency`' in result.output
+
+    family = orm.QueryBuilder().append(SsspFamily).one()[0]
+    assert family.count() == 3
+    assert family.get_parameters_node().family_uuid == family.uuid
+
+
+def test_install_checksum(clear_db, run_cli_command, sssp_mirror):
+    """Test that the `aiida-sssp install` command verifies the downloaded files against the published checksums."""
+    import os
+
+    from aiida.common.files import md5_file
+
+    filepath_archive = os.path.join(sssp_mirror, 'SSSP_1.1_PBE_efficiency.tar.gz')
+
+    with open(filepath_archive + '.md5', 'w') as handle:
+        handle.write('{}  SSSP_1.1_PBE_efficiency.tar.gz\n'.format('0' * 32))
+
+    result = run_cli_command(cmd_install, ['--mirror', sssp_mirror], raises=SystemExit)
+    assert 'checksum' in result.output
+
+    with open(filepath_archive + '.md5', 'w') as handle:
+        handle.write('{}  SSSP_1.1_PBE_efficiency.tar.gz\n'.format(md5_file(filepath_archive)))
+
+    result = run_cli_command(cmd_install, ['--mirror', sssp_mirror])
+    assert 'installed `SSSP/1.1/PBE/efficiency`' in result.output
+
+
+def test_install_archive(clear_db, run_cli_command, sssp_mirror):
+    """Test the `aiida-sssp install` command from a local archive and metadata file."""
+    import os
+
+    from aiida_sssp.groups import SsspFamily
+
+    filepath_archive = os.path.join(sssp_mirror, 'SSSP_1.1_PBE_efficiency.tar.gz')
+    filepath_metadata = os.path.join(sssp_mirror, 'SSSP_1.1_PBE_efficiency.json')
+
+    result = run_cli_command(cmd_install, ['--archive', filepath_archive], raises=SystemExit)
+    assert 'have to be specified together' in result.output
+
+    options = ['--archive', filepath_archive, '--metadata', filepath_metadata, '--mirror', sssp_mirror]
+    result = run_cli_command(cmd_install, options, raises=SystemExit)
+    assert 'mutually exclusive' in result.output
+
+    options = ['-p', 'precision', '--archive', filepath_archive, '--metadata', filepath_metadata]
+    result = run_cli_command(cmd_install, options)
+    assert 'installed `SSSP/1.1/PBE/precision`' in result.output
+
+    family = orm.QueryBuilder().append(SsspFamily).one()[0]
+    assert family.count() == 3
+    assert 'Archive pseudos md5: ' in family.description
+
+
+def test_install_directory(clear_db, run_cli_command, sssp_mirror):
+    """Test the `aiida-sssp install` command from a directory with multiple configurations."""
+    import os
+    import shutil
+
+    for extension in ['.tar.gz', '.json']:
+        source = os.path.join(sssp_mirror, 'SSSP_1.1_PBE_efficiency' + extension)
+        shutil.copyfile(source, os.path.join(sssp_mirror, 'SSSP_1.1_PBE_precision' + extension))
+
+    result = run_cli_command(cmd_install, ['--directory', sssp_mirror])
+    assert 'installed `SSSP/1.1/PBE/efficiency`' in result.output
+    assert 'installed `SSSP/1.1/PBE/precision`' in result.output
+
+    # The pseudos are shared between both configurations and should only have been stored once
+    assert orm.QueryBuilder().append(orm.UpfData).count() == 3
+
+    result = run_cli_command(cmd_install, ['--directory', sssp_mirror])
+    assert result.output.count('already installed') == 2
+
+    result = run_cli_command(cmd_install, ['--directory', os.path.dirname(sssp_mirror)], raises=SystemExit)
+    assert 'no SSSP configurations found' in result.output
+
+
+def test_install_summary(clear_db, run_cli_command, sssp_mirror):
+    """Test the `--summary` option of the `aiida-sssp install` command."""
+    import json
+
+    result = run_cli_command(cmd_install, ['--mirror', sssp_mirror, '--summary', 'json'])
+    summary = json.loads(result.output[result.output.index('{'):])
+    phases = {phase['name']: phase for phase in summary['phases']}
+
+    assert list(phases) == ['probe mirrors', 'download archive', 'download metadata', 'parse pseudos', 'store nodes']
+    assert phases['parse pseudos']['count'] == 3
+    assert phases['store nodes']['count'] == 3
+    assert phases['download archive']['count'] == phases['download archive']['total'] > 0
+
+    orm.Group.objects.delete(orm.load_group('SSSP/1.1/PBE/efficiency').pk)
+
+    result = run_cli_command(cmd_install, ['--mirror', sssp_mirror, '--summary', 'text'])
+    assert result.output_lines[-1].startswith('total')
+    assert any(line.startswith('store nodes') and '0 nodes of 0 nodes' in line for line in result.output_lines)
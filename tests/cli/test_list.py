@@ -56,3 +56,25 @@ def test_list_filter(clear_db, run_cli_command, create_sssp_family):
     ]:
         result = run_cli_command(cmd_list, ['--raw'] + list(options))
         assert len(result.output_lines) == 1
+
+
+def test_list_elements(clear_db, run_cli_command, create_sssp_family, create_sssp_parameters, create_structure):
+    """Test the `-e/--elements` and `-S/--structure` options."""
+    family = create_sssp_family()
+    create_sssp_parameters(uuid=family.uuid).store()
+
+    result = run_cli_command(cmd_list, ['--raw', '-e', 'Ar', 'He'])
+    assert result.output_lines == ['{} 1.1 PBE efficiency 3 20.0 80.0'.format(family.label)]
+
+    structure = create_structure(['Ne']).store()
+    result = run_cli_command(cmd_list, ['--raw', '-S', str(structure.pk), '-P', 'label', 'cutoff_rho'])
+    assert result.output_lines == ['{} 240.0'.format(family.label)]
+
+    result = run_cli_command(cmd_list, ['--raw', '-P', 'label', 'cutoff_wfc'])
+    assert result.output_lines == ['{} 30.0'.format(family.label)]
+
+    result = run_cli_command(cmd_list, ['-e', 'Ar', 'Xe'])
+    assert 'no SSSP family contains all of the elements: Ar, Xe' in result.output
+
+    result = run_cli_command(cmd_list, ['-e', 'Ar', '-S', str(structure.pk)], raises=SystemExit)
+    assert 'mutually exclusive' in result.output
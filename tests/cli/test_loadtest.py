@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument
+"""Tests for the command `aiida-sssp loadtest`."""
+import json
+
+from aiida_sssp.cli import cmd_loadtest
+
+
+def test_loadtest(clear_db, run_cli_command, create_sssp_family):
+    """Test the `aiida-sssp loadtest` command."""
+    run_cli_command(cmd_loadtest, [], raises=SystemExit)
+
+    family = create_sssp_family()
+    options = [
+        family.label, '--workers', '2', '--requests', '10', '--operation', 'get_pseudo', '--cache-backend', 'none'
+    ]
+
+    result = run_cli_command(cmd_loadtest, options)
+    assert 'get_pseudo' in result.output
+    assert '20 calls by 2 workers in 1 processes' in result.output
+
+    result = run_cli_command(cmd_loadtest, options + ['--json'])
+    summary = json.loads(result.output)
+    assert summary['count'] == 20
+    assert summary['operations']['get_pseudo']['errors'] == 0
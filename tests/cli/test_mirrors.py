@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument
+"""Tests for the command `aiida-sssp mirrors`."""
+from aiida_sssp.cli import cmd_mirrors
+from aiida_sssp.cli.install import URL_BASE
+
+
+def test_mirrors(clear_db, run_cli_command, http_server, sssp_mirror):
+    """Test the `aiida-sssp mirrors` command."""
+    result = run_cli_command(cmd_mirrors)
+    assert result.output_lines == [URL_BASE]
+
+    result = run_cli_command(cmd_mirrors, [http_server.url, sssp_mirror])
+    assert result.output_lines[-2:] == [http_server.url, sssp_mirror]
+
+    result = run_cli_command(cmd_mirrors, ['--probe'])
+    assert result.output_lines[0].endswith(sssp_mirror)
+    assert result.output_lines[1] == 'unavailable  {}'.format(http_server.url)
+
+    result = run_cli_command(cmd_mirrors, ['--reset'])
+    assert result.output_lines[-1] == URL_BASE
+
+    result = run_cli_command(cmd_mirrors, ['--reset', sssp_mirror], raises=SystemExit)
+    assert 'cannot specify both' in result.output
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument
+"""Tests for the command `aiida-sssp stage`."""
+import os
+
+from aiida_sssp.cli import cmd_stage
+
+
+def test_stage(clear_db, run_cli_command, create_sssp_family):
+    """Test the `aiida-sssp stage` command."""
+    family = create_sssp_family()
+
+    result = run_cli_command(cmd_stage, ['--raw', family.label])
+    assert len(result.output_lines) == len(family.elements)
+
+
+def test_stage_target(clear_db, run_cli_command, create_sssp_family, create_structure, tmp_path):
+    """Test the `-t/--target` option in combination with the filter options."""
+    family = create_sssp_family()
+    structure = create_structure(site_kind_names=['Ar', 'He']).store()
+
+    run_cli_command(cmd_stage, ['-S', str(structure.pk), '-t', str(tmp_path), family.label])
+    assert sorted(os.listdir(str(tmp_path))) == ['Ar.upf', 'He.upf']
+
+    run_cli_command(cmd_stage, ['-e', 'Ne', '--symlink', '-t', str(tmp_path), family.label])
+    assert os.path.islink(str(tmp_path / 'Ne.upf'))
+
+    result = run_cli_command(cmd_stage, ['-e', 'Ne', '-S', str(structure.pk), family.label], raises=SystemExit)
+    assert 'mutually exclusive' in result.output
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument
+"""Tests for the command `aiida-sssp uninstall`."""
+from aiida import orm
+
+from aiida_sssp.cli import cmd_uninstall
+from aiida_sssp.groups import SsspFamily
+
+
+def test_uninstall(clear_db, run_cli_command, create_sssp_family):
+    """Test the `aiida-sssp uninstall` command."""
+    family = create_sssp_family()
+    other = create_sssp_family(label='SSSP/1.1/PBE/precision')
+
+    result = run_cli_command(cmd_uninstall, [family.label, '--dry-run'])
+    assert 'would delete 1 families' in result.output
+    assert orm.QueryBuilder().append(SsspFamily).count() == 2
+
+    result = run_cli_command(cmd_uninstall, [family.label, '--force'])
+    assert 'deleted 1 families, 0 parameters and {} pseudos'.format(family.count()) in result.output
+    assert [group.uuid for [group] in orm.QueryBuilder().append(SsspFamily).all()] == [other.uuid]
+
+
+def test_uninstall_all(clear_db, run_cli_command, create_sssp_family):
+    """Test the `-a/--all` option."""
+    family = create_sssp_family()
+    create_sssp_family(label='SSSP/1.1/PBE/precision')
+
+    run_cli_command(cmd_uninstall, ['--all', family.label], raises=SystemExit)
+    run_cli_command(cmd_uninstall, [], raises=SystemExit)
+
+    result = run_cli_command(cmd_uninstall, ['--all', '--force', '--keep-pseudos'])
+    assert 'deleted 2 families' in result.output
+    assert orm.QueryBuilder().append(SsspFamily).count() == 0
+    assert orm.QueryBuilder().append(orm.UpfData).count() > 0
+
+
+def test_uninstall_linked_parameters(clear_db, run_cli_command, create_sssp_family, create_sssp_parameters):
+    """Test that parameters that are kept because they have links are reported."""
+    from aiida.common.links import LinkType
+
+    family = create_sssp_family()
+    parameters = create_sssp_parameters(uuid=family.uuid).store()
+
+    calculation = orm.CalculationNode()
+    calculation.add_incoming(parameters, LinkType.INPUT_CALC, 'parameters')
+    calculation.store()
+
+    result = run_cli_command(cmd_uninstall, [family.label, '--dry-run'])
+    assert 'would keep 1 parameters that have links' in result.output
+
+    result = run_cli_command(cmd_uninstall, [family.label, '--force'])
+    assert 'kept 1 parameters that have links' in result.output
+    assert orm.load_node(parameters.pk)
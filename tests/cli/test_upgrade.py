@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument
+"""Tests for the command `aiida-sssp upgrade`."""
+from aiida import orm
+from aiida_sssp.cli import cmd_upgrade
+
+
+def test_upgrade(clear_db, run_cli_command, create_sssp_family):
+    """Test the `aiida-sssp upgrade` command."""
+    from aiida_sssp.groups import SsspFamily
+
+    family = create_sssp_family(label='SSSP/1.0/PBE/efficiency')
+
+    result = run_cli_command(cmd_upgrade, [family.label])
+    assert 'installed `SSSP/1.1/PBE/efficiency`' in result.output
+
+    upgraded = orm.load_group('SSSP/1.1/PBE/efficiency')
+    assert isinstance(upgraded, SsspFamily)
+    assert 'upgraded from `{}`'.format(family.label) in upgraded.description
+    assert upgraded.get_parameters_node().family_uuid == upgraded.uuid
+    assert family.count() == 3
+
+    result = run_cli_command(cmd_upgrade, [family.label], raises=SystemExit)
+    assert 'is already installed' in result.output
@@ -17,7 +17,7 @@ class ArchiveType(enum.IntEnum):
 
     VALID = 0
     INVALID_ARCHIVE_FORMAT = 1
-    INVALID_ARCHIVE_SUBFOLDER = 2
+    VALID_SUBFOLDER = 2
     INVALID_UPF_FILE = 3
 
 
@@ -34,7 +34,7 @@ def get_pseudo_archive(filepath_pseudos, request):
         if archive_type == ArchiveType.INVALID_ARCHIVE_FORMAT:
             suffix = '.txt'
 
-        if archive_type == ArchiveType.INVALID_ARCHIVE_SUBFOLDER:
+        if archive_type == ArchiveType.VALID_SUBFOLDER:
             os.makedirs(os.path.join(dirpath, 'subfolder'))
 
         if archive_type == ArchiveType.INVALID_UPF_FILE:
@@ -52,7 +52,7 @@ def get_pseudo_archive(filepath_pseudos, request):
     'get_pseudo_archive', (
         (ArchiveType.VALID, None, None),
         (ArchiveType.INVALID_ARCHIVE_FORMAT, OSError, 'failed to unpack the archive'),
-        (ArchiveType.INVALID_ARCHIVE_SUBFOLDER, OSError, 'contains at least one entry that is not a file'),
+        (ArchiveType.VALID_SUBFOLDER, None, None),
         (ArchiveType.INVALID_UPF_FILE, OSError, 'failed to parse'),
     ),
     indirect=True
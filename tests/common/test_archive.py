@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""Tests for the `aiida_sssp.common.archive` module."""
+import os
+import shutil
+
+import pytest
+
+from aiida_sssp.common import ArchiveReader, TarArchiveReader, ZipArchiveReader, get_archive_reader, iter_upf_members
+from aiida_sssp.common.archive import ARCHIVE_READERS, register_archive_reader
+
+EXTENSIONS = {'zip': '.zip', 'tar': '.tar', 'gztar': '.tar.gz', 'bztar': '.tar.bz2', 'xztar': '.tar.xz'}
+
+
+@pytest.fixture
+def create_archive(filepath_pseudos, tmp_path):
+    """Return a factory that creates an archive of the given format of the pseudos with a subdirectory and other files.
+
+    The pseudos are placed in a subdirectory `pseudos` and the archive also contains an empty directory and a README.
+    """
+
+    def factory(fmt):
+        dirpath = tmp_path / 'content'
+        shutil.copytree(filepath_pseudos, str(dirpath / 'pseudos'))
+        (dirpath / 'empty').mkdir()
+        (dirpath / 'README.txt').write_text('not a pseudo potential')
+
+        if fmt == 'zstdtar':
+            zstandard = pytest.importorskip('zstandard')
+            filepath = shutil.make_archive(str(tmp_path / 'archive'), 'tar', str(dirpath))
+            with open(filepath, 'rb') as source, open(filepath + '.zst', 'wb') as target:
+                zstandard.ZstdCompressor().copy_stream(source, target)
+            return filepath + '.zst'
+
+        return shutil.make_archive(str(tmp_path / 'archive'), fmt, str(dirpath))
+
+    return factory
+
+
+@pytest.mark.parametrize('fmt', list(EXTENSIONS) + ['zstdtar'])
+def test_iter_upf_members(create_archive, filepath_pseudos, fmt):
+    """Test that `iter_upf_members` yields only the UPF files, for all supported formats."""
+    filepath = create_archive(fmt)
+    contents = {}
+
+    for filename, handle in iter_upf_members(filepath):
+        contents[filename] = handle.read()
+
+    assert sorted(contents) == sorted(os.listdir(filepath_pseudos))
+
+    for filename, content in contents.items():
+        with open(os.path.join(filepath_pseudos, filename), 'rb') as handle:
+            assert content == handle.read()
+
+
+def test_get_archive_reader(create_archive, tmp_path):
+    """Test the `get_archive_reader` function."""
+    assert isinstance(get_archive_reader('/archive.ZIP'), ZipArchiveReader)
+    assert isinstance(get_archive_reader('/archive.tgz'), TarArchiveReader)
+    assert isinstance(get_archive_reader('/archive', fmt='xztar'), TarArchiveReader)
+
+    with pytest.raises(OSError, match=r'unsupported archive format of'):
+        get_archive_reader('/archive.rar')
+
+    with pytest.raises(OSError, match=r'unsupported archive format `rar`'):
+        get_archive_reader('/archive', fmt='rar')
+
+    filepath = str(tmp_path / 'corrupt.zip')
+
+    with open(filepath, 'wb') as handle:
+        handle.write(b'corrupt')
+
+    with pytest.raises(OSError, match=r'failed to read the archive'):
+        list(iter_upf_members(filepath))
+
+
+def test_register_archive_reader(tmp_path):
+    """Test that readers for additional formats can be registered."""
+
+    class DirectoryReader(ArchiveReader):
+        """Reader that treats a directory with the `.dir` extension as an archive."""
+
+        formats = ('dir',)
+        extensions = ('.dir',)
+
+        def iter_members(self):
+            for filename in sorted(os.listdir(self.filepath)):
+                with open(os.path.join(self.filepath, filename), 'rb') as handle:
+                    yield filename, handle
+
+    dirpath = tmp_path / 'archive.dir'
+    dirpath.mkdir()
+    (dirpath / 'He.UPF').write_bytes(b'content')
+    (dirpath / 'README').write_bytes(b'readme')
+
+    register_archive_reader(DirectoryReader)
+
+    try:
+        assert [filename for filename, _ in iter_upf_members(str(dirpath))] == ['He.UPF']
+    finally:
+        ARCHIVE_READERS.remove(DirectoryReader)
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""Tests for the `aiida_sssp.common.download` module."""
+import hashlib
+import os
+
+import pytest
+import requests
+
+from aiida_sssp.common import Progress, download_file, download_from_mirrors, fetch_checksum, probe_mirrors
+
+CONTENT = os.urandom(2**18)
+CHECKSUM = hashlib.md5(CONTENT).hexdigest()
+
+
+def test_download_file(http_server, tmp_path):
+    """Test downloading a file over a reliable connection."""
+    http_server.files['/archive.tar.gz'] = CONTENT
+    filepath = str(tmp_path / 'archive.tar.gz')
+
+    assert download_file(http_server.url + '/archive.tar.gz', filepath, md5=CHECKSUM) == CHECKSUM
+    assert len(http_server.requests) == 1
+
+    with open(filepath, 'rb') as handle:
+        assert handle.read() == CONTENT
+
+
+def test_download_file_resume(http_server, tmp_path):
+    """Test that a download that is cut off is resumed with a range request."""
+    http_server.files['/archive.tar.gz'] = CONTENT
+    http_server.truncate = 2
+    filepath = str(tmp_path / 'archive.tar.gz')
+    progress = Progress()
+
+    with progress.phase('download', 'B') as phase:
+        assert download_file(
+            http_server.url + '/archive.tar.gz', filepath, md5=CHECKSUM, backoff=0, phase=phase
+        ) == CHECKSUM
+
+    assert phase.count == phase.total == len(CONTENT)
+    assert len(http_server.requests) == 3
+    assert 'Range' not in http_server.requests[0]
+    assert http_server.requests[1]['Range'] == 'bytes={}-'.format(len(CONTENT) // 2)
+    assert http_server.requests[1]['If-Range'] == '"{}"'.format(len(CONTENT))
+    assert http_server.requests[2]['Range'] == 'bytes={}-'.format(len(CONTENT) * 3 // 4)
+
+
+def test_download_file_no_ranges(http_server, tmp_path):
+    """Test that a download restarts from scratch if the server does not support range requests."""
+    http_server.files['/archive.tar.gz'] = CONTENT
+    http_server.ranges = False
+    http_server.truncate = 1
+    filepath = str(tmp_path / 'archive.tar.gz')
+
+    assert download_file(http_server.url + '/archive.tar.gz', filepath, md5=CHECKSUM, backoff=0) == CHECKSUM
+
+
+def test_download_file_complete(http_server, tmp_path):
+    """Test that a download of which all content was already written completes without transferring any content."""
+    http_server.files['/archive.tar.gz'] = CONTENT
+    filepath = str(tmp_path / 'archive.tar.gz')
+
+    with open(filepath, 'wb') as handle:
+        handle.write(CONTENT)
+
+    assert download_file(http_server.url + '/archive.tar.gz', filepath, md5=CHECKSUM) == CHECKSUM
+
+
+def test_download_file_changed(http_server, tmp_path):
+    """Test that a download restarts from scratch if the file changed on the server before it could be resumed."""
+    changed = CONTENT + b'changed'
+
+    def change(server):
+        server.files['/archive.tar.gz'] = changed
+
+    # The changed file has a different `ETag`, such that the server ignores the range request of the resumed download
+    http_server.files['/archive.tar.gz'] = CONTENT
+    http_server.truncate = 1
+    http_server.after_request = change
+    filepath = str(tmp_path / 'archive.tar.gz')
+
+    assert download_file(http_server.url + '/archive.tar.gz', filepath, backoff=0) == hashlib.md5(changed).hexdigest()
+    assert len(http_server.requests) == 2
+    assert http_server.requests[1]['Range'] == 'bytes={}-'.format(len(CONTENT) // 2)
+
+    with open(filepath, 'rb') as handle:
+        assert handle.read() == changed
+
+
+def test_download_file_retries(http_server, tmp_path):
+    """Test that the number of retries is bounded."""
+    http_server.files['/archive.tar.gz'] = CONTENT
+    http_server.truncate = 10
+    filepath = str(tmp_path / 'archive.tar.gz')
+
+    with pytest.raises(requests.RequestException):
+        download_file(http_server.url + '/archive.tar.gz', filepath, retries=2, backoff=0)
+
+    assert len(http_server.requests) == 3
+
+
+def test_download_file_invalid(http_server, tmp_path):
+    """Test that client errors are not retried and that a file with the wrong checksum is removed."""
+    http_server.files['/archive.tar.gz'] = CONTENT
+    filepath = str(tmp_path / 'archive.tar.gz')
+
+    with pytest.raises(requests.HTTPError):
+        download_file(http_server.url + '/missing.tar.gz', filepath, backoff=0)
+
+    assert len(http_server.requests) == 1
+
+    with pytest.raises(ValueError, match=r'checksum'):
+        download_file(http_server.url + '/archive.tar.gz', filepath, md5='invalid')
+
+    assert not os.path.exists(filepath)
+
+
+def test_probe_mirrors(http_server_factory, tmp_path):
+    """Test that `probe_mirrors` orders healthy mirrors by response time followed by unhealthy ones."""
+    slow = http_server_factory()
+    slow.files['/archive.tar.gz'] = CONTENT
+    slow.delay = 0.2
+    fast = http_server_factory()
+    fast.files['/archive.tar.gz'] = CONTENT
+    broken = http_server_factory()
+    missing = str(tmp_path)
+
+    mirrors = [missing, broken.url, slow.url, fast.url]
+    result = probe_mirrors(mirrors, 'archive.tar.gz')
+
+    assert [mirror for mirror, _ in result] == [fast.url, slow.url, missing, broken.url]
+    assert result[0][1] < result[1][1]
+    assert result[2][1] is None and result[3][1] is None
+
+
+def test_download_from_mirrors(http_server_factory, tmp_path):
+    """Test that `download_from_mirrors` fails over to the next mirror and supports local directories."""
+    broken = http_server_factory()
+    corrupt = http_server_factory()
+    corrupt.files['/archive.tar.gz'] = b'corrupt'
+    working = http_server_factory()
+    working.files['/archive.tar.gz'] = CONTENT
+    filepath = str(tmp_path / 'archive.tar.gz')
+
+    mirrors = [broken.url, corrupt.url, working.url]
+    assert download_from_mirrors(mirrors, 'archive.tar.gz', filepath, md5=CHECKSUM,
+                                 backoff=0) == (working.url, CHECKSUM)
+
+    dirpath = tmp_path / 'mirror'
+    dirpath.mkdir()
+    (dirpath / 'archive.tar.gz').write_bytes(CONTENT)
+    os.remove(filepath)
+
+    mirror = 'file://{}'.format(dirpath)
+    assert download_from_mirrors([broken.url, mirror], 'archive.tar.gz', filepath, backoff=0) == (mirror, CHECKSUM)
+
+    with pytest.raises(OSError, match=r'failed to download `archive.tar.gz` from any mirror'):
+        download_from_mirrors([broken.url, corrupt.url], 'archive.tar.gz', filepath, md5=CHECKSUM, backoff=0)
+
+    assert not os.path.exists(filepath)
+
+
+def test_fetch_checksum(http_server, tmp_path):
+    """Test that `fetch_checksum` returns the checksum published by the first mirror that has a valid one."""
+    http_server.files['/archive.tar.gz.md5'] = '{}  archive.tar.gz\n'.format(CHECKSUM.upper()).encode('utf-8')
+    http_server.files['/invalid.tar.gz.md5'] = b'invalid  invalid.tar.gz\n'
+
+    assert fetch_checksum([str(tmp_path), http_server.url], 'archive.tar.gz', backoff=0) == CHECKSUM
+    assert fetch_checksum([http_server.url], 'invalid.tar.gz', backoff=0) is None
+    assert fetch_checksum([http_server.url, str(tmp_path)], 'missing.tar.gz', backoff=0) is None
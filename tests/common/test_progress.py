@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""Tests for the `aiida_sssp.common.progress` module."""
+import json
+
+import pytest
+
+from aiida_sssp.common import Progress, format_quantity
+
+
+@pytest.mark.parametrize(('value', 'unit', 'expected'), (
+    (0, 'B', '0 B'),
+    (1023, 'B', '1023 B'),
+    (1536, 'B', '1.5 KiB'),
+    (3 * 1024**2, 'B', '3.0 MiB'),
+    (2 * 1024**4, 'B', '2048.0 GiB'),
+    (12, 'files', '12 files'),
+    (2.25, 'files', '2.2 files'),
+))
+def test_format_quantity(value, unit, expected):
+    """Test the `format_quantity` function."""
+    assert format_quantity(value, unit) == expected
+
+
+def test_progress():
+    """Test that `Progress` records its phases and notifies the listener."""
+    notifications = []
+    progress = Progress(lambda phase: notifications.append((phase.name, phase.count, phase.finished is not None)))
+
+    with progress.phase('download', 'B', total=10) as phase:
+        phase.update(4)
+        phase.update(6)
+
+    with pytest.raises(RuntimeError):
+        with progress.phase('parse', 'files'):
+            raise RuntimeError
+
+    assert notifications == [
+        ('download', 0, False),
+        ('download', 4, False),
+        ('download', 10, False),
+        ('download', 10, True),
+        ('parse', 0, False),
+        ('parse', 0, True),
+    ]
+    assert [phase.name for phase in progress.phases] == ['download', 'parse']
+    assert progress.elapsed == pytest.approx(sum(phase.elapsed for phase in progress.phases))
+
+    summary = json.loads(json.dumps(progress.as_dict()))
+    assert summary['phases'][0]['count'] == 10
+    assert summary['phases'][0]['total'] == 10
+    assert summary['phases'][1]['unit'] == 'files'
+
+    lines = progress.format_summary().split('\n')
+    assert lines[0].startswith('download')
+    assert '10 B of 10 B at' in lines[0]
+    assert lines[-1].startswith('total')
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Tests for the `aiida_sssp.common.synthetic` module."""
+import io
+import json
+import os
+
+import pytest
+
+from aiida_sssp.common import (
+    create_upf, generate_compositions, generate_upf, get_element_symbols, iter_structure_batches, scan_upf,
+    write_synthetic_family
+)
+
+
+def test_get_element_symbols():
+    """Test `get_element_symbols`."""
+    assert get_element_symbols(3) == ['H', 'He', 'Li']
+    assert len(get_element_symbols()) > 100
+    assert all(len(symbol) <= 2 for symbol in get_element_symbols())
+
+    with pytest.raises(ValueError):
+        get_element_symbols(1000)
+
+
+def test_generate_upf():
+    """Test that `generate_upf` returns a valid UPF file whose checksum depends on the seed."""
+    content = generate_upf('Si', mesh_size=10)
+    upf = create_upf(io.BytesIO(content), 'Si.upf')
+
+    assert upf.element == 'Si'
+    assert generate_upf('Si', mesh_size=10) == content
+    assert generate_upf('Si', seed=1, mesh_size=10) != content
+    assert len(generate_upf('Si', mesh_size=1000)) > len(content)
+
+
+@pytest.mark.parametrize('fmt', (None, 'gztar', 'zip'))
+def test_write_synthetic_family(tmp_path, fmt):
+    """Test that `write_synthetic_family` writes UPF files that match the metadata of the parameters file."""
+    from aiida_sssp.common import iter_upf_members
+
+    elements = get_element_symbols(5)
+    filepath, filepath_parameters = write_synthetic_family(str(tmp_path), elements, fmt=fmt)
+
+    with open(filepath_parameters) as handle:
+        parameters = json.load(handle)
+
+    assert sorted(parameters) == sorted(elements)
+
+    if fmt is None:
+        headers = [scan_upf(os.path.join(filepath, filename)) for filename in os.listdir(filepath)]
+    else:
+        headers = [scan_upf(handle, filename) for filename, handle in iter_upf_members(filepath)]
+
+    for header in headers:
+        assert parameters[header.element]['md5'] == header.md5sum
+        assert parameters[header.element]['filename'] == header.filename
+        assert parameters[header.element]['cutoff_rho'] >= 4 * parameters[header.element]['cutoff_wfc']
+
+    with pytest.raises(ValueError):
+        write_synthetic_family(str(tmp_path), elements, fmt='rar')
+
+
+def test_generate_compositions():
+    """Test `generate_compositions`."""
+    elements = get_element_symbols(10)
+    compositions = generate_compositions(elements, 50, max_elements=3, seed=1)
+
+    assert len(compositions) == 50
+    assert all(1 <= len(symbols) <= 3 and set(symbols).issubset(elements) for symbols in compositions)
+    assert generate_compositions(elements, 50, max_elements=3, seed=1) == compositions
+
+    with pytest.raises(ValueError):
+        generate_compositions([], 1)
+
+
+def test_iter_structure_batches():
+    """Test `iter_structure_batches`."""
+    elements = get_element_symbols(10)
+    batches = list(iter_structure_batches(elements, 25, batch_size=10, max_elements=2))
+
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+
+    for structure in [structure for batch in batches for structure in batch]:
+        assert not structure.is_stored
+        assert 1 <= len(structure.get_kind_names()) <= 2
+        assert set(structure.get_kind_names()).issubset(elements)
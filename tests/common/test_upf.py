@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Tests for the `aiida_sssp.common.upf` module."""
+import io
+import os
+
+import pytest
+
+from aiida.common.exceptions import ParsingError
+
+from aiida_sssp.common import UpfHeader, create_upf, scan_upf
+
+
+@pytest.mark.parametrize('chunk_size', (1, 7, 2**16))
+def test_scan_upf(get_upf_data, filepath_pseudos, chunk_size):
+    """Test that `scan_upf` returns the same element and checksum as `UpfData` for any chunk size."""
+    for filename in os.listdir(filepath_pseudos):
+        upf = get_upf_data(element=filename[:-4])
+        header = scan_upf(os.path.join(filepath_pseudos, filename), chunk_size=chunk_size)
+        assert header == UpfHeader(upf.element, upf.filename, upf.md5sum)
+
+
+def test_scan_upf_filelike():
+    """Test `scan_upf` for a filelike object and a UPF v1 file."""
+    content = b'<PP_INFO>\n</PP_INFO>\n<PP_HEADER>\n   0   Version Number\n  Fe   Element\n</PP_HEADER>\n'
+    header = scan_upf(io.BytesIO(content), filename='Fe.pbe.UPF')
+    assert header.element == 'Fe'
+    assert header.filename == 'Fe.pbe.UPF'
+
+
+def test_scan_upf_invalid():
+    """Test that `scan_upf` raises for invalid files."""
+    with pytest.raises(ParsingError, match=r'Unable to find the element'):
+        scan_upf(io.BytesIO(b'invalid pseudo format'), filename='He.upf')
+
+    with pytest.raises(ParsingError, match=r'Unknown element symbol'):
+        scan_upf(io.BytesIO(b'<UPF version="2.0.1">\n<PP_HEADER element="Zz"/>\n'), filename='Zz.upf')
+
+    with pytest.raises(ParsingError, match=r'does not start with'):
+        scan_upf(io.BytesIO(b'<UPF version="2.0.1">\n<PP_HEADER element="He"/>\n'), filename='Ar.upf')
+
+
+def test_create_upf(get_upf_data, filepath_pseudos):
+    """Test that `create_upf` creates a `UpfData` with the same attributes from a stream."""
+    expected = get_upf_data(element='He')
+
+    with open(os.path.join(filepath_pseudos, 'He.upf'), 'rb') as handle:
+        upf = create_upf(handle, 'He.upf')
+
+    assert upf.element == expected.element
+    assert upf.md5sum == expected.md5sum
+    assert upf.filename == expected.filename
+    assert upf.get_content() == expected.get_content()
@@ -114,6 +114,24 @@ def sssp_parameter_filepath(sssp_parameter_metadata):
         yield filepath.name
 
 
+@pytest.fixture
+def sssp_mirror(tmp_path, filepath_pseudos, sssp_parameter_metadata):
+    """Return the path of a local directory that mirrors the archive and metadata of SSSP v1.1 PBE efficiency."""
+    import tarfile
+
+    dirpath = tmp_path / 'mirror'
+    dirpath.mkdir()
+
+    with tarfile.open(str(dirpath / 'SSSP_1.1_PBE_efficiency.tar.gz'), 'w:gz') as archive:
+        for filename in os.listdir(filepath_pseudos):
+            archive.add(os.path.join(filepath_pseudos, filename), arcname=filename)
+
+    with open(str(dirpath / 'SSSP_1.1_PBE_efficiency.json'), 'w') as handle:
+        json.dump(sssp_parameter_metadata, handle)
+
+    return str(dirpath)
+
+
 @pytest.fixture
 def create_sssp_family(filepath_pseudos):
     """Create an `SsspFamily` from the `tests/fixtures/pseudos` directory."""
@@ -140,6 +158,25 @@ def create_sssp_parameters(sssp_parameter_metadata, uuid):
     return factory
 
 
+@pytest.fixture
+def create_synthetic_family(tmp_path):
+    """Create an `SsspFamily` with parameters from synthetic pseudo potentials, see `aiida_sssp.common.synthetic`."""
+
+    def factory(label='SSSP/synthetic', elements=10, seed=0, fmt=None):
+        from aiida_sssp.common import get_element_symbols, write_synthetic_family
+        from aiida_sssp.groups import SsspFamily
+
+        dirpath = tempfile.mkdtemp(dir=str(tmp_path))
+        filepath, filepath_parameters = write_synthetic_family(dirpath, get_element_symbols(elements), seed, fmt=fmt)
+
+        if fmt is None:
+            return SsspFamily.create_from_folder(filepath, label, filepath_parameters=filepath_parameters)
+
+        return SsspFamily.create_from_archive(filepath, label, filepath_parameters=filepath_parameters)
+
+    return factory
+
+
 @pytest.fixture
 def create_structure():
     """Return a `StructureData` instance."""
@@ -162,3 +199,121 @@ def create_structure():
         return structure
 
     return _create_structure
+
+
+@pytest.fixture
+def http_server_factory():
+    """Return a factory that starts local HTTP servers that serve in-memory files and can simulate unreliable mirrors.
+
+    Each server has a `url` attribute with its base URL. Files are served from the `files` dictionary, mapping a path to
+    its content in bytes, with the size of the content as `ETag`. The server honors `Range` requests, unless `ranges` is
+    set to False or the `If-Range` header does not match the `ETag`, in which case the full file is sent. The first
+    `truncate` responses are cut off after sending half of the requested content and each response is delayed by
+    `delay` seconds. The headers of all GET requests are recorded in `requests` and `after_request`, if set, is called
+    with the server after each GET request is served, such that it can change the files. All servers are shut down at
+    the end of the test.
+    """
+    import http.server
+    import socketserver
+    import threading
+    import time
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        """Handler of requests of the local HTTP server."""
+
+        def do_HEAD(self):  # pylint: disable=invalid-name
+            """Respond to a HEAD request."""
+            time.sleep(self.server.delay)
+
+            try:
+                content = self.server.files[self.path]
+            except KeyError:
+                self.send_error(404)
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            """Respond to a GET request."""
+            server = self.server
+            server.requests.append(dict(self.headers))
+            time.sleep(server.delay)
+
+            try:
+                content = server.files[self.path]
+            except KeyError:
+                self.send_error(404)
+                return
+
+            start = 0
+            etag = '"{}"'.format(len(content))
+            header_range = self.headers.get('Range', None)
+            header_if_range = self.headers.get('If-Range', etag)
+
+            if header_range is not None and server.ranges and header_if_range == etag:
+                start = int(header_range.replace('bytes=', '').split('-')[0])
+                if start >= len(content):
+                    self.send_response(416)
+                    self.send_header('Content-Range', 'bytes */{}'.format(len(content)))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(206)
+                self.send_header('Content-Range', 'bytes {}-{}/{}'.format(start, len(content) - 1, len(content)))
+            else:
+                self.send_response(200)
+
+            body = content[start:]
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('ETag', etag)
+            self.end_headers()
+
+            if server.truncate > 0:
+                server.truncate -= 1
+                self.wfile.write(body[:len(body) // 2])
+                self.close_connection = True
+            else:
+                self.wfile.write(body)
+
+            if server.after_request is not None:
+                server.after_request(server)
+
+        def log_message(self, *args):  # pylint: disable=arguments-differ
+            """Do not log requests."""
+
+    class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+        """Local HTTP server that handles each request in a separate thread."""
+
+        daemon_threads = True
+
+    servers = []
+
+    def factory():
+        server = Server(('127.0.0.1', 0), Handler)
+        server.url = 'http://127.0.0.1:{}'.format(server.server_address[1])
+        server.files = {}
+        server.ranges = True
+        server.truncate = 0
+        server.delay = 0
+        server.requests = []
+        server.after_request = None
+
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+
+        return server
+
+    try:
+        yield factory
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+
+@pytest.fixture
+def http_server(http_server_factory):
+    """Start a local HTTP server that serves in-memory files, see the `http_server_factory` fixture."""
+    return http_server_factory()
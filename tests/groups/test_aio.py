@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument,redefined-outer-name,protected-access
+"""Tests for the `aiida_sssp.groups.aio` module."""
+import asyncio
+
+import pytest
+
+from aiida.common import exceptions
+
+from aiida_sssp.cache import set_cache_backend
+from aiida_sssp.groups import AsyncResolver, SsspFamily, aio
+
+
+@pytest.fixture
+def count_queries(monkeypatch):
+    """Count the calls to the query functions of the `aio` module and return the list of their arguments."""
+    calls = []
+
+    for name in ('_query_pseudos', '_query_parameters'):
+
+        def wrapper(uuids, function=getattr(aio, name), name=name):
+            calls.append((name, sorted(uuids)))
+            return function(uuids)
+
+        monkeypatch.setattr(aio, name, wrapper)
+
+    return calls
+
+
+def run(coroutine):
+    """Run the given coroutine until it completes and return its result."""
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+def test_async_resolver(clear_db, create_sssp_family, create_sssp_parameters, count_queries):
+    """Test that concurrent requests of the `AsyncResolver` are pooled into a single query per type."""
+    families = [create_sssp_family(label='SSSP/1.1/PBE/{}'.format(index)) for index in range(3)]
+    create_sssp_parameters(uuid=families[0].uuid).store()
+    create_sssp_parameters(uuid=families[1].uuid).store()
+
+    resolver = AsyncResolver()
+    instances = [SsspFamily.objects.get(uuid=family.uuid) for family in families * 2]
+
+    async def resolve():
+        requests = [resolver.get_pseudos(family) for family in instances]
+        requests += [resolver.get_parameters_node(family) for family in instances]
+        return await asyncio.gather(*requests, return_exceptions=True)
+
+    results = run(resolve())
+    uuids = sorted(family.uuid for family in families)
+
+    assert sorted(count_queries) == [('_query_parameters', uuids), ('_query_pseudos', uuids)]
+
+    for family, pseudos in zip(instances, results[:len(instances)]):
+        assert {element: upf.uuid for element, upf in pseudos.items()
+                } == {upf.element: upf.uuid for upf in family.nodes}
+
+    for family, parameters in zip(instances, results[len(instances):]):
+        if family.uuid == families[2].uuid:
+            assert isinstance(parameters, exceptions.NotExistent)
+        else:
+            assert parameters.family_uuid == family.uuid
+            assert family.get_parameters_node() is parameters
+
+    # Results are stored in the caches of the instances, so requesting them again does not query the database
+    run(resolver.get_pseudos(instances[0]))
+    assert len(count_queries) == 2
+
+
+def test_get_async(clear_db, create_sssp_family, create_sssp_parameters, create_structure, count_queries):
+    """Test the awaitable methods of `SsspFamily`."""
+    family = create_sssp_family()
+    create_sssp_parameters(uuid=family.uuid).store()
+    structure = create_structure(['Ar', 'He'])
+
+    set_cache_backend('none')
+
+    try:
+        instance = SsspFamily.objects.get(uuid=family.uuid)
+        pseudos = run(instance.get_pseudos_async(structure))
+        assert {kind: upf.uuid for kind, upf in pseudos.items()
+                } == {kind: upf.uuid for kind, upf in family.get_pseudos(structure).items()}
+        assert run(instance.get_cutoffs_async(structure=structure)) == family.get_cutoffs(structure=structure)
+        assert run(instance.get_parameters_node_async()).uuid == family.get_parameters_node().uuid
+        assert [name for name, _ in count_queries] == ['_query_pseudos', '_query_parameters']
+
+        with pytest.raises(ValueError, match=r'does not contain pseudo for element `Xe`'):
+            run(instance.get_pseudos_async(create_structure(['Xe'])))
+    finally:
+        set_cache_backend('snapshot')
+
+
+def test_async_resolver_generation(clear_db, create_sssp_family, create_sssp_parameters):
+    """Test that the `AsyncResolver` records the generation of the caches it fills, such that they are revalidated."""
+    family = create_sssp_family()
+    create_sssp_parameters(uuid=family.uuid).store()
+
+    resolver = AsyncResolver()
+    instance = SsspFamily.objects.get(uuid=family.uuid)
+    run(resolver.get_pseudos(instance))
+    run(resolver.get_parameters_node(instance))
+
+    generation = family.generation
+    assert instance._generations == {'pseudos': generation, 'parameters': generation}
+    assert instance.revalidate()
+
+    family.bump_generation()
+    assert not instance.revalidate()
+    assert instance._pseudos is None
+    assert instance._parameters_node is None
+
+
+def test_async_resolver_attributes(clear_db, create_sssp_family, create_sssp_parameters, monkeypatch):
+    """Test that the `AsyncResolver` reads the attributes of the parameters in the executor, not in the event loop."""
+    import threading
+
+    from aiida_sssp.data import SsspParameters
+
+    family = create_sssp_family()
+    create_sssp_parameters(uuid=family.uuid).store()
+    threads = []
+    original = SsspParameters.attributes
+
+    def attributes(node):
+        threads.append(threading.current_thread())
+        return original.fget(node)
+
+    monkeypatch.setattr(SsspParameters, 'attributes', property(attributes))
+
+    instance = SsspFamily.objects.get(uuid=family.uuid)
+    run(AsyncResolver().get_parameters_node(instance))
+
+    assert threads
+    assert threading.main_thread() not in threads
+    assert instance._parameters == family.get_parameters_node().attributes
+
+
+def test_get_async_resolver_closed_loop(clear_db, create_sssp_family):
+    """Test that `get_async_resolver` returns a new resolver after the event loop with a pending flush is closed."""
+    family = create_sssp_family()
+    original = asyncio.get_event_loop()
+    loop = asyncio.new_event_loop()
+
+    try:
+        asyncio.set_event_loop(loop)
+        resolver = aio.get_async_resolver()
+        assert aio.get_async_resolver() is resolver
+
+        # Run a single iteration, which schedules the flush of the request, and close the loop before the flush runs
+        task = loop.create_task(resolver.get_pseudos(SsspFamily.objects.get(uuid=family.uuid)))
+        loop.call_soon(loop.stop)
+        loop.run_forever()
+        assert resolver._flush_scheduled
+        task.cancel()
+        loop.close()
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        assert aio.get_async_resolver() is not resolver
+
+        instance = SsspFamily.objects.get(uuid=family.uuid)
+        pseudos = loop.run_until_complete(asyncio.wait_for(aio.get_async_resolver().get_pseudos(instance), 10))
+        assert {element: upf.uuid for element, upf in pseudos.items()
+                } == {upf.element: upf.uuid for upf in family.nodes}
+    finally:
+        loop.close()
+        asyncio.set_event_loop(original)
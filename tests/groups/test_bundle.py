@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument
+"""Tests for the `aiida_sssp.groups.bundle` module."""
+import io
+import tarfile
+
+import pytest
+
+from aiida import orm
+
+from aiida_sssp.groups import SsspFamily, export_family, import_family
+
+
+@pytest.fixture
+def filepath_bundle(create_sssp_family, create_sssp_parameters, tmp_path):
+    """Export an `SsspFamily` with parameters to a bundle and return its filepath."""
+    family = create_sssp_family()
+    create_sssp_parameters(uuid=family.uuid).store()
+    filepath = str(tmp_path / 'bundle.tar.gz')
+    export_family(family, filepath)
+    return filepath
+
+
+def test_export_family(clear_db, filepath_bundle):
+    """Test the `export_family` function."""
+    family = orm.load_group('SSSP/1.1/PBE/efficiency')
+
+    with tarfile.open(filepath_bundle) as archive:
+        names = archive.getnames()
+
+    assert names[:2] == ['manifest.json', 'parameters.json']
+    assert sorted(names[2:]) == sorted('pseudos/{}'.format(node.filename) for node in family.nodes)
+
+
+def test_import_family_reuse(clear_db, filepath_bundle):
+    """Test that `import_family` reuses existing pseudo potentials."""
+    family = orm.load_group('SSSP/1.1/PBE/efficiency')
+
+    with pytest.raises(ValueError, match=r'already exists'):
+        import_family(filepath_bundle)
+
+    imported = import_family(filepath_bundle, label='SSSP/imported')
+    assert isinstance(imported, SsspFamily)
+    assert imported.description == family.description
+    assert orm.QueryBuilder().append(orm.UpfData).count() == family.count()
+    assert {node.uuid for node in imported.nodes} == {node.uuid for node in family.nodes}
+    assert imported.get_parameters_node().get_metadata() == family.get_parameters_node().get_metadata()
+
+
+def test_import_family_create(clear_db, filepath_bundle):
+    """Test that `import_family` creates new pseudo potentials if they do not yet exist."""
+    from aiida.backends.utils import delete_nodes_and_connections
+
+    family = orm.load_group('SSSP/1.1/PBE/efficiency')
+    pseudos = {element: (node.filename, node.md5sum) for element, node in family.pseudos.items()}
+    pks = [node.pk for node in family.nodes] + [family.get_parameters_node().pk]
+    orm.Group.objects.delete(family.pk)
+    delete_nodes_and_connections(pks)
+
+    imported = import_family(filepath_bundle)
+    assert imported.label == 'SSSP/1.1/PBE/efficiency'
+    assert {element: (node.filename, node.md5sum) for element, node in imported.pseudos.items()} == pseudos
+    assert all(node.is_stored for node in imported.nodes)
+    assert imported.get_parameters_node().family_uuid == imported.uuid
+
+
+def test_import_family_filename(clear_db, filepath_bundle):
+    """Test that `import_family` does not reuse pseudo potentials with the same content but a different filename."""
+    from aiida.backends.utils import delete_nodes_and_connections
+
+    from aiida_sssp.common import create_upf
+
+    family = orm.load_group('SSSP/1.1/PBE/efficiency')
+    element, node = sorted(family.pseudos.items())[0]
+    filename = node.filename
+    content = node.get_content().encode('utf-8')
+    pks = [node.pk for node in family.nodes] + [family.get_parameters_node().pk]
+    orm.Group.objects.delete(family.pk)
+    delete_nodes_and_connections(pks)
+
+    renamed = create_upf(io.BytesIO(content), '{}.renamed.upf'.format(element)).store()
+    imported = import_family(filepath_bundle)
+    assert imported.pseudos[element].uuid != renamed.uuid
+    assert imported.pseudos[element].filename == filename
+    assert imported.pseudos[element].md5sum == renamed.md5sum
+
+
+def test_import_family_invalid(clear_db, tmp_path):
+    """Test that `import_family` raises for invalid bundles."""
+    filepath = str(tmp_path / 'invalid.tar.gz')
+
+    with open(filepath, 'wb') as handle:
+        handle.write(b'not a bundle')
+
+    with pytest.raises(ValueError, match=r'failed to open the bundle'):
+        import_family(filepath)
+
+    with tarfile.open(filepath, 'w:gz') as archive:
+        tarinfo = tarfile.TarInfo('pseudos/He.upf')
+        tarinfo.size = 4
+        archive.addfile(tarinfo, io.BytesIO(b'test'))
+
+    with pytest.raises(ValueError, match=r'does not start with a manifest'):
+        import_family(filepath)
+
+    assert not orm.QueryBuilder().append(orm.UpfData).count()
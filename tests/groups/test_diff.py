@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument,redefined-outer-name
+"""Tests for the `aiida_sssp.groups.diff` module."""
+import copy
+import os
+import shutil
+
+import pytest
+
+from aiida_sssp.groups import SsspFamily, diff_families
+
+
+@pytest.fixture
+def families(create_sssp_family, create_sssp_parameters, sssp_parameter_metadata, filepath_pseudos, tmp_path):
+    """Return a family with parameters and a family without `Ne` and with a higher wavefunction cutoff for `He`."""
+    dirpath = tmp_path / 'pseudos'
+    shutil.copytree(filepath_pseudos, str(dirpath))
+    os.remove(str(dirpath / 'Ne.upf'))
+
+    source = create_sssp_family()
+    target = SsspFamily.create_from_folder(str(dirpath), 'SSSP/target')
+
+    parameters = copy.deepcopy(sssp_parameter_metadata)
+    parameters.pop('Ne')
+    parameters['He']['cutoff_wfc'] = 25.
+
+    create_sssp_parameters(uuid=source.uuid).store()
+    create_sssp_parameters(parameters, uuid=target.uuid).store()
+
+    return source, target
+
+
+def test_diff_families(clear_db, families):
+    """Test `diff_families`."""
+    source, target = families
+    diff = diff_families(source, target)
+
+    assert diff['source'] == {'uuid': source.uuid, 'label': source.label}
+    assert diff['target'] == {'uuid': target.uuid, 'label': target.label}
+    assert diff['added'] == []
+    assert [(entry['element'], entry['cutoff_rho']) for entry in diff['removed']] == [('Ne', 240.)]
+    assert [(entry['element'], entry['delta_wfc'], entry['delta_rho']) for entry in diff['changed']] == [('He', 5., 0.)]
+    assert diff['changed'][0]['source']['md5'] == diff['changed'][0]['target']['md5']
+    assert diff['unchanged'] == 1
+
+    reverse = diff_families(target, source)
+    assert [entry['element'] for entry in reverse['added']] == ['Ne']
+    assert reverse['removed'] == []
+    assert reverse['changed'][0]['delta_wfc'] == -5.
+
+    assert diff_families(source, source)['unchanged'] == source.count()
+
+
+def test_diff_families_without_parameters(clear_db, families, create_sssp_family):
+    """Test that cutoffs of a family without parameters are reported as `None`."""
+    source, _ = families
+    target = create_sssp_family(label='SSSP/no-parameters')
+    diff = diff_families(source, target)
+
+    assert len(diff['changed']) == source.count()
+
+    for entry in diff['changed']:
+        assert entry['target']['cutoff_wfc'] is None
+        assert entry['delta_wfc'] is None
+        assert entry['delta_rho'] is None
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument
+"""Tests for the `aiida_sssp.groups.ephemeral` module."""
+import os
+import tarfile
+
+import pytest
+
+from aiida import orm
+from aiida.common import exceptions
+
+from aiida_sssp.groups import EphemeralSsspFamily, SsspFamily
+
+
+def assert_database_empty():
+    """Assert that the database does not contain any nodes or groups."""
+    assert orm.QueryBuilder().append(orm.Node).count() == 0
+    assert orm.QueryBuilder().append(orm.Group).count() == 0
+
+
+def test_create_from_folder(clear_db, filepath_pseudos, sssp_parameter_filepath, create_structure):
+    """Test the lookup API of an `EphemeralSsspFamily` created from a folder, which should not touch the database."""
+    family = EphemeralSsspFamily.create_from_folder(
+        filepath_pseudos, 'SSSP', filepath_parameters=sssp_parameter_filepath
+    )
+    structure = create_structure(['Ar', 'He'])
+
+    assert family.count() == len(family.elements)
+    assert not family.is_stored
+    assert family.get_pseudo('Ar').element == 'Ar'
+    assert {kind: upf.element for kind, upf in family.get_pseudos(structure).items()} == {'Ar': 'Ar', 'He': 'He'}
+    assert family.get_cutoffs(structure=structure) == (20., 80.)
+    assert family.get_cutoffs(elements='Ne') == (30., 240.)
+    assert family.get_parameter('Ne', 'cutoff_wfc') == 30.
+    with open(os.path.join(filepath_pseudos, 'He.upf'), 'rb') as handle:
+        assert b''.join(family.iter_pseudo_chunks('He', chunk_size=64)) == handle.read()
+
+    with pytest.raises(ValueError):
+        family.get_pseudo('Xe')
+
+    assert_database_empty()
+
+
+def test_lookup_api(clear_db, filepath_pseudos, sssp_parameter_filepath, create_structure):
+    """Test that `EphemeralSsspFamily` implements all lookups of `SsspFamily`, including the awaitable ones."""
+    import asyncio
+
+    lookups = [
+        'get_pseudo', 'get_pseudo_uuid', 'get_pseudos', 'get_pseudos_async', 'get_parameters_node',
+        'get_parameters_node_async', 'get_parameter', 'get_cutoffs', 'get_cutoffs_async'
+    ]
+    assert all(hasattr(SsspFamily, name) and hasattr(EphemeralSsspFamily, name) for name in lookups)
+
+    family = EphemeralSsspFamily.create_from_folder(
+        filepath_pseudos, 'SSSP', filepath_parameters=sssp_parameter_filepath
+    )
+    structure = create_structure(['Ar', 'He'])
+    run = asyncio.get_event_loop().run_until_complete
+
+    assert family.get_pseudo_uuid('Ar') == family.get_pseudo('Ar').uuid
+    assert run(family.get_pseudos_async(structure)) == family.get_pseudos(structure)
+    assert run(family.get_parameters_node_async()) is family.get_parameters_node()
+    assert run(family.get_cutoffs_async(structure=structure)) == (20., 80.)
+
+    with pytest.raises(ValueError):
+        run(family.get_pseudos_async(create_structure(['Xe'])))
+
+    assert_database_empty()
+
+    stored = family.store(label='SSSP/stored')
+    assert isinstance(stored, SsspFamily)
+    assert sorted(stored.elements) == sorted(family.elements)
+    assert stored.get_cutoffs(structure=structure) == (20., 80.)
+
+
+def test_create_from_archive(clear_db, filepath_pseudos, tmp_path):
+    """Test `EphemeralSsspFamily.create_from_archive` and storing with deduplication."""
+    filepath = str(tmp_path / 'pseudos.tar.gz')
+
+    with tarfile.open(filepath, 'w:gz') as archive:
+        archive.add(filepath_pseudos, arcname='pseudos')
+
+    family = EphemeralSsspFamily.create_from_archive(filepath, 'SSSP', description='ephemeral')
+    assert family.description == 'ephemeral'
+    headers = SsspFamily.parse_pseudos_from_directory(filepath_pseudos, scan=True)
+    assert sorted(family.elements) == sorted(header.element for header in headers)
+
+    with pytest.raises(exceptions.NotExistent):
+        family.get_cutoffs(elements='Ar')
+
+    assert_database_empty()
+
+    existing = SsspFamily.create_from_folder(filepath_pseudos, 'SSSP/existing')
+    stored = family.store(deduplicate=True)
+
+    assert stored.label == 'SSSP'
+    assert {upf.uuid for upf in stored.nodes} == {upf.uuid for upf in existing.nodes}
+
+    with pytest.raises(ValueError, match=r'already exists'):
+        family.store()
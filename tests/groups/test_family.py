@@ -133,6 +133,52 @@ def test_validate_parameters(clear_db, create_sssp_family, create_sssp_parameter
     assert 'inconsistent `md5` for element `Ar`' in str(exception.value)
 
 
+def test_validate_parameters_scan(clear_db, filepath_pseudos, create_sssp_parameters):
+    """Test the `SsspFamily.validate_parameters` class method with pseudos scanned from a directory."""
+    parameters = create_sssp_parameters()
+    pseudos = SsspFamily.parse_pseudos_from_directory(filepath_pseudos, scan=True)
+
+    SsspFamily.validate_parameters(pseudos, parameters)
+    assert orm.UpfData.objects.count() == 0
+
+    incorrect = copy.deepcopy(parameters.get_metadata('Ar'))
+    incorrect['md5'] = '123abc'
+    parameters.set_attribute('Ar', incorrect)
+
+    with pytest.raises(ValueError) as exception:
+        SsspFamily.validate_parameters(pseudos, parameters)
+
+    assert 'inconsistent `md5` for element `Ar`' in str(exception.value)
+
+
+def test_parse_pseudos_from_directory_scan(clear_db, filepath_pseudos):
+    """Test the `SsspFamily.parse_pseudos_from_directory` class method with `scan=True`."""
+    from aiida_sssp.common import UpfHeader
+
+    pseudos = SsspFamily.parse_pseudos_from_directory(filepath_pseudos, scan=True)
+    nodes = SsspFamily.parse_pseudos_from_directory(filepath_pseudos)
+
+    assert all(isinstance(pseudo, UpfHeader) for pseudo in pseudos)
+    assert sorted(pseudos) == sorted(UpfHeader(node.element, node.filename, node.md5sum) for node in nodes)
+
+    with tempfile.TemporaryDirectory() as dirpath:
+        distutils.dir_util.copy_tree(filepath_pseudos, dirpath)
+        shutil.copy(os.path.join(dirpath, 'He.upf'), os.path.join(dirpath, 'He2.upf'))
+
+        with pytest.raises(ValueError) as exception:
+            SsspFamily.parse_pseudos_from_directory(dirpath, scan=True)
+
+        assert 'contains pseudo potentials with duplicate elements' in str(exception.value)
+
+        with open(os.path.join(dirpath, 'He2.upf'), 'w') as handle:
+            handle.write('invalid pseudo format')
+
+        with pytest.raises(ValueError) as exception:
+            SsspFamily.parse_pseudos_from_directory(dirpath, scan=True)
+
+        assert 'failed to parse' in str(exception.value)
+
+
 def test_create_from_folder(clear_db, filepath_pseudos):
     """Test the `SsspFamily.create_from_folder` class method."""
     label = 'SSSP'
@@ -227,6 +273,24 @@ def test_create_from_folder_with_parameters(clear_db, filepath_pseudos, sssp_par
         assert parameters.family_uuid == family.uuid
 
 
+def test_create_from_folder_deduplicate(clear_db, filepath_pseudos, sssp_parameter_filepath):
+    """Test the `SsspFamily.create_from_folder` class method with `deduplicate=True`."""
+    family = SsspFamily.create_from_folder(filepath_pseudos, 'SSSP/1.0', deduplicate=True)
+    assert family.count() == 3
+    assert orm.QueryBuilder().append(orm.UpfData).count() == 3
+
+    reused = SsspFamily.create_from_folder(
+        filepath_pseudos, 'SSSP/1.1', filepath_parameters=sssp_parameter_filepath, deduplicate=True
+    )
+    assert {node.uuid for node in reused.nodes} == {node.uuid for node in family.nodes}
+    assert reused.get_parameters_node().family_uuid == reused.uuid
+    assert orm.QueryBuilder().append(orm.UpfData).count() == 3
+
+    # Without deduplication, new nodes are always created
+    SsspFamily.create_from_folder(filepath_pseudos, 'SSSP/1.2')
+    assert orm.QueryBuilder().append(orm.UpfData).count() == 6
+
+
 def test_get_parameters_node(clear_db, create_sssp_family, create_sssp_parameters):
     """Test the `SsspFamily.get_parameters_node` method."""
     family = create_sssp_family()
@@ -331,3 +395,356 @@ def test_get_pseudos(clear_db, create_sssp_family, create_sssp_parameters, creat
     }
     structure = create_structure(site_kind_names=['Ar1', 'Ar2'])
     assert family.get_pseudos(structure) == expected
+
+
+def test_get_pseudo_uuid(clear_db, create_sssp_family):
+    """Test the `SsspFamily.get_pseudo_uuid` method."""
+    family = create_sssp_family()
+
+    with pytest.raises(ValueError):
+        family.get_pseudo_uuid('X')
+
+    assert family.get_pseudo_uuid('Ar') == family.get_pseudo('Ar').uuid
+
+
+def test_snapshot(clear_db, create_sssp_family, create_sssp_parameters, get_upf_data):
+    """Test that `SsspFamily` answers lookups from the snapshot and that changing the family invalidates it."""
+    from aiida_sssp.cache import get_snapshot, get_snapshot_filepath, write_snapshot
+
+    family = create_sssp_family()
+    parameters = create_sssp_parameters(uuid=family.uuid).store()
+    write_snapshot()
+
+    try:
+        # Reload the family, such that no state is cached on the instance and everything has to come from the snapshot
+        loaded = orm.load_group(family.pk)
+        expected = parameters.get_attribute('Ne')
+        assert loaded.get_cutoffs(elements=('Ar', 'Ne')) == (expected['cutoff_wfc'], expected['cutoff_rho'])
+        assert loaded.get_pseudo_uuid('He') == family.get_pseudo('He').uuid
+        assert loaded._parameters is None  # pylint: disable=protected-access
+
+        loaded = orm.load_group(family.pk)
+        loaded.remove_nodes([family.get_pseudo('He')])
+        loaded.add_nodes(get_upf_data(element='He').store())
+        assert get_snapshot() is None
+    finally:
+        if os.path.exists(get_snapshot_filepath()):
+            os.remove(get_snapshot_filepath())
+
+
+def test_stage_pseudos(clear_db, create_sssp_family, create_structure, tmp_path):
+    """Test the `SsspFamily.stage_pseudos` method."""
+    from aiida_sssp.cache import get_pseudo_store
+
+    family = create_sssp_family()
+    store = get_pseudo_store()
+
+    with pytest.raises(ValueError):
+        family.stage_pseudos(elements='Ar', structure=create_structure(site_kind_names=['Ar']))
+
+    with pytest.raises(ValueError):
+        family.stage_pseudos(elements='X')
+
+    staged = family.stage_pseudos()
+    assert sorted(staged) == sorted(family.elements)
+
+    for element, filepath in staged.items():
+        assert filepath == store.get_filepath(family.get_pseudo(element).md5sum)
+
+    structure = create_structure(site_kind_names=['Ar1', 'Ar2', 'He'])
+    staged = family.stage_pseudos(str(tmp_path), structure=structure)
+    assert sorted(staged) == ['Ar', 'He']
+    assert sorted(os.listdir(str(tmp_path))) == ['Ar.upf', 'He.upf']
+
+    for element, filepath in staged.items():
+        assert os.path.samefile(filepath, store.get_filepath(family.get_pseudo(element).md5sum))
+
+
+def test_iter_pseudo_handles(clear_db, create_sssp_family):
+    """Test the `SsspFamily.iter_pseudo_handles` method."""
+    family = create_sssp_family()
+    handles = []
+
+    for element, handle in family.iter_pseudo_handles():
+        assert all(previous.closed for previous in handles)
+        assert handle.read() == family.get_pseudo(element).get_content().encode('utf-8')
+        handles.append(handle)
+
+    assert len(handles) == len(family.elements)
+    assert all(handle.closed for handle in handles)
+
+    assert [element for element, _ in family.iter_pseudo_handles(['Ne', 'Ar'])] == ['Ar', 'Ne']
+
+    with pytest.raises(ValueError):
+        list(family.iter_pseudo_handles(['X']))
+
+
+def test_iter_pseudo_chunks(clear_db, create_sssp_family):
+    """Test the `SsspFamily.iter_pseudo_chunks` method."""
+    family = create_sssp_family()
+    content = family.get_pseudo('He').get_content().encode('utf-8')
+
+    chunks = list(family.iter_pseudo_chunks('He', chunk_size=16))
+    assert all(len(chunk) <= 16 for chunk in chunks)
+    assert b''.join(chunks) == content
+
+    with family.open_pseudo('He') as handle:
+        assert handle.read() == content
+
+
+def test_upgrade(clear_db, create_sssp_family, filepath_pseudos, sssp_parameter_metadata, tmp_path):
+    """Test the `SsspFamily.upgrade` method."""
+    import hashlib
+    import json
+
+    family = create_sssp_family()
+    dirpath = str(tmp_path / 'pseudos')
+    filepath_parameters = str(tmp_path / 'parameters.json')
+    distutils.dir_util.copy_tree(filepath_pseudos, dirpath)
+
+    # Change the content of a single pseudo and update its checksum in the metadata
+    with open(os.path.join(dirpath, 'Ne.upf'), 'a') as handle:
+        handle.write('\n')
+
+    with open(os.path.join(dirpath, 'Ne.upf'), 'rb') as handle:
+        sssp_parameter_metadata['Ne']['md5'] = hashlib.md5(handle.read()).hexdigest()
+
+    with open(filepath_parameters, 'w') as handle:
+        json.dump(sssp_parameter_metadata, handle)
+
+    with pytest.raises(ValueError):
+        family.upgrade(dirpath, family.label)
+
+    for label, parameters in [('SSSP/2.0', filepath_parameters), ('SSSP/2.1', None)]:
+        upgraded = family.upgrade(dirpath, label, description='upgraded', filepath_parameters=parameters)
+
+        assert isinstance(upgraded, SsspFamily)
+        assert upgraded.label == label
+        assert upgraded.description == 'upgraded'
+        assert sorted(upgraded.elements) == sorted(family.elements)
+        assert upgraded.get_pseudo('Ar').uuid == family.get_pseudo('Ar').uuid
+        assert upgraded.get_pseudo('He').uuid == family.get_pseudo('He').uuid
+        assert upgraded.get_pseudo('Ne').uuid != family.get_pseudo('Ne').uuid
+        assert upgraded.get_pseudo('Ne').md5sum == sssp_parameter_metadata['Ne']['md5']
+
+    assert orm.load_group('SSSP/2.0').get_parameters_node().family_uuid == orm.load_group('SSSP/2.0').uuid
+    assert family.count() == 3
+    assert orm.UpfData.objects.count() == 5
+
+    # A file that is not defined in the metadata is not allowed
+    shutil.copy(os.path.join(dirpath, 'Ne.upf'), os.path.join(dirpath, 'Ne2.upf'))
+
+    with pytest.raises(ValueError) as exception:
+        family.upgrade(dirpath, 'SSSP/2.2', filepath_parameters=filepath_parameters)
+
+    assert 'is not defined in the parameters' in str(exception.value)
+
+    # A file of an element that is defined in the metadata is required
+    os.remove(os.path.join(dirpath, 'Ne2.upf'))
+    os.remove(os.path.join(dirpath, 'Ne.upf'))
+
+    with pytest.raises(ValueError, match=r'files of elements `Ne` defined in the parameters are missing'):
+        family.upgrade(dirpath, 'SSSP/2.2', filepath_parameters=filepath_parameters)
+
+
+def test_upgrade_from_archive(
+    clear_db, create_sssp_family, filepath_pseudos, sssp_parameter_metadata, tmp_path, monkeypatch
+):
+    """Test that `SsspFamily.upgrade_from_archive` only parses the members that changed."""
+    import hashlib
+    import json
+
+    from aiida_sssp.groups import family as module
+
+    family = create_sssp_family()
+    dirpath = tmp_path / 'pseudos'
+    shutil.copytree(filepath_pseudos, str(dirpath))
+    filepath_parameters = str(tmp_path / 'parameters.json')
+
+    with open(str(dirpath / 'Ne.upf'), 'a') as handle:
+        handle.write('\n')
+
+    with open(str(dirpath / 'Ne.upf'), 'rb') as handle:
+        sssp_parameter_metadata['Ne']['md5'] = hashlib.md5(handle.read()).hexdigest()
+
+    with open(filepath_parameters, 'w') as handle:
+        json.dump(sssp_parameter_metadata, handle)
+
+    filepath = shutil.make_archive(str(tmp_path / 'archive'), 'gztar', str(dirpath))
+    parsed = []
+    original = module.create_upf
+
+    def create_upf(handle, filename):
+        parsed.append(filename)
+        return original(handle, filename)
+
+    monkeypatch.setattr(module, 'create_upf', create_upf)
+
+    for label, parameters in [('SSSP/2.0', filepath_parameters), ('SSSP/2.1', None)]:
+        parsed.clear()
+        upgraded = family.upgrade_from_archive(filepath, label, filepath_parameters=parameters)
+
+        assert parsed == ['Ne.upf']
+        assert sorted(upgraded.elements) == sorted(family.elements)
+        assert upgraded.get_pseudo('Ar').uuid == family.get_pseudo('Ar').uuid
+        assert upgraded.get_pseudo('Ne').uuid != family.get_pseudo('Ne').uuid
+        assert upgraded.get_pseudo('Ne').md5sum == sssp_parameter_metadata['Ne']['md5']
+
+    assert orm.load_group('SSSP/2.0').get_parameters_node().family_uuid == orm.load_group('SSSP/2.0').uuid
+
+    with pytest.raises(ValueError):
+        family.upgrade_from_archive(filepath, 'SSSP/2.0')
+
+    os.remove(str(dirpath / 'Ne.upf'))
+    filepath = shutil.make_archive(str(tmp_path / 'incomplete'), 'gztar', str(dirpath))
+
+    with pytest.raises(ValueError, match=r'files of elements `Ne` defined in the parameters are missing'):
+        family.upgrade_from_archive(filepath, 'SSSP/2.2', filepath_parameters=filepath_parameters)
+
+
+def test_create_from_archive(clear_db, filepath_pseudos, sssp_parameter_filepath, tmp_path):
+    """Test the `SsspFamily.create_from_archive` class method."""
+    dirpath = tmp_path / 'content'
+    shutil.copytree(filepath_pseudos, str(dirpath / 'pseudos'))
+    (dirpath / 'README').write_text('not a pseudo potential')
+    filepath = shutil.make_archive(str(tmp_path / 'archive'), 'zip', str(dirpath))
+
+    family = SsspFamily.create_from_archive(filepath, 'SSSP/1.0', filepath_parameters=sssp_parameter_filepath)
+    assert family.is_stored
+    assert sorted(family.elements) == ['Ar', 'He', 'Ne']
+    assert family.get_parameters_node().family_uuid == family.uuid
+
+    for upf in family.pseudos.values():
+        with open(os.path.join(filepath_pseudos, upf.filename)) as handle:
+            assert upf.get_content() == handle.read()
+
+    reused = SsspFamily.create_from_archive(filepath, 'SSSP/1.1', deduplicate=True)
+    assert {node.uuid for node in reused.nodes} == {node.uuid for node in family.nodes}
+
+    with pytest.raises(ValueError, match=r'already exists'):
+        SsspFamily.create_from_archive(filepath, 'SSSP/1.1')
+
+    (dirpath / 'pseudos' / 'corrupt.upf').write_text('corrupt')
+    filepath = shutil.make_archive(str(tmp_path / 'corrupt'), 'gztar', str(dirpath))
+
+    with pytest.raises(ValueError, match=r'failed to parse `corrupt.upf`'):
+        SsspFamily.create_from_archive(filepath, 'SSSP/1.2')
+
+
+def test_load_cached_concurrent(clear_db):
+    """Test that concurrent misses of `SsspFamily._load_cached` for the same key are coalesced into a single load."""
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    family = SsspFamily(label='SSSP').store()
+    cache = {}
+    loads = []
+    barrier = threading.Barrier(8)
+
+    def load():
+        loads.append(threading.current_thread())
+        time.sleep(0.1)
+        return object()
+
+    def store(value):
+        cache['key'] = value
+
+    def get(key):
+        barrier.wait()
+        return family._load_cached(key, lambda: cache.get(key, None), load, store)  # pylint: disable=protected-access
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(get, ['key'] * 8))
+
+    assert len(loads) == 1
+    assert all(result is cache['key'] for result in results)
+
+
+def test_get_pseudo_concurrent(clear_db, create_sssp_family):
+    """Test that `SsspFamily.pseudos` and `SsspFamily.get_pseudo` can be used by concurrent threads."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    family = create_sssp_family()
+    elements = family.elements * 4
+    family = SsspFamily.objects.get(uuid=family.uuid)
+
+    with ThreadPoolExecutor(max_workers=len(elements)) as executor:
+        pseudos = list(executor.map(family.get_pseudo, elements))
+
+    assert [pseudo.element for pseudo in pseudos] == elements
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(family.get_pseudo, 'Xe') for _ in range(4)]
+
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result()
+
+
+def test_generation(clear_db, create_sssp_family, create_sssp_parameters):
+    """Test that every change of a family bumps its generation and that `SsspFamily.revalidate` drops stale caches."""
+    family = create_sssp_family()
+    generation = family.generation
+    assert generation is not None
+
+    other = SsspFamily.objects.get(uuid=family.uuid)
+    assert other.revalidate()
+    assert len(other.pseudos) == family.count()
+    assert other.revalidate()
+
+    pseudo = family.pseudos[family.elements[0]]
+    family.remove_nodes(pseudo)
+    assert family.generation not in (None, generation)
+    assert pseudo.element not in family.pseudos
+
+    assert not other.revalidate()
+    assert pseudo.element not in other.pseudos
+    assert other.revalidate()
+
+    generation = family.generation
+    family.add_nodes(pseudo)
+    assert family.generation != generation
+    assert not other.revalidate()
+    assert pseudo.element in other.pseudos
+
+    # The cache of the instance that made the change is up to date, but it is reloaded once to revalidate it
+    assert pseudo.element in family.pseudos
+    assert not family.revalidate()
+    assert family.revalidate()
+
+    generation = family.generation
+    parameters = create_sssp_parameters(uuid=family.uuid).store()
+    assert family.generation != generation
+    assert not other.revalidate()
+
+    # Storing the parameters again is a no-op that leaves the generation untouched
+    generation = family.generation
+    parameters.store()
+    assert family.generation == generation
+    assert other.revalidate()
+
+
+def test_add_nodes_batch(clear_db, get_upf_data):
+    """Test that `SsspFamily.add_nodes` validates the whole batch before adding any of the nodes."""
+    upf_he = get_upf_data(element='He').store()
+    upf_ne = get_upf_data(element='Ne').store()
+    upf_ar = get_upf_data(element='Ar').store()
+    family = SsspFamily(label='SSSP').store()
+
+    with pytest.raises(ValueError, match=r'multiple nodes for element `He`'):
+        family.add_nodes([upf_he, upf_ne, get_upf_data(element='He').store()])
+    assert family.count() == 0
+
+    family.add_nodes([upf_he])
+
+    # Check for conflicts without the pseudos being cached on the instance
+    other = SsspFamily.objects.get(uuid=family.uuid)
+
+    with pytest.raises(ValueError, match=r'element `He` already present in this family'):
+        other.add_nodes([upf_ar, upf_he, upf_ne])
+    assert other.count() == 1
+
+    other.add_nodes([upf_ar, upf_ne])
+    assert other.count() == 3
+    assert sorted(other.elements) == ['Ar', 'He', 'Ne']
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument,redefined-outer-name
+"""Tests for the `aiida_sssp.groups.index` module."""
+import os
+import shutil
+
+import pytest
+
+from aiida_sssp.cache import SnapshotRecord, set_cache_backend
+from aiida_sssp.groups import ElementIndex, SsspFamily, find_families, get_element_index
+
+NAN = float('nan')
+
+
+@pytest.fixture
+def records():
+    """Return a list of `SnapshotRecord` of three families, of which the last has no recommended cutoffs."""
+    return [
+        SnapshotRecord('a' * 36, 'H', '1' * 36, '1' * 32, 'H.upf', 30., 120.),
+        SnapshotRecord('a' * 36, 'He', '2' * 36, '2' * 32, 'He.upf', 20., 160.),
+        SnapshotRecord('b' * 36, 'H', '3' * 36, '3' * 32, 'H.upf', 40., 100.),
+        SnapshotRecord('b' * 36, 'O', '4' * 36, '4' * 32, 'O.upf', 50., 400.),
+        SnapshotRecord('c' * 36, 'H', '5' * 36, '5' * 32, 'H.upf', NAN, NAN),
+    ]
+
+
+def test_element_index(records):
+    """Test the `ElementIndex` class."""
+    index = ElementIndex(records)
+
+    assert index.family_uuids == {'a' * 36, 'b' * 36, 'c' * 36}
+    assert index.get_elements('b' * 36) == {'H', 'O'}
+    assert index.get_elements('d' * 36) == set()
+    assert index.get_family_uuids(['H']) == {'a' * 36, 'b' * 36, 'c' * 36}
+    assert index.get_family_uuids(['H', 'He']) == {'a' * 36}
+    assert index.get_family_uuids(['He', 'O']) == set()
+    assert index.get_family_uuids(['Xe']) == set()
+
+    assert index.get_cutoffs('a' * 36, ['H', 'He']) == (30., 160.)
+    assert index.get_cutoffs('c' * 36, ['H']) is None
+
+    with pytest.raises(KeyError):
+        index.get_cutoffs('a' * 36, ['O'])
+
+    assert index.find(['H']) == {'a' * 36: (30., 120.), 'b' * 36: (40., 100.), 'c' * 36: None}
+    assert index.find(('H', 'O', 'O')) == {'b' * 36: (50., 400.)}
+
+
+@pytest.mark.parametrize('backend', ('snapshot', 'shared', 'none'))
+def test_find_families(clear_db, filepath_pseudos, create_sssp_parameters, create_structure, tmp_path, backend):
+    """Test the `find_families` function with each cache backend."""
+    dirpath = tmp_path / 'pseudos'
+    shutil.copytree(filepath_pseudos, str(dirpath))
+    full = SsspFamily.create_from_folder(filepath_pseudos, 'SSSP/full')
+    os.remove(str(dirpath / 'Ne.upf'))
+    partial = SsspFamily.create_from_folder(str(dirpath), 'SSSP/partial')
+    create_sssp_parameters(uuid=full.uuid).store()
+
+    set_cache_backend(backend)
+
+    try:
+        with pytest.raises(ValueError):
+            find_families()
+
+        result = find_families(elements=['Ar', 'He'])
+        assert [(family.uuid, cutoffs) for family, cutoffs in result] == [(full.uuid, (20., 80.)), (partial.uuid, None)]
+
+        result = find_families(structure=create_structure(['Ne']))
+        assert [(family.uuid, cutoffs) for family, cutoffs in result] == [(full.uuid, (30., 240.))]
+
+        assert find_families(elements=['Xe']) == []
+        assert get_element_index().get_elements(partial.uuid) == {'Ar', 'He'}
+    finally:
+        set_cache_backend('snapshot')
+
+
+def test_find_families_after_snapshot(clear_db, create_sssp_family, create_sssp_parameters):
+    """Test that a family that is created after the snapshot was written is found by `find_families`."""
+    from aiida_sssp.cache import get_snapshot, get_snapshot_filepath, write_snapshot
+
+    family = create_sssp_family()
+    write_snapshot()
+
+    try:
+        assert [found.uuid for found, _ in find_families(elements=['He'])] == [family.uuid]
+
+        other = create_sssp_family(label='SSSP/1.1/PBE/precision')
+        create_sssp_parameters(uuid=other.uuid).store()
+
+        assert get_snapshot() is None
+        assert {found.uuid for found, _ in find_families(elements=['He'])} == {family.uuid, other.uuid}
+    finally:
+        if os.path.exists(get_snapshot_filepath()):
+            os.remove(get_snapshot_filepath())
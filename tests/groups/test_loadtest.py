@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument
+"""Tests for the `aiida_sssp.groups.loadtest` module."""
+import pytest
+
+from aiida_sssp.groups import LoadTestResult, count_queries, run_load_test
+from aiida_sssp.groups.loadtest import OPERATIONS
+
+
+def test_load_test_result():
+    """Test the statistics of `LoadTestResult`."""
+    latencies = {'get_pseudo': [float(value) for value in range(1, 101)], 'get_cutoffs': []}
+    result = LoadTestResult(latencies, {'get_cutoffs': 2}, 10., 50, workers=4, processes=1)
+
+    assert result.count == 100
+    assert result.throughput == 10.
+    assert result.get_percentiles('get_pseudo') == {50: 50., 90: 90., 99: 99.}
+    assert result.get_percentiles('get_cutoffs') == {50: None, 90: None, 99: None}
+    assert result.get_percentiles(percentiles=(100,)) == {100: 100.}
+
+    summary = result.as_dict()
+    assert summary['operations']['get_pseudo']['max'] == 100.
+    assert summary['operations']['get_cutoffs']['errors'] == 2
+    assert 'get_pseudo' in result.format()
+
+
+def test_count_queries(clear_db, create_sssp_family):
+    """Test that `count_queries` counts the queries executed while it is active."""
+    family = create_sssp_family()
+
+    with count_queries() as counter:
+        family.count()
+
+    assert counter.count >= 1
+    count = counter.count
+
+    family.count()
+    assert counter.count == count
+
+
+@pytest.mark.parametrize('share_instances', (True, False))
+def test_run_load_test(clear_db, create_sssp_family, create_sssp_parameters, share_instances):
+    """Test `run_load_test` for shared and separate family instances."""
+    family = create_sssp_family()
+    create_sssp_parameters(uuid=family.uuid).store()
+
+    result = run_load_test([family.uuid], workers=3, requests=30, share_instances=share_instances, cache_backend='none')
+
+    assert result.count == 90
+    assert result.errors == {}
+    assert set(result.latencies) == set(OPERATIONS)
+    assert result.queries > 0
+    assert result.cache_backend == 'none'
+
+
+def test_run_load_test_release_connection(clear_db, create_sssp_family, monkeypatch):
+    """Test that each worker of `run_load_test` releases the database connection of its thread when it finishes."""
+    import threading
+
+    from aiida_sssp import cache
+
+    family = create_sssp_family()
+    threads = []
+    original = cache.release_connection
+
+    def release_connection():
+        threads.append(threading.current_thread())
+        original()
+
+    monkeypatch.setattr(cache, 'release_connection', release_connection)
+    run_load_test([family.uuid], workers=3, requests=3, operations=('get_pseudo',), cache_backend='none')
+
+    assert len(threads) == 3
+    assert threading.main_thread() not in threads
+
+
+def test_run_load_test_invalid(clear_db, create_sssp_family):
+    """Test that `run_load_test` raises for invalid arguments."""
+    family = create_sssp_family()
+
+    with pytest.raises(ValueError):
+        run_load_test([])
+
+    with pytest.raises(ValueError):
+        run_load_test([family.uuid], operations=('get_parameters',))
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument,redefined-outer-name
+"""Tests for the `aiida_sssp.groups.table` module."""
+import math
+import os
+import shutil
+
+import pytest
+
+from aiida_sssp.cache import SnapshotRecord, set_cache_backend
+from aiida_sssp.groups import CutoffTable, SsspFamily, get_cutoff_table, iter_group_cutoffs
+
+NAN = float('nan')
+
+
+@pytest.fixture
+def records():
+    """Return a list of `SnapshotRecord` of three families, of which the last has no recommended cutoffs."""
+    return [
+        SnapshotRecord('a' * 36, 'H', '1' * 36, '1' * 32, 'H.upf', 30., 120.),
+        SnapshotRecord('a' * 36, 'He', '2' * 36, '2' * 32, 'He.upf', 20., 160.),
+        SnapshotRecord('b' * 36, 'H', '3' * 36, '3' * 32, 'H.upf', 40., 100.),
+        SnapshotRecord('b' * 36, 'O', '4' * 36, '4' * 32, 'O.upf', 50., 400.),
+        SnapshotRecord('c' * 36, 'H', '5' * 36, '5' * 32, 'H.upf', NAN, NAN),
+        SnapshotRecord('d' * 36, 'H', '6' * 36, '6' * 32, 'H.upf', 30., 100.),
+    ]
+
+
+def test_cutoff_table(records):
+    """Test the `CutoffTable` class."""
+    table = CutoffTable(records)
+
+    assert table.family_uuids == ['a' * 36, 'b' * 36, 'c' * 36, 'd' * 36]
+    assert table.elements == ['H', 'He', 'O']
+
+    cutoffs_wfc, cutoffs_rho = table.get_cutoffs([['H'], ['H', 'He'], ('H', 'O', 'O'), ['Xe'], ['H', 'Xe'], []])
+    assert cutoffs_wfc.shape == cutoffs_rho.shape == (6, 4)
+
+    expected = [
+        [(30., 120.), (40., 100.), None, (30., 100.)],
+        [(30., 160.), None, None, None],
+        [None, (50., 400.), None, None],
+        [None, None, None, None],
+        [None, None, None, None],
+        [None, None, None, None],
+    ]
+
+    for row, cutoffs in enumerate(expected):
+        for column, cutoff in enumerate(cutoffs):
+            values = (cutoffs_wfc[row, column], cutoffs_rho[row, column])
+            if cutoff is None:
+                assert all(map(math.isnan, values))
+            else:
+                assert values == cutoff
+
+
+def test_cutoff_table_rank(records):
+    """Test the `CutoffTable.rank` and `CutoffTable.get_cheapest` methods."""
+    table = CutoffTable(records)
+    compositions = [{'H'}, {'H', 'He'}, {'He', 'O'}]
+
+    assert table.rank(compositions) == [
+        [('d' * 36, 30., 100.), ('a' * 36, 30., 120.), ('b' * 36, 40., 100.)],
+        [('a' * 36, 30., 160.)],
+        [],
+    ]
+    assert table.get_cheapest(compositions) == [('d' * 36, 30., 100.), ('a' * 36, 30., 160.), None]
+    assert CutoffTable([]).get_cheapest(compositions) == [None, None, None]
+
+
+@pytest.mark.parametrize('backend', ('snapshot', 'none'))
+def test_get_cutoff_table(clear_db, filepath_pseudos, create_sssp_parameters, tmp_path, backend):
+    """Test the `get_cutoff_table` function with each cache backend."""
+    dirpath = tmp_path / 'pseudos'
+    shutil.copytree(filepath_pseudos, str(dirpath))
+    full = SsspFamily.create_from_folder(filepath_pseudos, 'SSSP/full')
+    os.remove(str(dirpath / 'Ne.upf'))
+    partial = SsspFamily.create_from_folder(str(dirpath), 'SSSP/partial')
+    create_sssp_parameters(uuid=full.uuid).store()
+
+    set_cache_backend(backend)
+
+    try:
+        table = get_cutoff_table()
+        assert set(table.family_uuids) == {full.uuid, partial.uuid}
+        assert table.get_cheapest([['Ar', 'He'], ['Ne'], ['Xe']]) == [(full.uuid, 20., 80.), (full.uuid, 30., 240.),
+                                                                      None]
+    finally:
+        set_cache_backend('snapshot')
+
+
+def test_iter_group_cutoffs(clear_db, create_sssp_family, create_sssp_parameters, create_structure):
+    """Test the `iter_group_cutoffs` function."""
+    from aiida.orm import Group, Int
+
+    family = create_sssp_family()
+    create_sssp_parameters(uuid=family.uuid).store()
+    other = create_sssp_family(label='SSSP/1.1/PBE/precision')
+
+    structures = [create_structure(elements).store() for elements in (['Ar', 'He'], ['Ne'], ['Xe'])]
+    group = Group('structures').store()
+    group.add_nodes(structures + [Int(1).store()])
+
+    expected = [
+        (structures[0].pk, structures[0].uuid, family.uuid, 20., 80.),
+        (structures[1].pk, structures[1].uuid, family.uuid, 30., 240.),
+        (structures[2].pk, structures[2].uuid, None, None, None),
+    ]
+
+    assert sorted(iter_group_cutoffs(group, batch_size=2)) == expected
+    assert sorted(iter_group_cutoffs(group, family.uuid, batch_size=1)) == expected
+    assert all(row[2:] == (None, None, None) for row in iter_group_cutoffs(group, other.uuid))
+
+    with pytest.raises(ValueError):
+        list(iter_group_cutoffs(group, 'f' * 36))
+
+
+def test_cutoff_table_after_snapshot(clear_db, create_sssp_family, create_sssp_parameters, create_structure):
+    """Test that a family that is created after the snapshot was written is included in the cutoff table."""
+    from aiida.orm import Group
+
+    from aiida_sssp.cache import get_snapshot_filepath, write_snapshot
+
+    family = create_sssp_family()
+    create_sssp_parameters(uuid=family.uuid).store()
+    write_snapshot()
+
+    try:
+        other = create_sssp_family(label='SSSP/1.1/PBE/precision')
+        create_sssp_parameters(uuid=other.uuid).store()
+
+        assert set(get_cutoff_table().family_uuids) == {family.uuid, other.uuid}
+
+        structure = create_structure(['He']).store()
+        group = Group('structures').store()
+        group.add_nodes([structure])
+
+        assert list(iter_group_cutoffs(group, other.uuid)) == [(structure.pk, structure.uuid, other.uuid, 20., 80.)]
+    finally:
+        if os.path.exists(get_snapshot_filepath()):
+            os.remove(get_snapshot_filepath())
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument
+"""Tests for the `aiida_sssp.groups.uninstall` module."""
+import os
+import shutil
+
+from aiida import orm
+from aiida.common import exceptions
+from aiida.common.links import LinkType
+
+from aiida_sssp.data import SsspParameters
+from aiida_sssp.groups import SsspFamily, uninstall_families
+
+
+def test_uninstall_families(clear_db, filepath_pseudos, create_sssp_parameters, tmp_path):
+    """Test that `uninstall_families` only deletes pseudos that are not referenced by other groups or links."""
+    dirpath = tmp_path / 'pseudos'
+    shutil.copytree(filepath_pseudos, str(dirpath))
+    os.remove(str(dirpath / 'Ne.upf'))
+
+    full = SsspFamily.create_from_folder(filepath_pseudos, 'SSSP/full')
+    partial = SsspFamily.create_from_folder(str(dirpath), 'SSSP/partial', deduplicate=True)
+    parameters = create_sssp_parameters(uuid=full.uuid).store()
+    pseudos = {element: pseudo.pk for element, pseudo in full.pseudos.items()}
+
+    expected = {'families': 1, 'parameters': 1, 'pseudos': 1, 'kept': 2, 'kept_parameters': 0}
+    assert uninstall_families([full], dry_run=True) == expected
+    assert orm.QueryBuilder().append(SsspFamily).count() == 2
+
+    assert uninstall_families([full]) == expected
+    assert [family.uuid for [family] in orm.QueryBuilder().append(SsspFamily).all()] == [partial.uuid]
+    assert orm.QueryBuilder().append(SsspParameters, filters={'id': parameters.pk}).count() == 0
+    assert orm.QueryBuilder().append(orm.UpfData, filters={'id': pseudos['Ne']}).count() == 0
+    assert SsspFamily.objects.get(uuid=partial.uuid).count() == 2
+
+    # A pseudo that was used as the input of a calculation is kept
+    calculation = orm.CalculationNode()
+    calculation.add_incoming(orm.load_node(pseudos['He']), LinkType.INPUT_CALC, 'pseudo')
+    calculation.store()
+
+    expected = {'families': 1, 'parameters': 0, 'pseudos': 1, 'kept': 1, 'kept_parameters': 0}
+    assert uninstall_families([partial]) == expected
+    assert orm.load_node(pseudos['He'])
+
+    try:
+        orm.load_node(pseudos['Ar'])
+    except exceptions.NotExistent:
+        pass
+    else:
+        raise AssertionError('orphaned pseudo was not deleted')
+
+
+def test_uninstall_families_keep_pseudos(clear_db, create_sssp_family):
+    """Test the `keep_pseudos` argument of `uninstall_families`."""
+    family = create_sssp_family()
+    count = family.count()
+
+    assert uninstall_families([family], keep_pseudos=True) == {
+        'families': 1,
+        'parameters': 0,
+        'pseudos': 0,
+        'kept': count,
+        'kept_parameters': 0,
+    }
+    assert orm.QueryBuilder().append(orm.UpfData).count() == count
+
+
+def test_uninstall_families_linked_parameters(clear_db, create_sssp_family, create_sssp_parameters):
+    """Test that parameters with links are kept and reported by `uninstall_families`."""
+    family = create_sssp_family()
+    parameters = create_sssp_parameters(uuid=family.uuid).store()
+
+    calculation = orm.CalculationNode()
+    calculation.add_incoming(parameters, LinkType.INPUT_CALC, 'parameters')
+    calculation.store()
+
+    result = uninstall_families([family], keep_pseudos=True)
+
+    assert result['parameters'] == 0
+    assert result['kept_parameters'] == 1
+    assert orm.load_node(parameters.pk)
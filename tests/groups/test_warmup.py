@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument,protected-access
+"""Tests for the `aiida_sssp.groups.warmup` module."""
+import os
+
+from aiida_sssp.cache import get_pseudo_store, get_snapshot_filepath, write_snapshot
+from aiida_sssp.groups import get_warm_up, is_warm_up_requested, set_warm_up, start_warm_up, warm_up
+from aiida_sssp.groups import warmup
+
+
+def test_set_warm_up(clear_db):
+    """Test `set_warm_up` and `get_warm_up`."""
+    try:
+        set_warm_up(['b', 'a'], pseudos=True)
+        assert get_warm_up() == {'families': ['a', 'b'], 'pseudos': True}
+    finally:
+        set_warm_up([])
+
+    assert get_warm_up() is None
+
+
+def test_warm_up(clear_db, create_sssp_family):
+    """Test `warm_up`."""
+    family = create_sssp_family()
+    other = create_sssp_family(label='SSSP/other')
+
+    result = warm_up([family.label, 'missing'])
+    assert result['families'] == 1
+    assert result['missing'] == ['missing']
+    assert result['pseudos'] == 0
+
+    write_snapshot()
+
+    try:
+        # Creating a family invalidates the snapshot, which is written again by the warm-up
+        create_sssp_family(label='SSSP/new')
+        assert not os.path.exists(get_snapshot_filepath())
+
+        result = warm_up([family.label, 'SSSP/new'], pseudos=True)
+        assert result['uncached'] == []
+        assert result['pseudos'] == family.count() * 2
+        assert os.path.exists(get_snapshot_filepath())
+    finally:
+        if os.path.exists(get_snapshot_filepath()):
+            os.remove(get_snapshot_filepath())
+
+    store = get_pseudo_store()
+    assert all(store.contains(pseudo.md5sum) for pseudo in other.pseudos.values())
+
+
+def test_start_warm_up(clear_db, create_sssp_family, monkeypatch):
+    """Test that `start_warm_up` runs the configured warm-up in a thread once per process."""
+    family = create_sssp_family()
+    monkeypatch.setattr(warmup, '_WARM_UPS', {})
+
+    try:
+        set_warm_up([family.label])
+        thread = start_warm_up()
+        thread.join()
+        assert start_warm_up() is thread
+    finally:
+        set_warm_up([])
+        if os.path.exists(get_snapshot_filepath()):
+            os.remove(get_snapshot_filepath())
+
+    monkeypatch.setattr(warmup, '_WARM_UPS', {})
+    assert start_warm_up() is None
+
+
+def test_warm_up_requested(clear_db, create_sssp_family, monkeypatch):
+    """Test that loading a family only starts the warm-up in processes that opted in through the environment."""
+    from aiida_sssp.groups import SsspFamily
+
+    family = create_sssp_family()
+    monkeypatch.setattr(warmup, '_WARM_UPS', {})
+    monkeypatch.delenv(warmup.ENV_WARMUP, raising=False)
+
+    try:
+        set_warm_up([family.label])
+        assert not is_warm_up_requested()
+        SsspFamily.objects.get(uuid=family.uuid)
+        assert warmup._WARM_UPS == {}
+
+        monkeypatch.setenv(warmup.ENV_WARMUP, '0')
+        assert not is_warm_up_requested()
+
+        monkeypatch.setenv(warmup.ENV_WARMUP, '1')
+        assert is_warm_up_requested()
+        SsspFamily.objects.get(uuid=family.uuid)
+        assert len(warmup._WARM_UPS) == 1
+        thread = start_warm_up()
+        assert thread is not None
+        thread.join()
+    finally:
+        set_warm_up([])
+        if os.path.exists(get_snapshot_filepath()):
+            os.remove(get_snapshot_filepath())